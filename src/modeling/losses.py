@@ -0,0 +1,119 @@
+# cube_losses.py
+# Differentiable versions of the rubik.utils.validation loss terms, computed on (B, 54, 6)
+# color probabilities instead of hard strings, so cube constraints can be backpropagated.
+from typing import Dict, Optional
+import torch
+import torch.nn as nn
+from modeling.backbone import BackboneRegistry
+from rubik.cubie import CENTER_FACELETS, CORNER_FACELETS, CORNER_STICKERS, EDGE_FACELETS, EDGE_STICKERS
+from rubik.utils.validation import CENTER_ARRANGEMENTS
+
+LOSS_TERMS = ["stickers", "centers", "corner_cubie", "edge_cubie", "corner_orientation", "edge_orientation"]
+
+
+class CubeConstraintLoss(nn.Module):
+    """
+    Expected violation of the cube constraints by a batch of color distributions.
+    Every term is 0 for a one-hot valid cube state:
+        stickers:           expected stickers to recolor so that every color shows up 9 times
+        centers:            probability that the centers are not one of the 24 orientations
+        corner_cubie:       expected number of corners whose colors are not a real corner
+        edge_cubie:         expected number of edges whose colors are not a real edge
+        corner_orientation: probability that the total twist of the real corners is not 0 mod 3
+        edge_orientation:   probability that the total flip of the real edges is not 0 mod 2
+    Pieces are read relative to the centers like ValidateState, i.e. colors are first softly
+    relabeled by the distribution of the centers, so any color scheme works.
+    """
+    def __init__(self, weights: Optional[Dict[str, float]] = None, from_logits: bool = False,
+                 relative_to_centers: bool = True, reduction: str = "mean", eps: float = 1e-8):
+        super().__init__()
+        if reduction not in ("mean", "sum", "none"):
+            raise ValueError(f"Unknown reduction: {reduction}")
+        weights = dict(weights or {})
+        unknown = set(weights) - set(LOSS_TERMS)
+        if unknown:
+            raise ValueError(f"Unknown loss terms: {sorted(unknown)}")
+        self.weights = {term: float(weights.get(term, 1.0)) for term in LOSS_TERMS}
+        self.from_logits = from_logits
+        self.relative_to_centers = relative_to_centers
+        self.reduction = reduction
+        self.eps = eps
+        self.register_buffer("corner_facelets", torch.as_tensor(CORNER_FACELETS, dtype=torch.long), persistent=False)
+        self.register_buffer("edge_facelets", torch.as_tensor(EDGE_FACELETS, dtype=torch.long), persistent=False)
+        self.register_buffer("center_facelets", torch.as_tensor(CENTER_FACELETS, dtype=torch.long), persistent=False)
+        # Row piece*3 + twist (piece*2 + flip) holds the colors that piece shows on the facelets of a position
+        self.register_buffer("corner_stickers", torch.as_tensor(CORNER_STICKERS, dtype=torch.long), persistent=False)
+        self.register_buffer("edge_stickers", torch.as_tensor(EDGE_STICKERS, dtype=torch.long), persistent=False)
+        self.register_buffer("center_arrangements", torch.as_tensor(CENTER_ARRANGEMENTS, dtype=torch.long),
+                             persistent=False)
+
+    def relabel(self, probs: torch.Tensor) -> torch.Tensor:
+        """Softly recolors every facelet by the face whose center shows its color."""
+        centers = probs[:, self.center_facelets] # (B, face, color)
+        relabeled = probs @ centers.transpose(1, 2)
+        return relabeled / relabeled.sum(dim=2, keepdim=True).clamp_min(self.eps)
+
+    def _piece_probs(self, probs: torch.Tensor, facelets: torch.Tensor, stickers: torch.Tensor) -> torch.Tensor:
+        """Returns (B, positions, 24) probabilities of every position holding each piece in each orientation."""
+        pieces = probs[:, facelets] # (B, positions, size, color)
+        result = pieces[:, :, 0, stickers[:, 0]]
+        for facelet in range(1, stickers.shape[1]):
+            result = result * pieces[:, :, facelet, stickers[:, facelet]]
+        return result
+
+    def _orientation_violation(self, piece_probs: torch.Tensor, modulus: int) -> torch.Tensor:
+        """
+        Probability that the orientations of the real pieces do not sum to 0, with the
+        positions drawn independently. Like ValidateState, a position not holding a real
+        piece adds nothing to the sum (that is charged by the cubie terms).
+        """
+        orientations = piece_probs.reshape(*piece_probs.shape[:2], -1, modulus).sum(dim=2)
+        unidentified = (1.0 - orientations.sum(dim=2)).clamp_min(0.0)
+        orientations = torch.cat([orientations[:, :, :1] + unidentified[:, :, None], orientations[:, :, 1:]], dim=2)
+        total = torch.zeros_like(orientations[:, 0])
+        total[:, 0] = 1.0
+        for position in range(orientations.shape[1]):
+            # Distribution of the sum mod the modulus, one circular convolution per position
+            total = sum(torch.roll(total, shift, dims=1) * orientations[:, position, shift:shift + 1]
+                        for shift in range(modulus))
+        return 1.0 - total[:, 0]
+
+    def terms(self, probs: torch.Tensor) -> Dict[str, torch.Tensor]:
+        """
+        Computes every loss term per sample.
+
+        Args:
+            probs: Tensor of shape (B, 54, 6) with color probabilities (logits if from_logits).
+
+        Returns:
+            Dict mapping each name of LOSS_TERMS to a tensor of shape (B,).
+        """
+        if probs.dim() != 3 or probs.shape[1:] != (54, 6):
+            raise ValueError(f"Expected a (B, 54, 6) tensor, got {tuple(probs.shape)}")
+        if self.from_logits:
+            probs = probs.softmax(dim=2)
+        centers = probs[:, self.center_facelets]
+        arrangements = centers[:, torch.arange(6, device=probs.device), self.center_arrangements].prod(dim=2)
+        relabeled = self.relabel(probs) if self.relative_to_centers else probs
+        corners = self._piece_probs(relabeled, self.corner_facelets, self.corner_stickers)
+        edges = self._piece_probs(relabeled, self.edge_facelets, self.edge_stickers)
+        return {
+            "stickers": (probs.sum(dim=1) - 9.0).abs().sum(dim=1) / 2,
+            "centers": 1.0 - arrangements.sum(dim=1),
+            "corner_cubie": (1.0 - corners.sum(dim=2)).sum(dim=1),
+            "edge_cubie": (1.0 - edges.sum(dim=2)).sum(dim=1),
+            "corner_orientation": self._orientation_violation(corners, 3),
+            "edge_orientation": self._orientation_violation(edges, 2),
+        }
+
+    def forward(self, probs: torch.Tensor) -> torch.Tensor:
+        terms = self.terms(probs)
+        loss = sum(self.weights[term] * terms[term] for term in LOSS_TERMS)
+        if self.reduction == "mean":
+            return loss.mean()
+        if self.reduction == "sum":
+            return loss.sum()
+        return loss
+
+
+BackboneRegistry.register("cube_constraint_loss", CubeConstraintLoss)
@@ -1,6 +1,7 @@
 import torch 
 from modeling.backbone import BackboneRegistry
 from modeling.components import * 
+from modeling.losses import CubeConstraintLoss
 
 
 def create_classifier(yaml_path, num_classes):
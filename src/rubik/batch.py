@@ -0,0 +1,231 @@
+import functools
+import numpy as np
+from rubik.cube import RubiksCube
+from rubik.moves import MOVES, MoveSeq, ids_from_notation
+
+
+FACES = RubiksCube.FACES
+# Byte value of a face letter -> color code (index into FACES). 255 marks letters that are not faces.
+_ENCODE = np.full(256, 255, dtype=np.uint8)
+for _code, _face in enumerate(FACES):
+    _ENCODE[ord(_face)] = _code
+_DECODE = np.frombuffer("".join(FACES).encode("ascii"), dtype=np.uint8)
+
+_move_gathers = None
+_prototype = None
+
+
+def permutation_to_gather(permutation_map):
+    """
+    Converts a permutation map {from_idx: to_idx} into a gather index array.
+
+    The gather array satisfies new_state = old_state[gather], so applying a move
+    to any number of states is a single fancy-indexing operation.
+
+    Args:
+        permutation_map (dict): A permutation map as stored in RubiksCube._permutations.
+
+    Returns:
+        np.ndarray: Index array of length 54.
+    """
+    gather = np.arange(54, dtype=np.intp)
+    for original_index, final_index in permutation_map.items():
+        gather[final_index] = original_index
+    return gather
+
+
+def move_gathers():
+    """
+    Returns the gather arrays for every move defined by RubiksCube, built on first use.
+
+    Returns:
+        dict: Mapping of move notation (e.g. "R'") to a read-only index array of length 54.
+    """
+    global _move_gathers
+    if _move_gathers is None:
+        gathers = {}
+        for move, permutation_map in _prototype_cube()._permutations.items():
+            gather = permutation_to_gather(permutation_map)
+            gather.flags.writeable = False
+            gathers[move] = gather
+        _move_gathers = gathers
+    return _move_gathers
+
+
+def _prototype_cube():
+    """Returns a shared RubiksCube used only to read its move definitions."""
+    global _prototype
+    if _prototype is None:
+        _prototype = RubiksCube()
+    return _prototype
+
+
+@functools.lru_cache(maxsize=4096)
+def _compile_ids(key):
+    gathers = move_gathers()
+    gather = np.arange(54, dtype=np.intp)
+    for move in np.frombuffer(key, dtype=np.uint8).tolist():
+        if MOVES[move] not in gathers:
+            raise ValueError(f"Move '{MOVES[move]}' in sequence is not defined.")
+        gather = gather[gathers[MOVES[move]]]
+    gather.flags.writeable = False
+    return gather
+
+
+def compile_sequence(move_sequence):
+    """
+    Folds a sequence of moves into a single gather index array.
+
+    Strings are parsed to move ids (see rubik.moves), and the gathers of the moves are
+    chained once and cached on the ids, so re-applying a known algorithm costs one
+    gather regardless of its length or how it was written.
+
+    Examples:
+        compile_sequence("R U R' U'") → array of 54 indices
+        state[compile_sequence("R U")] == state[gathers["R"]][gathers["U"]]
+
+    Args:
+        move_sequence (str or MoveSeq): A space-separated string of moves (e.g. "R U R' U'").
+
+    Returns:
+        np.ndarray: Read-only index array of length 54.
+
+    Raises:
+        ValueError: If any move in the sequence is not defined.
+    """
+    if isinstance(move_sequence, MoveSeq):
+        return _compile_ids(move_sequence.tobytes())
+    moves = [move for move in move_sequence.split() if move != "I"] # I, the identity, has no move id
+    return _compile_ids(ids_from_notation(" ".join(moves)).tobytes())
+
+
+def encode_states(states):
+    """
+    Converts cube strings into an (N, 54) uint8 array of color codes.
+
+    Args:
+        states (str, list of str, or np.ndarray): A single cube string, a state list of
+                                                  54 letters, an iterable of cube strings,
+                                                  or an array of codes.
+
+    Returns:
+        np.ndarray: Array of shape (N, 54) with values in range(6).
+
+    Raises:
+        ValueError: If a string does not have 54 face letters.
+    """
+    if isinstance(states, np.ndarray):
+        states = np.asarray(states, dtype=np.uint8)
+        return states.reshape(-1, 54)
+    if isinstance(states, str):
+        states = [states]
+    states = list(states)
+    if states and all(len(state) == 1 for state in states):
+        states = ["".join(states)] # A single state list like RubiksCube.state
+    for i, state in enumerate(states):
+        if len(state) != 54:
+            raise ValueError(f"Cube strings must be 54 characters long, row {i} has {len(state)}.")
+    joined = "".join(states)
+    codes = _ENCODE[np.frombuffer(joined.encode("ascii"), dtype=np.uint8)]
+    if (codes == 255).any():
+        raise ValueError(f"Cube strings may only contain the faces {''.join(FACES)}.")
+    return codes.reshape(-1, 54)
+
+
+def decode_states(codes):
+    """
+    Converts an (N, 54) array of color codes back into cube strings.
+
+    Args:
+        codes (np.ndarray): Array of shape (N, 54) or (54,).
+
+    Returns:
+        list of str: One cube string per row.
+    """
+    codes = np.asarray(codes).reshape(-1, 54)
+    raw = _DECODE[codes].tobytes().decode("ascii")
+    return [raw[i:i + 54] for i in range(0, len(raw), 54)]
+
+
+class BatchCube:
+    """
+    Holds N cube states as an (N, 54) uint8 array of color codes and applies moves to
+    all of them at once. Color codes index into RubiksCube.FACES (U=0, R=1, ... B=5).
+    Moves are executed as a single gather per move, using permutation arrays derived
+    from RubiksCube._permutations.
+    """
+
+    def __init__(self, states=None, n=1):
+        """
+        Initializes the batch.
+
+        Args:
+            states (optional): Cube strings or an (N, 54) array of color codes.
+                               Defaults to n solved cubes.
+            n (int, optional): Number of solved cubes to create when states is None.
+        """
+        if states is None:
+            self.states = np.tile(encode_states(RubiksCube.SOLVED_STATE), (n, 1))
+        else:
+            self.states = np.array(encode_states(states), dtype=np.uint8)
+        self._buffer = np.empty_like(self.states)
+
+    @classmethod
+    def solved(cls, n):
+        """Returns a batch of n solved cubes."""
+        return cls(n=n)
+
+    def __len__(self):
+        return self.states.shape[0]
+
+    def __getitem__(self, index):
+        """Returns the cube string of a single row."""
+        return decode_states(self.states[index])[0]
+
+    def to_strings(self):
+        """Returns the states as a list of cube strings."""
+        return decode_states(self.states)
+
+    def _gather(self, gather):
+        """Applies a gather index array to every state, reusing the spare buffer."""
+        np.take(self.states, gather, axis=1, out=self._buffer)
+        self.states, self._buffer = self._buffer, self.states
+
+    def turn(self, move):
+        """
+        Applies a single move to every state in the batch.
+
+        Args:
+            move (str): The move to apply (e.g., 'U', "R'", "F2", 'x').
+
+        Raises:
+            ValueError: If the move is not defined.
+        """
+        gathers = move_gathers()
+        if move not in gathers:
+            raise ValueError(f"Invalid or undefined move: {move}")
+        self._gather(gathers[move])
+        return self
+
+    def apply_moves(self, move_sequence):
+        """
+        Applies a space-separated sequence of moves to every state in the batch.
+        The sequence is compiled into one permutation, so this is a single gather.
+
+        Args:
+            move_sequence (str or MoveSeq): Moves such as "R U R' U'".
+        """
+        self._gather(compile_sequence(move_sequence))
+        return self
+
+    def is_solved(self):
+        """
+        Returns a boolean array marking the states whose faces are each a single color.
+        Like RubiksCube.is_solved this ignores the orientation of the whole cube.
+        """
+        faces = self.states.reshape(-1, 6, 9)
+        return (faces == faces[:, :, 4:5]).all(axis=(1, 2))
+
+    def copy(self):
+        """Returns an independent copy of the batch."""
+        return BatchCube(self.states.copy())
@@ -1,13 +1,13 @@
 import random
 import collections
-try:
-    import kociemba
-    KOCIEMBA_AVAILABLE = True
-except ImportError:
-    KOCIEMBA_AVAILABLE = False
-    print("Warning: 'kociemba' library not found. Solve and scramble methods will not function.")
+import importlib.util
+from types import MappingProxyType
+from rubik.moves import MoveSeq
 from rubik.symmetries import Symmetries
-from rubik.string_tools import StringManipulate
+from rubik.tables import freeze
+
+# kociemba is imported on first solve; only check that it is installed here.
+KOCIEMBA_AVAILABLE = importlib.util.find_spec("kociemba") is not None
 
 
 
@@ -21,6 +21,8 @@ class RubiksCube(Symmetries):
     SOLVED_STATE = 'UUUUUUUUURRRRRRRRRFFFFFFFFFDDDDDDDDDLLLLLLLLLBBBBBBBBB'
     FACES = ['U', 'R', 'F', 'D', 'L', 'B'] # Standard cube faces
     BASE_MOVES = list(FACES + ["M", "E", "S", "x", "y", 'z']) # Moves for which cycles are initially defined
+    WIDE_MOVES = {'r': ["R", "M'"], 'l': ["L", "M"], 'u': ["U", "E'"], 'd': ["D", "E"], 'f': ["F", "S"], 'b': ["B", "S'"]}
+    _shared_permutations = None # Move table shared by every instance, see shared_permutations()
     
 
     def __init__(self, state_string=SOLVED_STATE):
@@ -41,20 +43,29 @@ class RubiksCube(Symmetries):
         self.state = list(state_string) # Use list for easier manipulation
 
         # --- Move Definitions ---
-        self._permutations = {} # Store permutation maps {from_idx: to_idx}
-        self._define_base_permutations()
-        self._generate_derived_moves() # Generate U', U2, R', R2 etc.
-
-        # Example: Add whole cube rotations (optional)
-        # self._add_sequence_as_move('x', "R M' L'") # M' requires middle slice implementation first
-        # self._add_sequence_as_move('y', "U E' D'") # E' requires middle slice implementation first
-        # self._add_sequence_as_move('z', "F S B'") # S requires middle slice implementation first
+        # Permutation maps {from_idx: to_idx} are built once per process and shared read-only
+        self._permutations = self.shared_permutations()
 
         # Update the list of all valid move notations after generation/addition
         self.valid_moves = list(self._permutations.keys())
 
+    @classmethod
+    def shared_permutations(cls):
+        """
+        Returns the process-wide move table, building it on first use.
 
-    def _define_base_permutations(self):
+        Returns:
+            MappingProxyType: Read-only mapping of move notation to read-only permutation maps.
+        """
+        if RubiksCube._shared_permutations is None:
+            permutations = {}
+            cls._define_base_permutations(permutations)
+            cls._generate_derived_moves(permutations) # Generate U', U2, R', R2 etc.
+            RubiksCube._shared_permutations = freeze(permutations)
+        return RubiksCube._shared_permutations
+
+    @staticmethod
+    def _define_base_permutations(permutations):
         """Defines the raw permutation effect of basic 90-degree clockwise moves."""
         # Base cycles derived from the previous implementation's logic
         # Format: ([face_corners], [face_edges], [side_pieces_affected])
@@ -74,7 +85,7 @@ class RubiksCube(Symmetries):
         inverses = {x+"'": y[::-1] for x, y in unconventional_moves.items()}
         unconventional_moves.update(inverses) # Add inverses to the dictionary
         # Add identity map
-        self._permutations['I'] = {i: i for i in range(54)}
+        permutations['I'] = {i: i for i in range(54)}
         # Convert base cycles into permutation maps {from_idx: to_idx}
         for move, (corners, edges, sides) in base_cycles.items():
             perm_map = {i: i for i in range(54)} # Start with identity
@@ -88,13 +99,13 @@ class RubiksCube(Symmetries):
             for i in range(len(sides)):
                  perm_map[sides[i-3]] = sides[i] # Map element 3 positions back to current element
 
-            self._permutations[move] = perm_map
+            permutations[move] = perm_map
         for move, slice in unconventional_moves.items():
             perm_map = {i: i for i in range(54)} #start with identity
             # apply groups of 3
             for i in range(len(slice)):
                 perm_map[slice[i-3]] = slice[i]
-            self._permutations[move] = perm_map
+            permutations[move] = perm_map
 
     def _apply_permutation(self, permutation_map):
         """Applies a permutation map to the current cube state."""
@@ -104,7 +115,8 @@ class RubiksCube(Symmetries):
             if initial_state[original_index] != self.state[final_index]:
                  self.state[final_index] = initial_state[original_index]
 
-    def _compose_permutations(self, perm_map1, perm_map2):
+    @staticmethod
+    def _compose_permutations(perm_map1, perm_map2):
         """Composes two permutation maps (applies perm_map1 then perm_map2)."""
         composed_map = {}
         for i in range(54):
@@ -113,10 +125,11 @@ class RubiksCube(Symmetries):
             composed_map[i] = perm_map2.get(perm_map1.get(i, i), perm_map1.get(i, i))
         return composed_map
 
-    def _generate_derived_moves(self):
+    @classmethod
+    def _generate_derived_moves(cls, permutations):
         """
-        Generates inverse (') and double (2) moves from the base clockwise moves
-        and adds their permutation maps to self._permutations.
+        Generates inverse (') and double (2) moves from the base clockwise moves,
+        and the wide moves (r, Rw, ...) from faces and slices, and adds their permutation maps to permutations.
         """
         #Generate basic rotations
         x = ["R", "M'", "L'"]
@@ -126,31 +139,40 @@ class RubiksCube(Symmetries):
 
         def compose_sequential(moves_list):
             """Helper function to compose a sequence of moves as a permutation map"""
-            identity = self._permutations['I']
+            identity = permutations['I']
             for count, move in enumerate(moves_list):
-                if move not in self._permutations:
+                if move not in permutations:
                     raise ValueError(f"Move '{move}' in sequence is not defined.")
-                move_map = self._permutations[move]
+                move_map = permutations[move]
                 if count == 0:
-                    perm = self._compose_permutations(identity, move_map)
+                    perm = cls._compose_permutations(identity, move_map)
                 else:
-                    perm = self._compose_permutations(perm, move_map)
+                    perm = cls._compose_permutations(perm, move_map)
             return perm
 
-        for base_move in self.BASE_MOVES:
-            if base_move not in self._permutations: 
+        for base_move in cls.BASE_MOVES:
+            if base_move not in permutations: 
                 for rotation, sequence in base_rotations.items():
                     # Generate the permutation map for the rotation
                     perm_map = compose_sequential(sequence)
-                    self._permutations[rotation] = perm_map
+                    permutations[rotation] = perm_map
+
 
+            p1 = permutations[base_move]            # Permutation for one 90-deg turn
+            p2 = cls._compose_permutations(p1, p1)  # Permutation for 180-deg turn (p1 applied twice)
+            p3 = cls._compose_permutations(p1, p2)  # Permutation for 270-deg turn (p1 applied three times)
 
-            p1 = self._permutations[base_move]       # Permutation for one 90-deg turn
-            p2 = self._compose_permutations(p1, p1)  # Permutation for 180-deg turn (p1 applied twice)
-            p3 = self._compose_permutations(p1, p2)  # Permutation for 270-deg turn (p1 applied three times)
+            permutations[base_move + '2'] = p2
+            permutations[base_move + "'"] = p3 # Inverse is 3 clockwise turns
 
-            self._permutations[base_move + '2'] = p2
-            self._permutations[base_move + "'"] = p3 # Inverse is 3 clockwise turns
+        # Wide moves turn a face together with the middle layer next to it, also written Rw, Rw', Rw2
+        for wide, sequence in cls.WIDE_MOVES.items():
+            p1 = compose_sequential(sequence)
+            p2 = cls._compose_permutations(p1, p1)
+            p3 = cls._compose_permutations(p1, p2)
+            for suffix, perm_map in (('', p1), ('2', p2), ("'", p3)):
+                permutations[wide + suffix] = perm_map
+                permutations[wide.upper() + 'w' + suffix] = perm_map
         
 
     def _get_permutation_from_sequence(self, sequence_string):
@@ -198,6 +220,9 @@ class RubiksCube(Symmetries):
         print(f"Defining '{notation_to_add}' as sequence '{sequence_string}'...")
         try:
             net_permutation = self._get_permutation_from_sequence(sequence_string)
+            if isinstance(self._permutations, MappingProxyType):
+                # Copy on write so the shared move table stays untouched
+                self._permutations = dict(self._permutations)
             self._permutations[notation_to_add] = net_permutation
             # Update the list of valid moves if needed dynamically
             if notation_to_add not in self.valid_moves:
@@ -231,13 +256,19 @@ class RubiksCube(Symmetries):
         expected_counts = {face: 9 for face in RubiksCube.FACES}
         return counts == expected_counts
 
-    def solve(self):
+    def solve(self, cache=None):
         """
         Solves the current cube state using the Kociemba algorithm.
-        
+
+        Args:
+            cache (SolutionCache, optional): Looks the state up in, and stores the
+                                             solution into, a rubik.solution_cache.SolutionCache.
         """
+        if cache is not None:
+            return cache.solve(self.get_state_string())
         if not KOCIEMBA_AVAILABLE:
             raise RuntimeError("Kociemba library not installed. Cannot solve.")
+        import kociemba
         try:
             solution = kociemba.solve(self.get_state_string())
             return solution
@@ -254,7 +285,7 @@ class RubiksCube(Symmetries):
                                        Defaults to 25.
         """
         # Generate scramble using only the standard 18 moves for conventional scrambling
-        standard_moves = [m for m in self.valid_moves if len(m) <= 2 and m[0] in self.FACES]
+        standard_moves = [m for m in self.valid_moves if m[0] in self.FACES and m[1:] in ('', "'", '2')]
         if not standard_moves: # Should not happen after init
              standard_moves = [f + s for f in self.FACES for s in ['', "'", '2']]
 
@@ -269,8 +300,16 @@ class RubiksCube(Symmetries):
         to the cube.
 
         Args:
-            move_sequence (str): A space-separated string of moves (e.g., "R U R'").
+            move_sequence (str or MoveSeq): A space-separated string of moves (e.g., "R U R'"),
+                                            or a rubik.moves.MoveSeq, applied as one compiled permutation.
         """
+        if isinstance(move_sequence, MoveSeq):
+            from rubik.batch import compile_sequence
+            s = self.state if state is None else state
+            s = [s[i] for i in compile_sequence(move_sequence).tolist()]
+            if state is None:
+                self.state = s
+            return s
         moves = move_sequence.split(" ")
         moves = [m for m in moves if m]
         final_update = state is None
@@ -337,11 +376,8 @@ class RubiksCube(Symmetries):
         return canon
     
     def get_canon_rotated_state(self, state=None):
-        s = state
-        canon = self.get_canonical_orientation(s)
-        rotation = self.ORIENTATIONS[canon]
-        rotated_state = self.rotate_state(rotation, s)
-        return rotated_state
+        s = self.state if state is None else state
+        return super().get_canon_rotated_state(s)
     
     def get_rotated_to_canon(self, state=None):
         s = self.state if state is None else state
@@ -361,15 +397,10 @@ class RubiksCube(Symmetries):
         Returns:
             bool: True if equivalent, False otherwise.
         """
-        # produce all equivalencies based on symmetries.
-        other_state = self.get_canon_rotated_state(other_state)
-        for k, v in self.ORIENTATIONS.items():
-            scramble_rotate = self.rotate_state(v, other_state)
-            v_p = StringManipulate.inverse(v)
-            back_to_base = self.apply_moves(v_p, scramble_rotate)
-            if self.is_equal(back_to_base, state):
-                return True
-        return False
+        # Compares against all 24 rotations at once with the precomputed tables
+        from rubik.symmetry_tables import equivalent
+        s = self.state if state is None else state
+        return bool(equivalent("".join(s), "".join(other_state))[0])
     
     def is_equal(self, other_state, state = None):
         """
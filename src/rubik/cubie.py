@@ -0,0 +1,286 @@
+# Cubie-level representation of cube states.
+# A state is described by 20 pieces instead of 54 stickers: which corner/edge sits in each position,
+# how it is twisted/flipped there, and which color each center shows.
+import numpy as np
+from rubik.batch import compile_sequence, decode_states, encode_states, move_gathers
+from rubik.cube import RubiksCube
+from rubik.moves import MoveSeq
+
+CORNERS = ['URF', 'UFL', 'ULB', 'UBR', 'DFR', 'DLF', 'DBL', 'DRB']
+EDGES = ['UR', 'UF', 'UL', 'UB', 'DR', 'DF', 'DL', 'DB', 'FR', 'FL', 'BL', 'BR']
+
+# Facelet indices of every corner/edge position, listed clockwise starting from the U/D facelet
+# (F/B facelet for the middle layer edges). Same layout as CornerValidate.get.
+CORNER_FACELETS = np.array([
+    [8, 9, 20], [6, 18, 38], [0, 36, 47], [2, 45, 11],
+    [29, 26, 15], [27, 44, 24], [33, 53, 42], [35, 17, 51],
+], dtype=np.intp)
+EDGE_FACELETS = np.array([
+    [5, 10], [7, 19], [3, 37], [1, 46], [32, 16], [28, 25],
+    [30, 43], [34, 52], [23, 12], [21, 41], [50, 39], [48, 14],
+], dtype=np.intp)
+CENTER_FACELETS = np.array([4, 13, 22, 31, 40, 49], dtype=np.intp)
+
+# Color codes (index into RubiksCube.FACES) of every piece, in the same order as its home facelets.
+CORNER_COLORS = (CORNER_FACELETS // 9).astype(np.uint8)
+EDGE_COLORS = (EDGE_FACELETS // 9).astype(np.uint8)
+
+
+def _build_corner_lookup():
+    """Maps a color triple (c0*36 + c1*6 + c2) to piece*3 + twist, or -1 if no corner has those colors."""
+    lookup = np.full(6 ** 3, -1, dtype=np.int8)
+    for piece, colors in enumerate(CORNER_COLORS.tolist()):
+        for twist in range(3):
+            seen = [colors[(j - twist) % 3] for j in range(3)]
+            lookup[seen[0] * 36 + seen[1] * 6 + seen[2]] = piece * 3 + twist
+    return lookup
+
+
+def _build_edge_lookup():
+    """Maps a color pair (c0*6 + c1) to piece*2 + flip, or -1 if no edge has those colors."""
+    lookup = np.full(6 ** 2, -1, dtype=np.int8)
+    for piece, colors in enumerate(EDGE_COLORS.tolist()):
+        for flip in range(2):
+            seen = [colors[(j - flip) % 2] for j in range(2)]
+            lookup[seen[0] * 6 + seen[1]] = piece * 2 + flip
+    return lookup
+
+
+CORNER_LOOKUP = _build_corner_lookup()
+EDGE_LOOKUP = _build_edge_lookup()
+# Row piece*3 + twist holds the colors a twisted corner shows on its position's facelets (same for edges)
+CORNER_STICKERS = np.array([[CORNER_COLORS[piece][(m - twist) % 3] for m in range(3)]
+                            for piece in range(8) for twist in range(3)], dtype=np.uint8)
+EDGE_STICKERS = np.array([[EDGE_COLORS[piece][(m - flip) % 2] for m in range(2)]
+                          for piece in range(12) for flip in range(2)], dtype=np.uint8)
+# Puts [centers, corner stickers, edge stickers] back into facelet order
+_FACELET_ORDER = np.argsort(np.concatenate([CENTER_FACELETS, CORNER_FACELETS.ravel(), EDGE_FACELETS.ravel()]))
+
+_valid_center_keys = None
+_move_cubes = {}
+
+
+def permutation_parity(permutations):
+    """
+    Computes the parity of each row of a batch of permutations by counting inversions.
+
+    Args:
+        permutations (np.ndarray): Array of shape (N, n).
+
+    Returns:
+        np.ndarray: Array of shape (N,) with 0 for even and 1 for odd permutations.
+    """
+    permutations = np.asarray(permutations, dtype=np.int8)
+    n = permutations.shape[-1]
+    parity = np.zeros(permutations.shape[0], dtype=np.int8)
+    for i in range(n - 1):
+        for j in range(i + 1, n):
+            parity ^= permutations[:, i] > permutations[:, j]
+    return parity
+
+
+def piece_keys(states):
+    """
+    Encodes the colors of every corner as c0*36 + c1*6 + c2 and of every edge as c0*6 + c1,
+    the keys of CORNER_LOOKUP and EDGE_LOOKUP.
+
+    Args:
+        states: Cube strings or an (N, 54) array of color codes.
+
+    Returns:
+        tuple: (corner_keys, edge_keys) with shapes (N, 8) and (N, 12).
+    """
+    codes = encode_states(states).astype(np.intp)
+    corners = codes[:, CORNER_FACELETS]
+    edges = codes[:, EDGE_FACELETS]
+    return corners[:, :, 0] * 36 + corners[:, :, 1] * 6 + corners[:, :, 2], edges[:, :, 0] * 6 + edges[:, :, 1]
+
+
+def _center_key(centers):
+    return (centers.astype(np.int64) * 6 ** np.arange(6)).sum(axis=-1)
+
+
+def valid_center_keys():
+    """Returns the encoded center arrangements of the 24 whole-cube orientations."""
+    global _valid_center_keys
+    if _valid_center_keys is None:
+        solved = encode_states(RubiksCube.SOLVED_STATE)[0]
+        centers = np.array([solved[compile_sequence(rotation)][CENTER_FACELETS]
+                            for rotation in RubiksCube.ORIENTATIONS.values()])
+        _valid_center_keys = np.sort(_center_key(centers))
+    return _valid_center_keys
+
+
+class CubieCube:
+    """
+    Holds N cube states at the cubie level:
+        cp (N, 8):  corner piece in each corner position (index into CORNERS), -1 if unidentifiable
+        co (N, 8):  twist of that corner, 0-2, -1 if unidentifiable
+        ep (N, 12): edge piece in each edge position (index into EDGES), -1 if unidentifiable
+        eo (N, 12): flip of that edge, 0-1, -1 if unidentifiable
+        centers (N, 6): color code shown on each center (U, R, F, D, L, B)
+
+    Moves are applied as group multiplication on these arrays, so a turn touches 20 pieces
+    instead of 54 stickers.
+    """
+
+    def __init__(self, cp, co, ep, eo, centers):
+        self.cp = np.asarray(cp, dtype=np.int8).reshape(-1, 8)
+        self.co = np.asarray(co, dtype=np.int8).reshape(-1, 8)
+        self.ep = np.asarray(ep, dtype=np.int8).reshape(-1, 12)
+        self.eo = np.asarray(eo, dtype=np.int8).reshape(-1, 12)
+        self.centers = np.asarray(centers, dtype=np.int8).reshape(-1, 6)
+
+    @classmethod
+    def solved(cls, n=1):
+        """Returns a batch of n solved cubes."""
+        return cls(np.tile(np.arange(8), (n, 1)), np.zeros((n, 8)),
+                   np.tile(np.arange(12), (n, 1)), np.zeros((n, 12)),
+                   np.tile(np.arange(6), (n, 1)))
+
+    @classmethod
+    def from_facelets(cls, states):
+        """
+        Converts facelet states into cubies. Pieces whose colors do not form a real
+        corner/edge are marked with -1.
+
+        Args:
+            states: Cube strings or an (N, 54) array of color codes.
+        """
+        codes = encode_states(states)
+        corner_keys, edge_keys = piece_keys(codes)
+        return cls.from_piece_keys(corner_keys, edge_keys, codes[:, CENTER_FACELETS])
+
+    @classmethod
+    def from_piece_keys(cls, corner_keys, edge_keys, centers):
+        """
+        Builds the cubies from the keys returned by piece_keys and the (N, 6) center colors.
+        """
+        corner_ids = CORNER_LOOKUP[corner_keys]
+        edge_ids = EDGE_LOOKUP[edge_keys]
+        cp = np.where(corner_ids >= 0, corner_ids // 3, -1)
+        co = np.where(corner_ids >= 0, corner_ids % 3, -1)
+        ep = np.where(edge_ids >= 0, edge_ids // 2, -1)
+        eo = np.where(edge_ids >= 0, edge_ids % 2, -1)
+        return cls(cp, co, ep, eo, centers)
+
+    @classmethod
+    def move(cls, move):
+        """
+        Returns the single-row cubie cube of a move, i.e. the move applied to a solved cube.
+
+        Args:
+            move (str): Any move defined by RubiksCube (e.g., "R'", "M2", "y").
+
+        Raises:
+            ValueError: If the move is not defined.
+        """
+        if move not in _move_cubes:
+            gathers = move_gathers()
+            if move not in gathers:
+                raise ValueError(f"Invalid or undefined move: {move}")
+            solved = np.arange(54, dtype=np.uint8) // 9
+            _move_cubes[move] = cls.from_facelets(solved[gathers[move]])
+        return _move_cubes[move]
+
+    def __len__(self):
+        return self.cp.shape[0]
+
+    def copy(self):
+        return CubieCube(self.cp.copy(), self.co.copy(), self.ep.copy(), self.eo.copy(), self.centers.copy())
+
+    def is_identified(self):
+        """Returns a boolean array marking the states in which every piece was identified."""
+        return (self.cp >= 0).all(axis=1) & (self.ep >= 0).all(axis=1)
+
+    def to_facelets(self):
+        """
+        Converts the cubies back into an (N, 54) array of color codes.
+
+        Raises:
+            ValueError: If any piece is unidentifiable.
+        """
+        if not self.is_identified().all():
+            raise ValueError("Cannot build facelets from unidentified pieces.")
+        n = len(self)
+        corners = CORNER_STICKERS[self.cp.astype(np.intp) * 3 + self.co].reshape(n, 24)
+        edges = EDGE_STICKERS[self.ep.astype(np.intp) * 2 + self.eo].reshape(n, 24)
+        parts = np.concatenate([self.centers.astype(np.uint8), corners, edges], axis=1)
+        return np.ascontiguousarray(parts[:, _FACELET_ORDER])
+
+    def to_strings(self):
+        """Returns the states as a list of cube strings."""
+        return decode_states(self.to_facelets())
+
+    def multiply(self, other):
+        """
+        Applies other (a move, or any cubie cube with 1 or N rows) after self.
+
+        Args:
+            other (CubieCube): The transformation to apply.
+
+        Returns:
+            CubieCube: A new batch holding the product.
+        """
+        shape_c, shape_e, shape_x = self.cp.shape, self.ep.shape, self.centers.shape
+        other_cp = np.broadcast_to(other.cp, shape_c).astype(np.intp)
+        other_ep = np.broadcast_to(other.ep, shape_e).astype(np.intp)
+        cp = np.take_along_axis(self.cp, other_cp, axis=1)
+        co = (np.take_along_axis(self.co, other_cp, axis=1) + other.co) % 3
+        ep = np.take_along_axis(self.ep, other_ep, axis=1)
+        eo = (np.take_along_axis(self.eo, other_ep, axis=1) + other.eo) % 2
+        centers = np.take_along_axis(self.centers, np.broadcast_to(other.centers, shape_x).astype(np.intp), axis=1)
+        return CubieCube(cp, co, ep, eo, centers)
+
+    def turn(self, move):
+        """Returns the batch with a single move applied."""
+        return self.multiply(self.move(move))
+
+    def apply_moves(self, move_sequence):
+        """Returns the batch with a space-separated sequence of moves (or a MoveSeq) applied."""
+        cube = self
+        moves = move_sequence if isinstance(move_sequence, MoveSeq) else move_sequence.split()
+        for move in moves:
+            cube = cube.turn(move)
+        return cube
+
+    def corner_twist(self):
+        """Total corner twist mod 3 of each state, -1 where a corner is unidentifiable."""
+        total = self.co.sum(axis=1) % 3
+        return np.where((self.co >= 0).all(axis=1), total, -1)
+
+    def edge_flip(self):
+        """Total edge flip mod 2 of each state, -1 where an edge is unidentifiable."""
+        total = self.eo.sum(axis=1) % 2
+        return np.where((self.eo >= 0).all(axis=1), total, -1)
+
+    def corner_parity(self):
+        """Parity of the corner permutation of each state."""
+        return permutation_parity(self.cp)
+
+    def edge_parity(self):
+        """Parity of the edge permutation of each state."""
+        return permutation_parity(self.ep)
+
+    def center_parity(self):
+        """Parity of the center permutation, odd after quarter slice moves and some rotations."""
+        return permutation_parity(self.centers)
+
+    def is_permutation(self):
+        """Returns a boolean array marking the states that hold every corner and edge exactly once."""
+        corners = (np.sort(self.cp, axis=1) == np.arange(8)).all(axis=1)
+        edges = (np.sort(self.ep, axis=1) == np.arange(12)).all(axis=1)
+        return corners & edges
+
+    def centers_valid(self):
+        """Returns a boolean array marking the states whose centers form one of the 24 orientations."""
+        return np.isin(_center_key(self.centers), valid_center_keys())
+
+    def is_valid(self):
+        """
+        Returns a boolean array marking the states reachable by moves: every piece present once,
+        zero total twist and flip, and corner, edge and center parities that cancel out.
+        """
+        parity = self.corner_parity() ^ self.edge_parity() ^ self.center_parity()
+        return (self.is_permutation() & self.centers_valid()
+                & (self.corner_twist() == 0) & (self.edge_flip() == 0) & (parity == 0))
@@ -0,0 +1,294 @@
+# Constrained decoding of per-sticker color scores into valid cube states.
+# Arg-maxing every sticker on its own often gives an invalid cube. Instead the state is built
+# from pieces: the centers pick one of the 24 orientations, corners and edges are placed by
+# Hungarian assignment on piece-level scores, and twists/flips are chosen so that they sum to
+# zero, with the corner and edge permutations of equal parity.
+#
+# Scores are summed log-probabilities, so the decoded state is the most likely valid state
+# when the stickers are independent. Assignments are enumerated best first (Murty's algorithm),
+# and every search stops as soon as its upper bound falls below the best state found.
+import collections
+import heapq
+import itertools
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from rubik.batch import decode_states
+from rubik.cubie import (CENTER_FACELETS, CORNER_FACELETS, CORNER_STICKERS, EDGE_FACELETS, EDGE_STICKERS,
+                         CubieCube)
+from rubik.utils.validation import CENTER_ARRANGEMENTS, validate_batch
+
+Decoding = collections.namedtuple("Decoding", ["state", "score"])
+
+_FORBIDDEN = -1e12
+_CHUNK = 1024 # States scored at once, about 60 MB of orientation scores
+
+
+def _log_probabilities(logits):
+    """Normalizes scores of shape (N, 54, 6) into log-probabilities per sticker."""
+    shifted = logits - logits.max(axis=2, keepdims=True)
+    return shifted - np.log(np.exp(shifted).sum(axis=2, keepdims=True))
+
+
+def _sticker_keys(stickers):
+    """Color keys (see rubik.cubie.piece_keys) of every row of stickers, in each of the 24 orientations."""
+    size = stickers.shape[1]
+    return (CENTER_ARRANGEMENTS[:, stickers].astype(np.intp) * 6 ** np.arange(size - 1, -1, -1)).sum(axis=2)
+
+
+_CORNER_KEYS = _sticker_keys(CORNER_STICKERS)
+_EDGE_KEYS = _sticker_keys(EDGE_STICKERS)
+
+
+def _piece_scores(scores, facelets, keys):
+    """
+    Returns the (N, 24, positions, pieces, orientations) scores of putting every piece in
+    every position and orientation, relative to each of the 24 center orientations.
+    """
+    positions, size = facelets.shape
+    # Scores of every color key in every position, the first facelet being the most significant
+    totals = np.zeros((len(scores), positions, 1))
+    for i in range(size):
+        totals = (totals[:, :, :, None] + scores[:, facelets[:, i], None, :]).reshape(len(scores), positions, -1)
+    return totals[:, :, keys].transpose(0, 2, 1, 3).reshape(len(scores), len(keys), positions, -1, size)
+
+
+def _parity(permutation):
+    """Parity of a permutation given as a tuple, by counting the even-length cycles."""
+    seen = [False] * len(permutation)
+    parity = 0
+    for start in range(len(permutation)):
+        length = 0
+        position = start
+        while not seen[position]:
+            seen[position] = True
+            position = permutation[position]
+            length += 1
+        if length and length % 2 == 0:
+            parity ^= 1
+    return parity
+
+
+def _completions(scores, k):
+    """
+    Chooses one orientation per position so that they sum to 0 mod m, from (n, m) scores.
+
+    Returns:
+        list: Up to k (score, orientations) tuples, best first.
+    """
+    m = scores.shape[1]
+    choices = scores.argmax(axis=1)
+    if k == 1 and choices.sum() % m == 0:
+        return [(float(scores.max(axis=1).sum()), tuple(choices.tolist()))]
+    partial = {0: [(0.0, ())]} # residue -> best (score, orientations) so far
+    for row in scores.tolist():
+        merged = collections.defaultdict(list)
+        for residue, entries in partial.items():
+            for orientation, score in enumerate(row):
+                target = merged[(residue + orientation) % m]
+                target.extend((total + score, choices + (orientation,)) for total, choices in entries)
+        partial = {residue: heapq.nlargest(k, entries) for residue, entries in merged.items()}
+    return partial.get(0, [])
+
+
+class _Placements:
+    """
+    Enumerates the placements (permutation, orientations) of one kind of piece best first,
+    separately for even and odd permutations. Permutations come from Murty's ranking of
+    Hungarian assignments, scored with the best orientation of every piece, which bounds the
+    score of every completion with orientations summing to zero.
+    """
+
+    def __init__(self, scores, k, max_assignments):
+        self.scores = scores
+        self.best = scores.max(axis=2)
+        self.k = k
+        self.max_assignments = max_assignments
+        self.assignments = 0
+        self.found = {0: [], 1: []} # parity -> (score, permutation, orientations), best first
+        self._heap = []
+        self._counter = itertools.count()
+        score, permutation = self._solve((), ())
+        self.upper_bound = score
+        self.root_parity = _parity(permutation)
+        self._push("node", score, permutation, (), ())
+
+    def _push(self, kind, bound, permutation, forced, forbidden):
+        heapq.heappush(self._heap, (-bound, next(self._counter), kind, permutation, forced, forbidden))
+
+    def _solve(self, forced, forbidden):
+        """Best assignment with the forced (row, column) pairs and without the forbidden ones."""
+        matrix = self.best.copy()
+        for row, column in forbidden:
+            matrix[row, column] = _FORBIDDEN
+        for row, column in forced:
+            keep = matrix[row, column]
+            matrix[row, :] = _FORBIDDEN
+            matrix[:, column] = _FORBIDDEN
+            matrix[row, column] = keep
+        rows, columns = linear_sum_assignment(matrix, maximize=True)
+        self.assignments += 1
+        if (matrix[rows, columns] <= _FORBIDDEN / 2).any():
+            return None
+        return float(self.best[rows, columns].sum()), tuple(columns.tolist())
+
+    def _kth(self, parity):
+        found = self.found[parity]
+        return found[self.k - 1][0] if len(found) >= self.k else -np.inf
+
+    def top(self, parity, floor=-np.inf):
+        """
+        Returns the best placements of the given parity, up to k of them and only those
+        scoring above floor (or fewer if max_assignments is reached).
+        """
+        while self._heap and self.assignments < self.max_assignments:
+            bound = -self._heap[0][0]
+            if bound <= floor or bound <= self._kth(parity):
+                break
+            _, _, kind, permutation, forced, forbidden = heapq.heappop(self._heap)
+            if kind == "node":
+                self._add(permutation)
+                # The children score at most as much as their parent, so they are only solved when needed
+                self._push("children", bound, permutation, forced, forbidden)
+                continue
+            fixed = {row for row, _ in forced}
+            free = [row for row in range(len(permutation)) if row not in fixed]
+            for i, row in enumerate(free[:-1]):
+                child_forced = forced + tuple((r, permutation[r]) for r in free[:i])
+                child_forbidden = forbidden + ((row, permutation[row]),)
+                child = self._solve(child_forced, child_forbidden)
+                if child is not None:
+                    self._push("node", child[0], child[1], child_forced, child_forbidden)
+        return [entry for entry in self.found[parity] if entry[0] > floor]
+
+    def _add(self, permutation):
+        orientations = self.scores[np.arange(len(permutation)), list(permutation)]
+        found = self.found[_parity(permutation)]
+        found.extend((score, permutation, choices) for score, choices in _completions(orientations, self.k))
+        found.sort(key=lambda entry: -entry[0])
+        del found[self.k:]
+
+
+def _best_pairs(corners, edges, k, best):
+    """Merges the best corner and edge placements of equal parity into best, a list of (score, corners, edges)."""
+    # The parity of the best corner assignment usually wins, and then prunes the other one
+    for parity in (corners.root_parity, 1 - corners.root_parity):
+        threshold = best[k - 1][0] if len(best) >= k else -np.inf
+        found_corners = corners.top(parity, threshold - edges.upper_bound)
+        if not found_corners:
+            continue
+        found_edges = edges.top(parity, threshold - found_corners[0][0])
+        for corner, edge in itertools.product(found_corners, found_edges):
+            best.append((corner[0] + edge[0], corner, edge))
+        best.sort(key=lambda entry: -entry[0])
+        del best[k:]
+
+
+def _orientation_scores(scores):
+    """
+    Scores an (N, 54, 6) batch of log-probabilities in each of the 24 center orientations.
+
+    Returns:
+        tuple: Center scores (N, 24), corner scores (N, 24, 8, 8, 3), edge scores (N, 24, 12, 12, 2)
+               and upper bounds of the total score (N, 24).
+    """
+    center_scores = scores[:, CENTER_FACELETS, CENTER_ARRANGEMENTS].sum(axis=2)
+    corner_scores = _piece_scores(scores, CORNER_FACELETS, _CORNER_KEYS)
+    edge_scores = _piece_scores(scores, EDGE_FACELETS, _EDGE_KEYS)
+    # Best piece of every position, ignoring that each piece is used once
+    bounds = center_scores + corner_scores.max(axis=(3, 4)).sum(axis=2) + edge_scores.max(axis=(3, 4)).sum(axis=2)
+    return center_scores, corner_scores, edge_scores, bounds
+
+
+def _decode_one(center_scores, corner_scores, edge_scores, bounds, k, max_assignments):
+    """
+    Returns the k best (score, orientation, corners, edges) of one state, from its scores in
+    each of the 24 orientations (see _orientation_scores).
+    """
+    best = []
+    for orientation in np.argsort(-bounds, kind="stable").tolist():
+        threshold = best[k - 1][0] if len(best) >= k else -np.inf
+        if bounds[orientation] <= threshold:
+            break
+        corners = _Placements(corner_scores[orientation], k, max_assignments)
+        edges = _Placements(edge_scores[orientation], k, max_assignments)
+        pairs = []
+        _best_pairs(corners, edges, k, pairs)
+        best.extend((center_scores[orientation] + score, orientation, corner, edge) for score, corner, edge in pairs)
+        best.sort(key=lambda entry: -entry[0])
+        del best[k:]
+    return best
+
+
+def _build_states(decoded):
+    """Turns (score, orientation, corners, edges) tuples into cube strings."""
+    if not decoded:
+        return []
+    cp = [corner[1] for _, _, corner, _ in decoded]
+    co = [corner[2] for _, _, corner, _ in decoded]
+    ep = [edge[1] for _, _, _, edge in decoded]
+    eo = [edge[2] for _, _, _, edge in decoded]
+    relative = CubieCube(cp, co, ep, eo, np.tile(np.arange(6), (len(decoded), 1))).to_facelets()
+    orientations = np.array([orientation for _, orientation, _, _ in decoded])
+    colors = np.take_along_axis(CENTER_ARRANGEMENTS[orientations], relative.astype(np.intp), axis=1)
+    return decode_states(colors)
+
+
+def decode_batch(logits, k=1, normalize=True, max_assignments=200):
+    """
+    Decodes per-sticker color scores into the most likely valid cube states.
+
+    Examples:
+        decode_batch(model(images).softmax(-1).log().numpy())[0][0].state
+
+    Args:
+        logits (array-like): Scores of shape (N, 54, 6) or (54, 6), colors in RubiksCube.FACES order.
+        k (int, optional): Number of alternatives per state.
+        normalize (bool, optional): Apply a log-softmax over the colors of every sticker first.
+                                    Turn off if the scores already are log-probabilities.
+        max_assignments (int, optional): Cap on the Hungarian solves per piece type and orientation.
+                                         The result is exact unless it is reached.
+
+    Returns:
+        list: One list per state of up to k Decoding(state, score), best first.
+    """
+    scores = np.asarray(logits, dtype=np.float64).reshape(-1, 54, 6)
+    if normalize:
+        scores = _log_probabilities(scores)
+    results = [None] * len(scores)
+    searched = np.arange(len(scores))
+    if k == 1:
+        # The arg-max of every sticker is the best state whenever it already is valid
+        argmax = scores.argmax(axis=2).astype(np.uint8)
+        valid = validate_batch(argmax)["valid"]
+        totals = scores.max(axis=2).sum(axis=1)
+        for i, state in zip(np.flatnonzero(valid).tolist(), decode_states(argmax[valid])):
+            results[i] = [Decoding(state, float(totals[i]))]
+        searched = np.flatnonzero(~valid)
+    decoded = []
+    for start in range(0, len(searched), _CHUNK):
+        orientation_scores = _orientation_scores(scores[searched[start:start + _CHUNK]])
+        decoded.extend(_decode_one(*row, k, max_assignments) for row in zip(*orientation_scores))
+    states = iter(_build_states([entry for entries in decoded for entry in entries]))
+    for i, entries in zip(searched.tolist(), decoded):
+        results[i] = [Decoding(next(states), float(entry[0])) for entry in entries]
+    return results
+
+
+def top_k(logits, k, normalize=True, max_assignments=200):
+    """
+    Returns the k most likely valid states of one (54, 6) array of scores, see decode_batch.
+
+    Returns:
+        list: Up to k Decoding(state, score), best first.
+    """
+    return decode_batch(logits, k, normalize, max_assignments)[0]
+
+
+def decode(logits, normalize=True, max_assignments=200):
+    """
+    Returns the most likely valid state of one (54, 6) array of scores, see decode_batch.
+
+    Returns:
+        Decoding: (state, score) with the cube string and its summed log-probability.
+    """
+    return top_k(logits, 1, normalize, max_assignments)[0]
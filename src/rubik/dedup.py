@@ -0,0 +1,252 @@
+# Streaming deduplication of cube states into equivalence classes.
+# Each state is hashed through its rotation-class representative (see symmetry_tables.rotation_canonical),
+# so N states take N canonicalizations instead of O(N^2) calls to RubiksCube.is_equivalent.
+import argparse
+import collections
+import itertools
+import os
+import shutil
+import sys
+import tempfile
+import numpy as np
+from rubik.encoding import PACKED_BYTES, pack_states, state_hash
+from rubik.symmetry_tables import rotation_canonical
+
+EquivalenceClass = collections.namedtuple("EquivalenceClass", ["state", "count", "first_index"])
+
+# Layout of the records spilled to disk, one per class and flush
+_SPILL_RECORD = np.dtype([("key", f"V{PACKED_BYTES}"), ("count", "<u8"), ("first_index", "<u8"), ("state", "S54")])
+
+
+def read_states(sources):
+    """
+    Streams cube strings from files and/or iterables, one state per non-empty line.
+
+    Args:
+        sources (iterable): File paths ("-" reads stdin) or iterables of strings, or a single path.
+
+    Yields:
+        str: The stripped cube strings.
+    """
+    if isinstance(sources, (str, os.PathLike)):
+        sources = [sources]
+    for source in sources:
+        if source == "-":
+            yield from _stripped(sys.stdin)
+        elif isinstance(source, (str, os.PathLike)):
+            with open(source) as lines:
+                yield from _stripped(lines)
+        else:
+            yield from _stripped(source)
+
+
+def _stripped(lines):
+    return (line.strip() for line in lines if line.strip())
+
+
+class Deduplicator:
+    """
+    Groups a stream of cube states into classes of equivalent states
+    (same as RubiksCube.is_equivalent: equal up to whole-cube rotation and recoloring).
+
+    At most max_classes classes are held in memory. Beyond that, classes are spilled to
+    hash-partitioned files on disk and merged partition by partition in classes().
+
+    Examples:
+        dedup = Deduplicator(max_classes=10**6)
+        dedup.add(read_states("scrape.txt"))
+        for cls in dedup.classes():
+            cls.state, cls.count
+    """
+
+    def __init__(self, max_classes=1_000_000, spill_dir=None, partitions=64, chunksize=8192, skip_invalid=False):
+        """
+        Args:
+            max_classes (int, optional): Number of classes kept in memory before spilling to disk.
+            spill_dir (str, optional): Directory for spill files. A temporary directory is used if omitted.
+            partitions (int, optional): Number of spill files. Merging loads one file at a time.
+            chunksize (int, optional): States canonicalized per batch.
+            skip_invalid (bool, optional): Count and skip states that are not 54 face letters
+                                           with proper centers instead of raising.
+        """
+        self.max_classes = max_classes
+        self.spill_dir = spill_dir
+        self.partitions = partitions
+        self.chunksize = chunksize
+        self.skip_invalid = skip_invalid
+        self.seen = 0
+        self.skipped = 0
+        self.spills = 0
+        self._classes = {} # packed representative -> [count, first index, state]
+        self._spill_path = None
+        self._owns_spill_dir = False
+
+    def _canonical_keys(self, states):
+        """Returns the packed representatives of a chunk, with None for skipped states."""
+        keys = [None] * len(states)
+        # Lines of the wrong length are dropped before encoding, so they can never be read as part of another row
+        indices = [i for i, state in enumerate(states) if not self.skip_invalid or len(state) == 54]
+        if not indices:
+            return keys
+        try:
+            packed = pack_states(rotation_canonical([states[i] for i in indices])[0])
+        except ValueError:
+            if not self.skip_invalid:
+                raise
+        else:
+            for i, key in zip(indices, packed):
+                keys[i] = bytes(key)
+            return keys
+        for i in indices:
+            try:
+                keys[i] = pack_states(rotation_canonical(states[i])[0])[0].tobytes()
+            except ValueError:
+                pass
+        return keys
+
+    def add(self, states):
+        """
+        Adds states to their classes.
+
+        Args:
+            states (iterable): Cube strings, e.g. from read_states.
+
+        Raises:
+            ValueError: If a state is invalid and skip_invalid is False.
+        """
+        states = iter(states)
+        while True:
+            chunk = list(itertools.islice(states, self.chunksize))
+            if not chunk:
+                return
+            for offset, (state, key) in enumerate(zip(chunk, self._canonical_keys(chunk))):
+                if key is None:
+                    self.skipped += 1
+                    continue
+                entry = self._classes.get(key)
+                if entry is None:
+                    self._classes[key] = [1, self.seen + offset, state]
+                else:
+                    entry[0] += 1
+            self.seen += len(chunk)
+            if len(self._classes) > self.max_classes:
+                self._spill()
+
+    def _spill(self):
+        """Appends the in-memory classes to their partition files and clears them."""
+        if not self._classes:
+            return
+        if self._spill_path is None:
+            if self.spill_dir is None:
+                self._spill_path = tempfile.mkdtemp(prefix="rubik-dedup-")
+                self._owns_spill_dir = True
+            else:
+                os.makedirs(self.spill_dir, exist_ok=True)
+                self._spill_path = self.spill_dir
+        records = np.empty(len(self._classes), dtype=_SPILL_RECORD)
+        records["key"] = np.frombuffer(b"".join(self._classes), dtype=f"V{PACKED_BYTES}")
+        values = list(self._classes.values())
+        records["count"] = [value[0] for value in values]
+        records["first_index"] = [value[1] for value in values]
+        records["state"] = [value[2].encode("ascii") for value in values]
+        keys = np.frombuffer(records["key"].tobytes(), dtype=np.uint8).reshape(-1, PACKED_BYTES)
+        partition = state_hash(keys) % np.uint64(self.partitions)
+        for index in np.unique(partition):
+            with open(self._partition_file(index), "ab") as file:
+                records[partition == index].tofile(file)
+        self._classes = {}
+        self.spills += 1
+
+    def _partition_file(self, index):
+        return os.path.join(self._spill_path, f"partition-{int(index):04d}.bin")
+
+    def _merge_partition(self, path):
+        """Merges the spilled records of one partition by key."""
+        records = np.fromfile(path, dtype=_SPILL_RECORD)
+        # Sorting by key, then by first index, puts the earliest state of every class first
+        records = records[np.lexsort((records["first_index"], records["key"].view(f"S{PACKED_BYTES}")))]
+        keys = records["key"].view(f"S{PACKED_BYTES}")
+        starts = np.flatnonzero(np.concatenate([[True], keys[1:] != keys[:-1]]))
+        counts = np.add.reduceat(records["count"], starts)
+        for start, count in zip(starts.tolist(), counts.tolist()):
+            yield EquivalenceClass(records["state"][start].decode("ascii"), count, int(records["first_index"][start]))
+
+    def classes(self):
+        """
+        Yields one EquivalenceClass(state, count, first_index) per class, where state is the
+        first state seen of the class. Without spilling, classes come in order of first
+        appearance; after spilling they come partition by partition.
+        """
+        if self._spill_path is None:
+            for count, first_index, state in self._classes.values():
+                yield EquivalenceClass(state, count, first_index)
+            return
+        self._spill()
+        for index in range(self.partitions):
+            path = self._partition_file(index)
+            if os.path.exists(path):
+                yield from self._merge_partition(path)
+
+    def close(self):
+        """Removes the spill files."""
+        if self._spill_path is not None:
+            if self._owns_spill_dir:
+                shutil.rmtree(self._spill_path, ignore_errors=True)
+            else:
+                for index in range(self.partitions):
+                    path = self._partition_file(index)
+                    if os.path.exists(path):
+                        os.remove(path)
+        self._spill_path = None
+        self._owns_spill_dir = False
+        self._classes = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def deduplicate(states, **kwargs):
+    """
+    Groups states into equivalence classes in one pass.
+
+    Args:
+        states (iterable): Cube strings, or file paths wrapped with read_states.
+        **kwargs: Options of Deduplicator (max_classes, spill_dir, partitions, chunksize, skip_invalid).
+
+    Yields:
+        EquivalenceClass: (state, count, first_index) for every class.
+    """
+    with Deduplicator(**kwargs) as dedup:
+        dedup.add(states)
+        yield from dedup.classes()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Group cube strings into equivalence classes and count them.")
+    parser.add_argument("inputs", nargs="*", default=["-"], help="Files with one cube string per line, - for stdin.")
+    parser.add_argument("-o", "--output", help="Write 'state<TAB>count' lines here instead of stdout.")
+    parser.add_argument("--max-classes", type=int, default=1_000_000, help="Classes kept in memory before spilling.")
+    parser.add_argument("--spill-dir", help="Directory for spill files, a temporary one by default.")
+    parser.add_argument("--partitions", type=int, default=64, help="Number of spill files.")
+    parser.add_argument("--skip-invalid", action="store_true", help="Skip malformed states instead of failing.")
+    args = parser.parse_args(argv)
+
+    output = open(args.output, "w") if args.output else sys.stdout
+    try:
+        with Deduplicator(args.max_classes, args.spill_dir, args.partitions, skip_invalid=args.skip_invalid) as dedup:
+            dedup.add(read_states(args.inputs))
+            unique = 0
+            for cls in dedup.classes():
+                output.write(f"{cls.state}\t{cls.count}\n")
+                unique += 1
+        print(f"{dedup.seen} states, {unique} classes, {dedup.skipped} skipped", file=sys.stderr)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
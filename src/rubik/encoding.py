@@ -0,0 +1,214 @@
+# Compact encodings of cube states for large state sets.
+# - Packed facelets: 3 bits per sticker, 21 bytes per state, works for any 54-sticker string.
+# - Cubie coordinate: an exact integer below 2**66 for valid states in the standard orientation.
+# - A stable 64-bit hash of the packed form, identical across processes and runs.
+import math
+import numpy as np
+from rubik.batch import BatchCube, decode_states, encode_states
+from rubik.cubie import CubieCube, permutation_parity
+
+PACKED_BYTES = 21
+TWIST_SPACE = 3 ** 7
+FLIP_SPACE = 2 ** 11
+CORNER_SPACE = math.factorial(8) * TWIST_SPACE
+EDGE_SPACE = math.factorial(12) // 2 * FLIP_SPACE # Edge parity follows from the corner parity
+_BIT_SHIFTS = np.array([2, 1, 0], dtype=np.uint8)
+
+
+def _as_codes(states):
+    """Accepts a RubiksCube, BatchCube, cube string(s), state list, or array of color codes."""
+    if isinstance(states, BatchCube):
+        return states.states
+    if hasattr(states, "get_state_string"):
+        return encode_states(states.get_state_string())
+    return encode_states(states)
+
+
+def pack_states(states):
+    """
+    Packs states into 3 bits per facelet.
+
+    Args:
+        states: A RubiksCube, BatchCube, cube string(s), or an (N, 54) array of color codes.
+
+    Returns:
+        np.ndarray: Array of shape (N, 21) and dtype uint8.
+    """
+    codes = _as_codes(states)
+    bits = (codes[:, :, None] >> _BIT_SHIFTS) & 1
+    return np.packbits(bits.reshape(len(codes), 54 * 3), axis=1)
+
+
+def unpack_states(packed):
+    """
+    Inverse of pack_states.
+
+    Args:
+        packed (np.ndarray): Array of shape (N, 21) or (21,).
+
+    Returns:
+        np.ndarray: Array of shape (N, 54) with color codes.
+    """
+    packed = np.asarray(packed, dtype=np.uint8).reshape(-1, PACKED_BYTES)
+    bits = np.unpackbits(packed, axis=1, count=54 * 3).reshape(-1, 54, 3)
+    return (bits << _BIT_SHIFTS).sum(axis=2, dtype=np.uint8)
+
+
+def pack(state):
+    """Packs a single state into a hashable 21-byte key, usable as a dict key."""
+    return pack_states(state).tobytes()
+
+
+def unpack(key):
+    """Returns the cube string of a key produced by pack."""
+    return decode_states(unpack_states(np.frombuffer(key, dtype=np.uint8)))[0]
+
+
+def as_sortable(packed):
+    """
+    Views packed states as one fixed-size byte string per row, so they can go
+    through np.sort, np.unique or np.searchsorted directly.
+
+    Args:
+        packed (np.ndarray): Array of shape (N, 21).
+
+    Returns:
+        np.ndarray: Array of shape (N,) and dtype V21.
+    """
+    packed = np.ascontiguousarray(packed, dtype=np.uint8).reshape(-1, PACKED_BYTES)
+    return packed.view(f"V{PACKED_BYTES}").ravel()
+
+
+def _splitmix64(x):
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def state_hash(states):
+    """
+    Computes a stable 64-bit hash of each state. Unlike hash() on strings this does not
+    depend on PYTHONHASHSEED, so hashes can be stored and compared across runs.
+
+    Args:
+        states: Anything pack_states accepts, or already packed (N, 21) arrays.
+
+    Returns:
+        np.ndarray: Array of shape (N,) and dtype uint64.
+    """
+    if isinstance(states, np.ndarray) and states.ndim == 2 and states.shape[1] == PACKED_BYTES:
+        packed = states
+    else:
+        packed = pack_states(states)
+    padded = np.zeros((len(packed), 24), dtype=np.uint8)
+    padded[:, :PACKED_BYTES] = packed
+    words = padded.view("<u8")
+    digest = np.zeros(len(packed), dtype=np.uint64)
+    for column in range(words.shape[1]):
+        digest = _splitmix64(digest ^ words[:, column])
+    return digest
+
+
+def _rank_permutations(permutations):
+    """Lehmer rank of each row of an (N, n) batch of permutations."""
+    n = permutations.shape[1]
+    upper = np.triu(np.ones((n, n), dtype=bool), k=1)
+    digits = ((permutations[:, :, None] > permutations[:, None, :]) & upper).sum(axis=2)
+    weights = np.array([math.factorial(n - 1 - i) for i in range(n)], dtype=np.int64)
+    return digits.astype(np.int64) @ weights
+
+
+def _unrank_permutations(ranks, n):
+    """Inverse of _rank_permutations."""
+    ranks = np.asarray(ranks, dtype=np.int64).copy()
+    available = np.ones((len(ranks), n), dtype=bool)
+    permutations = np.empty((len(ranks), n), dtype=np.int8)
+    for i in range(n):
+        weight = math.factorial(n - 1 - i)
+        digit = ranks // weight
+        ranks %= weight
+        # The digit-th element that has not been used yet
+        choice = np.argmax(np.cumsum(available, axis=1) > digit[:, None], axis=1)
+        permutations[:, i] = choice
+        available[np.arange(len(ranks)), choice] = False
+    return permutations
+
+
+def _orientation_digits(orientations, base):
+    """Encodes all but the last orientation, which is implied by the zero-sum rule."""
+    weights = base ** np.arange(orientations.shape[1] - 2, -1, -1, dtype=np.int64)
+    return orientations[:, :-1].astype(np.int64) @ weights
+
+
+def _orientation_from_digits(values, count, base):
+    values = np.asarray(values, dtype=np.int64).copy()
+    orientations = np.empty((len(values), count), dtype=np.int8)
+    for i in range(count - 2, -1, -1):
+        orientations[:, i] = values % base
+        values //= base
+    orientations[:, -1] = (-orientations[:, :-1].sum(axis=1)) % base
+    return orientations
+
+
+def cubie_coordinates(states):
+    """
+    Encodes valid states in the standard orientation (centers URFDLB) as two exact coordinates:
+    corner permutation and twist (below CORNER_SPACE), and edge permutation and flip (below EDGE_SPACE).
+
+    Args:
+        states: Anything pack_states accepts.
+
+    Returns:
+        np.ndarray: Array of shape (N, 2) and dtype uint64.
+
+    Raises:
+        ValueError: If a state is not a valid cube in the standard orientation.
+    """
+    cubies = CubieCube.from_facelets(_as_codes(states))
+    standard = (cubies.centers == np.arange(6)).all(axis=1)
+    if not (cubies.is_valid() & standard).all():
+        raise ValueError("Cubie coordinates require valid states with centers in the standard orientation.")
+    corners = _rank_permutations(cubies.cp) * TWIST_SPACE + _orientation_digits(cubies.co, 3)
+    edges = _rank_permutations(cubies.ep) // 2 * FLIP_SPACE + _orientation_digits(cubies.eo, 2)
+    return np.stack([corners, edges], axis=1).astype(np.uint64)
+
+
+def from_cubie_coordinates(coordinates):
+    """
+    Inverse of cubie_coordinates.
+
+    Args:
+        coordinates (np.ndarray): Array of shape (N, 2).
+
+    Returns:
+        np.ndarray: Array of shape (N, 54) with color codes.
+    """
+    coordinates = np.asarray(coordinates, dtype=np.uint64).reshape(-1, 2).astype(np.int64)
+    corners, edges = coordinates[:, 0], coordinates[:, 1]
+    cp = _unrank_permutations(corners // TWIST_SPACE, 8)
+    co = _orientation_from_digits(corners % TWIST_SPACE, 8, 3)
+    ep = _unrank_permutations(edges // FLIP_SPACE * 2, 12)
+    # The two permutations sharing a halved rank differ in parity, pick the one matching the corners
+    mismatch = permutation_parity(ep) != permutation_parity(cp)
+    ep[mismatch] = _unrank_permutations(edges[mismatch] // FLIP_SPACE * 2 + 1, 12)
+    eo = _orientation_from_digits(edges % FLIP_SPACE, 12, 2)
+    centers = np.tile(np.arange(6), (len(coordinates), 1))
+    return CubieCube(cp, co, ep, eo, centers).to_facelets()
+
+
+def cubie_index(state):
+    """
+    Returns the exact cubie coordinate of a single valid state as one integer below 2**66.
+
+    Args:
+        state: A RubiksCube or cube string.
+    """
+    corners, edges = cubie_coordinates(state)[0].tolist()
+    return corners * EDGE_SPACE + edges
+
+
+def from_cubie_index(index):
+    """Returns the cube string of an integer produced by cubie_index."""
+    corners, edges = divmod(index, EDGE_SPACE)
+    return decode_states(from_cubie_coordinates([[corners, edges]]))[0]
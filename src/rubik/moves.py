@@ -0,0 +1,143 @@
+# Integer move ids.
+# A move id is layer * 3 + power, where the layer indexes MOVE_LAYERS and the power is
+# 0 for a clockwise quarter turn, 1 for a half turn and 2 for a counterclockwise quarter turn.
+# The 18 face turns come first, so ids below FACE_MOVE_COUNT are the standard scramble moves.
+import numpy as np
+
+FACES = ['U', 'R', 'F', 'D', 'L', 'B']
+MOVE_LAYERS = FACES + ['M', 'E', 'S', 'x', 'y', 'z', 'u', 'r', 'f', 'd', 'l', 'b']
+POWERS = ['', '2', "'"]
+MOVES = [layer + power for layer in MOVE_LAYERS for power in POWERS]
+MOVE_IDS = {move: i for i, move in enumerate(MOVES)}
+# Rw, Rw', Rw2 ... are the same moves as r, r', r2
+MOVE_IDS.update({layer.upper() + 'w' + power: MOVE_IDS[layer + power]
+                 for layer in MOVE_LAYERS[-6:] for power in POWERS})
+FACE_MOVE_COUNT = 18
+_MOVE_ARRAY = np.array(MOVES)
+
+
+def move_id(move):
+    """
+    Returns the integer id of a move.
+
+    Args:
+        move (str): A move such as "R'", "M2" or "y".
+
+    Raises:
+        ValueError: If the move has no id.
+    """
+    if move not in MOVE_IDS:
+        raise ValueError(f"Invalid or undefined move: {move}")
+    return MOVE_IDS[move]
+
+
+def ids_from_notation(move_sequence):
+    """Converts a space-separated move string into a uint8 array of move ids."""
+    return np.array([move_id(move) for move in move_sequence.split()], dtype=np.uint8)
+
+
+def notation_from_ids(ids):
+    """Converts a sequence of move ids into a space-separated move string."""
+    return " ".join(_MOVE_ARRAY[np.asarray(ids, dtype=np.intp)].tolist())
+
+
+def inverse_ids(ids):
+    """Returns the id of the inverse of each move: R <-> R', R2 stays R2."""
+    ids = np.asarray(ids, dtype=np.uint8)
+    power = ids % 3
+    return ids - power + (2 - power)
+
+
+class MoveSeq:
+    """
+    A move sequence stored as a uint8 array of move ids, one byte per move.
+
+    Inversion, concatenation and slicing are array operations, and the engine
+    (compile_sequence, BatchCube, CubieCube, RubiksCube.apply_moves, simplify) accepts
+    a MoveSeq wherever it accepts a move string, without parsing.
+
+    Examples:
+        seq = MoveSeq("R U R' U'")
+        seq.inverse() → MoveSeq("U R U' R'")
+        seq[:2] + MoveSeq("F2") → MoveSeq("R U F2")
+        str(seq) → "R U R' U'"
+        seq == "R U R' U'" → True (but MoveSeq("Rw") == "Rw" is False, its notation is "r")
+    """
+    __slots__ = ("ids",)
+
+    def __init__(self, moves=()):
+        """
+        Args:
+            moves (str, MoveSeq or array-like, optional): Space-separated notation, another
+                                                          sequence, or move ids.
+
+        Raises:
+            ValueError: If a move is not defined, or move ids are not integers in range(len(MOVES)).
+        """
+        if isinstance(moves, str):
+            ids = ids_from_notation(moves)
+        elif isinstance(moves, MoveSeq):
+            ids = moves.ids.copy()
+        else:
+            ids = np.asarray(moves).ravel()
+            if ids.size and not np.issubdtype(ids.dtype, np.integer):
+                raise ValueError(f"Move ids must be integers, got {ids.dtype}.")
+            if ids.size and (ids.min() < 0 or ids.max() >= len(MOVES)):
+                raise ValueError(f"Move ids must be in range(0, {len(MOVES)}).")
+            ids = ids.astype(np.uint8)
+        self.ids = ids
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Inverse of tobytes."""
+        return cls(np.frombuffer(data, dtype=np.uint8))
+
+    def tobytes(self):
+        """Returns the sequence as bytes, one per move, for compact storage."""
+        return self.ids.tobytes()
+
+    def to_notation(self):
+        return notation_from_ids(self.ids)
+
+    def inverse(self):
+        """Returns the sequence that undoes this one: reversed, with every move inverted."""
+        return MoveSeq(inverse_ids(self.ids[::-1]))
+
+    def __array__(self, dtype=None, copy=None):
+        return self.ids if dtype is None else self.ids.astype(dtype)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        return iter(_MOVE_ARRAY[self.ids.astype(np.intp)].tolist())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return MoveSeq(self.ids[index])
+        return MOVES[self.ids[index]]
+
+    def __add__(self, other):
+        if not isinstance(other, MoveSeq):
+            other = MoveSeq(other)
+        return MoveSeq(np.concatenate([self.ids, other.ids]))
+
+    def __radd__(self, other):
+        return MoveSeq(other) + self
+
+    def __eq__(self, other):
+        # Strings compare against the canonical notation, so that equal objects hash equally
+        if isinstance(other, str):
+            return self.to_notation() == other
+        if not isinstance(other, MoveSeq):
+            return NotImplemented
+        return np.array_equal(self.ids, other.ids)
+
+    def __hash__(self):
+        return hash(self.to_notation())
+
+    def __str__(self):
+        return self.to_notation()
+
+    def __repr__(self):
+        return f"MoveSeq({self.to_notation()!r})"
@@ -0,0 +1,146 @@
+# Bulk parsing of reconstruction dumps.
+# A dump holds solves separated by blank lines. The first line of a solve is its scramble
+# (optionally prefixed with "Scramble:"), every following line is one solution step:
+#
+#   Scramble: R U2 F' L D B2 R' U F2 D'
+#   y // inspection
+#   R U R' F \ cross
+#   [R, U] U2 // F2L 1
+#
+# Comments use the \ and // styles of StringManipulate.remove_comments and are kept per step.
+import collections
+import concurrent.futures
+import itertools
+import os
+from rubik.moves import MoveSeq
+from rubik.string_tools import StringManipulate
+
+Step = collections.namedtuple("Step", ["moves", "comment"])
+_SCRAMBLE_PREFIX = "scramble:"
+
+
+class Reconstruction(collections.namedtuple("Reconstruction", ["index", "line", "scramble", "steps", "error"])):
+    """
+    One parsed solve.
+        index:    position of the solve in the dump
+        line:     line number (from 1) of its scramble
+        scramble: Step with the scramble moves (a MoveSeq) and its comment
+        steps:    tuple of Steps, one per solution line
+        error:    None, or why the solve could not be parsed (scramble and steps are then empty)
+    """
+    __slots__ = ()
+
+    @property
+    def solution(self):
+        """All solution steps as one MoveSeq."""
+        return sum((step.moves for step in self.steps), MoveSeq())
+
+
+def split_comment(line):
+    """
+    Splits a line into its notation and its comment.
+
+    Examples:
+        "R U R' // sexy" → ("R U R' ", "sexy")
+
+    Returns:
+        tuple: (notation, comment), the comment stripped and empty if the line has none.
+    """
+    starts = [position for position in (line.find("\\"), line.find("//")) if position >= 0]
+    if not starts:
+        return line, ""
+    start = min(starts)
+    marker = 2 if line.startswith("//", start) else 1
+    return line[:start], line[start + marker:].strip()
+
+
+def _parse_step(line):
+    notation, comment = split_comment(line)
+    return Step(MoveSeq(StringManipulate.parse_ids(notation)), comment)
+
+
+def parse_block(index, line_number, lines):
+    """
+    Parses the lines of one solve into a Reconstruction. Lines that fail to parse
+    (e.g. unbalanced brackets) are reported in the error field instead of raising.
+    """
+    try:
+        head = lines[0].strip()
+        if head.lower().startswith(_SCRAMBLE_PREFIX):
+            head = head[len(_SCRAMBLE_PREFIX):]
+        scramble = _parse_step(head)
+        steps = tuple(_parse_step(line) for line in lines[1:])
+    except ValueError as e:
+        return Reconstruction(index, line_number, Step(MoveSeq(), ""), (), f"{type(e).__name__}: {e}")
+    return Reconstruction(index, line_number, scramble, steps, None)
+
+
+def _parse_blocks(blocks):
+    """Worker entry point: parses a list of (index, line number, lines) blocks."""
+    return [parse_block(*block) for block in blocks]
+
+
+def read_blocks(source):
+    """
+    Splits a dump into solves lazily.
+
+    Args:
+        source (str or iterable): A file path, or an iterable of lines (e.g. an open file).
+
+    Yields:
+        tuple: (index, line number of the first line, list of lines) per solve.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source) as lines:
+            yield from read_blocks(lines)
+        return
+    block, start, index = [], 0, 0
+    for number, line in enumerate(source, start=1):
+        line = line.rstrip("\n")
+        if line.strip():
+            if not block:
+                start = number
+            block.append(line)
+        elif block:
+            yield index, start, block
+            block, index = [], index + 1
+    if block:
+        yield index, start, block
+
+
+def parse_reconstructions(source, workers=1, chunksize=256):
+    """
+    Parses a dump of reconstructions into records, lazily and in input order.
+
+    Examples:
+        for solve in parse_reconstructions("solves.txt", workers=8):
+            solve.scramble.moves, [step.comment for step in solve.steps]
+
+    Args:
+        source (str or iterable): A file path, or an iterable of lines.
+        workers (int, optional): Number of processes. 1 parses inline, None uses the CPU count.
+        chunksize (int, optional): Solves sent to a worker at a time.
+
+    Yields:
+        Reconstruction: One record per solve.
+    """
+    blocks = read_blocks(source)
+    chunks = iter(lambda: list(itertools.islice(blocks, chunksize)), [])
+    workers = workers if workers is not None else os.cpu_count() or 1
+    if workers <= 1:
+        for chunk in chunks:
+            yield from _parse_blocks(chunk)
+        return
+    pool = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+    try:
+        # Only a few chunks are in flight, so the dump is never held in memory at once
+        pending = collections.deque(pool.submit(_parse_blocks, chunk)
+                                    for chunk in itertools.islice(chunks, 2 * workers))
+        while pending:
+            records = pending.popleft().result()
+            chunk = next(chunks, None)
+            if chunk is not None:
+                pending.append(pool.submit(_parse_blocks, chunk))
+            yield from records
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,248 @@
+# Simplification of move sequences.
+# Turns about the same axis commute, so a run of them can be merged layer by layer
+# (U U -> U2, R R' -> nothing, R L R' -> L) and written in a fixed order (U before D, R before L, F before B).
+import numpy as np
+from rubik.moves import FACES, MOVE_LAYERS, MOVES, MoveSeq, ids_from_notation, inverse_ids, notation_from_ids
+from rubik.symmetries import Symmetries
+
+# Axis of every layer: 0 for U/D, 1 for R/L, 2 for F/B, following MOVE_LAYERS
+LAYER_AXIS = [0, 1, 2, 0, 1, 2, 1, 0, 2, 1, 0, 2, 0, 1, 2, 0, 1, 2]
+# Face whose clockwise direction each slice and rotation follows (M like L, x like R, ...)
+_LAYER_FACE = {'M': 'L', 'E': 'D', 'S': 'F', 'x': 'R', 'y': 'U', 'z': 'F'}
+_FACE_LAYER = {'L': 'M', 'D': 'E', 'F': 'S'}
+_FACE_ROTATION = {'R': 'x', 'U': 'y', 'F': 'z'}
+_OPPOSITE = {'U': 'D', 'R': 'L', 'F': 'B', 'D': 'U', 'L': 'R', 'B': 'F'}
+_ROTATION_LAYERS = {MOVE_LAYERS.index(rotation) for rotation in "xyz"}
+# Clockwise slice and wide moves as face turns followed by a rotation
+_LAYER_EXPANSIONS = {
+    'M': "R L' x'", 'E': "U D' y'", 'S': "F' B z",
+    'r': "L x", 'l': "R x'", 'u': "D y", 'd': "U y'", 'f': "B z", 'b': "F z'",
+}
+
+_symmetries = None
+_relabel_tables = {}
+
+
+def _get_symmetries():
+    global _symmetries
+    if _symmetries is None:
+        _symmetries = Symmetries()
+    return _symmetries
+
+
+def _relabel_layer(layer, relabeling):
+    """Returns (layer, inverted) turned by the same move as layer once the cube was rotated."""
+    if layer in FACES:
+        return relabeling[layer], False
+    if layer.islower() and layer not in _LAYER_FACE: # Wide moves
+        return relabeling[layer.upper()].lower(), False
+    face = relabeling[_LAYER_FACE[layer]]
+    table = _FACE_ROTATION if layer in "xyz" else _FACE_LAYER
+    if face in table:
+        return table[face], False
+    return table[_OPPOSITE[face]], True
+
+
+def _relabel_table(orientation):
+    """
+    Returns a uint8 array mapping every move id m to the id of relabel(m), so that
+    rotating into orientation (an id of Symmetries.rotation_names) and then doing m
+    equals relabel(m) followed by the rotation.
+    """
+    if orientation not in _relabel_tables:
+        symmetries = _get_symmetries()
+        relabeling = symmetries.get_move_relabeling(symmetries.rotation_names[orientation])
+        table = np.empty(len(MOVES), dtype=np.uint8)
+        for layer_id, layer in enumerate(MOVE_LAYERS):
+            new_layer, inverted = _relabel_layer(layer, relabeling)
+            for power in range(3):
+                new_power = 2 - power if inverted else power
+                table[layer_id * 3 + power] = MOVE_LAYERS.index(new_layer) * 3 + new_power
+        _relabel_tables[orientation] = table
+    return _relabel_tables[orientation]
+
+
+def _expansion_table():
+    """Maps every move id to the ids of face turns and rotations doing the same."""
+    table = []
+    for layer in MOVE_LAYERS:
+        for power in range(3):
+            if layer not in _LAYER_EXPANSIONS:
+                table.append([MOVE_LAYERS.index(layer) * 3 + power])
+                continue
+            # The moves of an expansion commute, so a half turn doubles each of them and an inverse inverts each
+            expansion = ids_from_notation(_LAYER_EXPANSIONS[layer])
+            if power == 1:
+                expansion = expansion - expansion % 3 + 1
+            elif power == 2:
+                expansion = inverse_ids(expansion)
+            table.append(expansion.tolist())
+    return table
+
+
+_EXPANSIONS = _expansion_table()
+
+
+def _merge(ids):
+    """
+    Merges runs of same-axis moves with a stack of groups, in linear time. A group maps
+    each layer of one axis to its net number of quarter turns. When a group cancels out
+    completely the group below it becomes adjacent to the next move and can keep merging.
+    """
+    groups = [] # (axis, {layer: quarter turns})
+    for move in ids:
+        layer, quarters = divmod(int(move), 3)
+        axis = LAYER_AXIS[layer]
+        if not groups or groups[-1][0] != axis:
+            groups.append((axis, {}))
+        turns = groups[-1][1]
+        turns[layer] = (turns.get(layer, 0) + quarters + 1) % 4
+        if turns[layer] == 0:
+            del turns[layer]
+            if not turns:
+                groups.pop()
+    merged = []
+    for _, turns in groups:
+        merged.extend(layer * 3 + quarters - 1 for layer, quarters in sorted(turns.items()))
+    return merged
+
+
+def simplify_ids(ids, push_rotations=False):
+    """
+    Simplifies a sequence of move ids (see rubik.moves).
+
+    Args:
+        ids (array-like): Move ids.
+        push_rotations (bool, optional): Rewrite every move after a rotation as the move it
+                                         amounts to without the rotation, and do all rotations
+                                         once at the end as a single orientation from
+                                         Symmetries.ORIENTATIONS.
+
+    Returns:
+        np.ndarray: The simplified move ids, dtype uint8.
+    """
+    ids = np.asarray(ids, dtype=np.uint8).ravel()
+    rotation = []
+    if push_rotations:
+        symmetries = _get_symmetries()
+        orientation = symmetries.rotation_ids["I"]
+        moves = []
+        for move in ids.tolist():
+            if move // 3 in _ROTATION_LAYERS:
+                orientation = symmetries.cayley[orientation][symmetries.rotation_ids[MOVES[move]]]
+            else:
+                moves.append(_relabel_table(orientation)[move])
+        ids = moves
+        rotation = ids_from_notation(symmetries.rotation_names[orientation]).tolist()
+    return np.array(_merge(ids) + rotation, dtype=np.uint8)
+
+
+def eliminate_rotations_ids(ids):
+    """
+    Rewrites a sequence of move ids as face turns only, followed by a single orientation.
+
+    Slice and wide moves are first written as face turns plus a rotation (M = R L' x',
+    r = L x, ...), then every rotation is pushed to the end through the relabel tables.
+
+    Args:
+        ids (array-like): Move ids.
+
+    Returns:
+        tuple: (moves, orientation) with the simplified face turn ids (uint8) and the id of the
+               trailing orientation (see Symmetries.rotation_names).
+    """
+    symmetries = _get_symmetries()
+    orientation = symmetries.rotation_ids["I"]
+    moves = []
+    for move in np.asarray(ids, dtype=np.uint8).ravel().tolist():
+        for part in _EXPANSIONS[move]:
+            if part // 3 in _ROTATION_LAYERS:
+                orientation = symmetries.cayley[orientation][symmetries.rotation_ids[MOVES[part]]]
+            else:
+                moves.append(_relabel_table(orientation)[part])
+    return np.array(_merge(moves), dtype=np.uint8), orientation
+
+
+def eliminate_rotations(moves):
+    """
+    Rewrites a move sequence as rotation-free face turns and one trailing orientation.
+    The face turns can be compared across solvers who rotate differently, and the whole
+    sequence compiles into a single permutation.
+
+    Examples:
+        eliminate_rotations("x U R") → "F R x"
+        eliminate_rotations("M' U M") → "R' L F R L'"
+        eliminate_rotations("r U r'") → "L F L'"
+
+    Args:
+        moves (str, MoveSeq or array-like): A space-separated move string, or move ids.
+
+    Returns:
+        str, MoveSeq or np.ndarray: Face turns followed by the rotations of the final orientation
+                                    (none if the cube ends up in the starting orientation), of the
+                                    same type as moves (uint8 move ids for other array-likes).
+
+    Raises:
+        ValueError: If a move is not one of rubik.moves.MOVES.
+    """
+    as_string = isinstance(moves, str)
+    ids, orientation = eliminate_rotations_ids(ids_from_notation(moves) if as_string else moves)
+    rotation = ids_from_notation(_get_symmetries().rotation_names[orientation])
+    result = np.concatenate([ids, rotation]).astype(np.uint8)
+    if isinstance(moves, MoveSeq):
+        return MoveSeq(result)
+    return notation_from_ids(result) if as_string else result
+
+
+def relabel_moves(moves, rotation, inverse=False):
+    """
+    Relabels a move sequence through a whole-cube rotation, so that doing rotation and then
+    moves equals doing the relabeled moves and then rotation. Slice, wide and rotation moves
+    are relabeled as well as face turns.
+
+    Examples:
+        relabel_moves("R U", "y") → "B U"
+        relabel_moves("M2 x", "y") → "S2 z'"
+
+    Args:
+        moves (str): A space-separated move string.
+        rotation (str): A rotation string (see Symmetries.rotation_id).
+        inverse (bool, optional): Undo the relabeling instead.
+
+    Returns:
+        str: The relabeled moves.
+
+    Raises:
+        ValueError: If a move is not one of rubik.moves.MOVES.
+    """
+    table = _relabel_table(_get_symmetries().rotation_id(rotation))
+    if inverse:
+        table = np.argsort(table).astype(np.uint8)
+    return notation_from_ids(table[ids_from_notation(moves)])
+
+
+def simplify(moves, push_rotations=False):
+    """
+    Simplifies a move sequence without changing its effect on the cube.
+
+    Examples:
+        simplify("U U R R'") → "U2"
+        simplify("R L R' D U") → "L U D"
+        simplify("x U R", push_rotations=True) → "F R x"
+
+    Args:
+        moves (str, MoveSeq or array-like): A space-separated move string, or move ids.
+        push_rotations (bool, optional): See simplify_ids.
+
+    Returns:
+        str, MoveSeq or np.ndarray: The simplified sequence, of the same type as moves
+                                    (uint8 move ids for other array-likes).
+
+    Raises:
+        ValueError: If a move is not one of rubik.moves.MOVES.
+    """
+    if isinstance(moves, str):
+        return notation_from_ids(simplify_ids(ids_from_notation(moves), push_rotations))
+    if isinstance(moves, MoveSeq):
+        return MoveSeq(simplify_ids(moves.ids, push_rotations))
+    return simplify_ids(moves, push_rotations)
@@ -0,0 +1,117 @@
+# Cache of kociemba solutions keyed by rotation-canonical state.
+# A scramble seen from any of the 24 orientations maps to the same key, so it is solved once.
+import collections
+import sqlite3
+from rubik.batch import decode_states
+from rubik.cube import RubiksCube
+from rubik.encoding import pack
+from rubik.simplify import relabel_moves
+from rubik.symmetry_tables import ORIENTATION_NAMES, rotation_canonical
+
+
+class SolutionCache:
+    """
+    Two-tier solution cache: an in-memory LRU in front of an optional sqlite file
+    that survives process restarts.
+
+    States are keyed on their canonical form: the smallest canonical recoloring over the
+    24 whole-cube rotations of the state (the equivalence used by is_equivalent).
+    Stored solutions belong to the canonical state and are relabeled through the rotation
+    on the way out, so the returned solution is correct for the caller's orientation.
+    """
+
+    def __init__(self, path=None, maxsize=100_000):
+        """
+        Args:
+            path (str, optional): sqlite file for the persistent tier. Memory only if omitted.
+            maxsize (int, optional): Number of solutions held in memory.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._cube = RubiksCube()
+        self._memory = collections.OrderedDict()
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path)
+            self._db.execute("CREATE TABLE IF NOT EXISTS solutions (state BLOB PRIMARY KEY, solution TEXT NOT NULL)")
+            self._db.commit()
+
+    def canonical(self, state):
+        """
+        Returns the canonical form of a state, see rubik.symmetry_tables.rotation_canonical.
+
+        Args:
+            state (str or list): The state in cube string notation.
+
+        Returns:
+            tuple: (canonical_state, rotation) where rotating state by rotation and
+                   recoloring it with get_canon_rotated_state gives canonical_state.
+        """
+        representatives, rotations = rotation_canonical(state)
+        name = ORIENTATION_NAMES[rotations[0]]
+        return decode_states(representatives)[0], self._cube.ORIENTATIONS[name]
+
+    def _lookup(self, key):
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key]
+        if self._db is not None:
+            row = self._db.execute("SELECT solution FROM solutions WHERE state = ?", (key,)).fetchone()
+            if row is not None:
+                self._remember(key, row[0])
+                return row[0]
+        return None
+
+    def _remember(self, key, solution):
+        self._memory[key] = solution
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def _store(self, key, solution):
+        self._remember(key, solution)
+        if self._db is not None:
+            self._db.execute("INSERT OR REPLACE INTO solutions VALUES (?, ?)", (key, solution))
+            self._db.commit()
+
+    def get(self, state):
+        """Returns the cached solution for state in its own orientation, or None."""
+        canonical, rotation = self.canonical(state)
+        solution = self._lookup(pack(canonical))
+        if solution is None:
+            return None
+        return relabel_moves(solution, rotation)
+
+    def put(self, state, solution):
+        """Stores a solution of state (in the state's own orientation)."""
+        canonical, rotation = self.canonical(state)
+        self._store(pack(canonical), relabel_moves(solution, rotation, inverse=True))
+
+    def solve(self, state):
+        """
+        Returns a solution for state, solving the canonical state with kociemba on a miss.
+
+        Raises:
+            RuntimeError: If kociemba is needed but not installed.
+        """
+        canonical, rotation = self.canonical(state)
+        key = pack(canonical)
+        solution = self._lookup(key)
+        if solution is None:
+            self.misses += 1
+            solution = RubiksCube(canonical).solve()
+            self._store(key, solution)
+        else:
+            self.hits += 1
+        return relabel_moves(solution, rotation)
+
+    def __len__(self):
+        if self._db is not None:
+            return self._db.execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+        return len(self._memory)
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
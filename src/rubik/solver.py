@@ -0,0 +1,166 @@
+# Parallel batch solving of cube states with kociemba.
+import collections
+import concurrent.futures
+import itertools
+import os
+import time
+
+SolveResult = collections.namedtuple("SolveResult", ["index", "state", "solution", "error"])
+
+
+class SolveStats:
+    """Running throughput statistics of a solve_many call."""
+
+    def __init__(self):
+        self.solved = 0
+        self.failed = 0
+        self.started = time.perf_counter()
+        self.finished = None
+
+    @property
+    def completed(self):
+        return self.solved + self.failed
+
+    @property
+    def elapsed(self):
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return end - self.started
+
+    @property
+    def states_per_second(self):
+        elapsed = self.elapsed
+        return self.completed / elapsed if elapsed > 0 else 0.0
+
+    def __repr__(self):
+        return (f"SolveStats(solved={self.solved}, failed={self.failed}, "
+                f"elapsed={self.elapsed:.2f}s, states_per_second={self.states_per_second:.1f})")
+
+
+def _as_string(state):
+    """Accepts cube strings, state lists, or anything with get_state_string (e.g. RubiksCube)."""
+    if hasattr(state, "get_state_string"):
+        return state.get_state_string()
+    return state if isinstance(state, str) else "".join(state)
+
+
+def _solve_chunk(states):
+    """Worker entry point: solves a list of cube strings, capturing per-state failures."""
+    import kociemba
+    results = []
+    for state in states:
+        try:
+            results.append((kociemba.solve(state), None))
+        except Exception as e:
+            results.append((None, f"{type(e).__name__}: {e}"))
+    return results
+
+
+class SolveStream:
+    """
+    Iterates over the results of solving many states, in input order.
+    Work is spread over a process pool; only a few chunks are in flight at a time,
+    so the input can be a lazy iterator of any length.
+    """
+
+    def __init__(self, states, workers=None, chunksize=16, timeout=None):
+        self.states = states
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        self.chunksize = chunksize
+        self.timeout = timeout
+        self.stats = SolveStats()
+
+    def _chunks(self):
+        indexed = ((index, _as_string(state)) for index, state in enumerate(self.states))
+        while True:
+            chunk = list(itertools.islice(indexed, self.chunksize))
+            if not chunk:
+                return
+            yield chunk
+
+    def _emit(self, chunk, results):
+        for (index, state), (solution, error) in zip(chunk, results):
+            if error is None:
+                self.stats.solved += 1
+            else:
+                self.stats.failed += 1
+            yield SolveResult(index, state, solution, error)
+
+    def __iter__(self):
+        self.stats = SolveStats()
+        try:
+            if self.workers <= 1:
+                for chunk in self._chunks():
+                    yield from self._emit(chunk, _solve_chunk([state for _, state in chunk]))
+            else:
+                yield from self._iterate_pool()
+        finally:
+            self.stats.finished = time.perf_counter()
+
+    def _iterate_pool(self):
+        chunks = self._chunks()
+        pool = concurrent.futures.ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            pending = collections.deque()
+
+            def submit(chunk):
+                return pool.submit(_solve_chunk, [state for _, state in chunk])
+
+            def submit_next():
+                chunk = next(chunks, None)
+                if chunk is not None:
+                    pending.append((chunk, submit(chunk)))
+
+            for _ in range(2 * self.workers):
+                submit_next()
+            while pending:
+                chunk, future = pending.popleft()
+                try:
+                    results = future.result(timeout=self.timeout)
+                except concurrent.futures.TimeoutError:
+                    # A running chunk cannot be cancelled and would hold its worker, so the pool is
+                    # replaced: chunks that had not started yet are resubmitted to the new one
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    pool = concurrent.futures.ProcessPoolExecutor(max_workers=self.workers)
+                    for i, (waiting, waiting_future) in enumerate(pending):
+                        if waiting_future.cancelled():
+                            pending[i] = (waiting, submit(waiting))
+                    results = [(None, f"TimeoutError: no result within {self.timeout}s")] * len(chunk)
+                except Exception as e: # e.g. a worker process died
+                    results = [(None, f"{type(e).__name__}: {e}")] * len(chunk)
+                submit_next()
+                yield from self._emit(chunk, results)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def solve_many(states, workers=None, chunksize=16, timeout=None):
+    """
+    Solves many cube states with kociemba in parallel.
+
+    Failures (invalid states, timeouts) are reported per state and never abort the batch.
+
+    Examples:
+        stream = solve_many(states, workers=32)
+        for result in stream:
+            result.index, result.solution, result.error
+        stream.stats.states_per_second
+
+    Args:
+        states (iterable): Cube strings, state lists or RubiksCube objects.
+        workers (int, optional): Number of processes. Defaults to the CPU count; 1 solves inline.
+        chunksize (int, optional): States sent to a worker at a time. Defaults to 16.
+        timeout (float, optional): Seconds to wait for a chunk once it is next in order.
+                                   States of a chunk that times out are reported as failed, and
+                                   the process pool is replaced so the stuck worker is not waited on.
+
+    Returns:
+        SolveStream: An iterable of SolveResult(index, state, solution, error) in input order,
+                     with live throughput statistics in its stats attribute.
+
+    Raises:
+        RuntimeError: If kociemba is not installed.
+    """
+    from rubik.cube import KOCIEMBA_AVAILABLE
+    if not KOCIEMBA_AVAILABLE:
+        raise RuntimeError("Kociemba library not installed. Cannot solve.")
+    return SolveStream(states, workers=workers, chunksize=chunksize, timeout=timeout)
@@ -1,4 +1,15 @@
+import functools
 import re
+import numpy as np
+from rubik.moves import MOVE_IDS, MOVES, MoveSeq, inverse_ids, notation_from_ids
+
+# Moves (face, wide, slice and rotation, with an optional w and ' or 2) and the bracket notation
+_TOKEN_PATTERN = re.compile(r"[RUFLDBMESrufldbxyzXYZ][wW]?['2]?|[\[\],:]")
+_synonyms = None
+_MOVE_IDS = dict(MOVE_IDS)
+_MOVE_NODES = tuple(("move", move_id, None) for move_id in range(len(MOVES)))
+_INVERSE_IDS = inverse_ids(np.arange(len(MOVES))).tolist()
+_SINGLE_MOVES = tuple([move_id] for move_id in range(len(MOVES)))
 
 
 class StringManipulate:
@@ -25,13 +36,11 @@ class StringManipulate:
             
         Returns:
             string: cleaned to canonical notation
+
+        Raises:
+            ValueError: For unbalanced brackets or unknown moves, see parse_tree.
         """
-        commentless = self.remove_comments(notation_string)
-        split = self.split_moves(commentless)
-        replaced = [self.synonyms[i] if i in self.synonyms else i for i in split]
-        parsed_comm = self.parse_comm(" ".join(replaced))
-        result = re.sub(r"\s+", ' ', parsed_comm).strip()
-        return result
+        return notation_from_ids(self.parse_ids(self.remove_comments(notation_string)))
     
     @staticmethod
     def remove_comments(notation_string):
@@ -130,50 +139,149 @@ class StringManipulate:
     def inverse(A):
         '''
         Inverts a sequence of turns:
-        R U R' becomes R U' R'
+        R U R' becomes R U' R', Rw' becomes Rw
+        A MoveSeq is inverted as a MoveSeq.
         '''
+        if isinstance(A, MoveSeq):
+            return A.inverse()
         x = A.split(" ")
         x = [p for p in x if p != ""]
-        reformatted = [chunk+"'" if len(chunk) == 1 else chunk if "2" in chunk else chunk[0] for chunk in x]
+        reformatted = [chunk[:-1] if chunk.endswith("'") else chunk if chunk.endswith("2") else chunk+"'" for chunk in x]
         reformatted = reformatted[::-1]
         return " ".join(reformatted)
 
+    @staticmethod
+    def tokenize(notation_string):
+        """
+        Splits notation into moves and the bracket symbols [ ] , : in a single pass.
+        Moves are normalized through notation_synonyms (Rw -> r, X -> x).
+
+        Examples:
+            "[Rw: U2]" → ["[", "r", ":", "U2", "]"]
+        """
+        global _synonyms
+        if _synonyms is None:
+            _synonyms = StringManipulate().synonyms
+        return [_synonyms.get(token, token) for token in _TOKEN_PATTERN.findall(notation_string)]
+
+    @staticmethod
+    def parse_tree(tokens):
+        """
+        Builds the syntax tree of tokenized notation without recursion.
+
+        Nodes are tuples (kind, a, b) stored in a list. The first len(MOVES) nodes are the
+        moves, ("move", move_id, None) at index move_id, followed by ("seq", child ids, None),
+        ("comm", a, b) for [a, b] and ("conj", a, b) for [a: b].
+        Identical subtrees are stored once, and children always come before their parents.
+
+        Returns:
+            tuple: (nodes, root) with the node list and the index of the root.
+
+        Raises:
+            ValueError: If the brackets are unbalanced, a bracket holds more than one , or :,
+                        or a move is not one of rubik.moves.MOVES.
+        """
+        nodes, index = list(_MOVE_NODES), {}
+
+        def node(key):
+            if key not in index:
+                index[key] = len(nodes)
+                nodes.append(key)
+            return index[key]
+
+        def group(items):
+            return items[0] if len(items) == 1 else node(("seq", tuple(items), None))
+
+        def close(frame):
+            items, left, operator = frame
+            if operator is None:
+                return group(items)
+            return node(("comm" if operator == "," else "conj", left, group(items)))
+
+        stack = [[[], None, None]] # Open brackets: [items, left side, operator]
+        for token in tokens:
+            if token in _MOVE_IDS:
+                stack[-1][0].append(_MOVE_IDS[token])
+            elif token == "[":
+                stack.append([[], None, None])
+            elif token == "]":
+                if len(stack) == 1:
+                    raise ValueError("Unbalanced ] in notation.")
+                child = close(stack.pop())
+                stack[-1][0].append(child)
+            elif token in (",", ":"):
+                frame = stack[-1]
+                if frame[2] is not None:
+                    raise ValueError("More than one , or : inside a bracket.")
+                frame[1] = group(frame[0])
+                frame[0], frame[2] = [], token
+            else:
+                raise ValueError(f"Invalid or undefined move: {token}")
+        if len(stack) != 1:
+            raise ValueError("Unbalanced [ in notation.")
+        return nodes, close(stack[0])
+
+    @staticmethod
+    def expand_tree(nodes, root):
+        """
+        Expands a syntax tree from parse_tree into move ids. Every node is expanded once,
+        in order, so repeated subexpressions are reused instead of re-expanded.
+
+        Returns:
+            np.ndarray: The move ids, dtype uint8.
+        """
+        expanded = list(_SINGLE_MOVES) # Expansions are never modified in place, so these are shared
+        for kind, a, b in nodes[len(_MOVE_NODES):]:
+            if kind == "seq":
+                expanded.append([move for child in a for move in expanded[child]])
+            else:
+                first, second = expanded[a], expanded[b]
+                moves = first + second + [_INVERSE_IDS[move] for move in reversed(first)]
+                if kind == "comm":
+                    moves += [_INVERSE_IDS[move] for move in reversed(second)]
+                expanded.append(moves)
+        return np.array(expanded[root], dtype=np.uint8)
+
+    @staticmethod
+    def parse_ids(notation_string):
+        """
+        Parses notation with commutators [A, B] = A B A' B', conjugates [A: B] = A B A'
+        and grouping brackets into move ids. Results are cached per string.
+
+        Args:
+            notation_string (str): Notation without comments.
+
+        Returns:
+            np.ndarray: Read-only array of move ids, dtype uint8.
+
+        Raises:
+            ValueError: See parse_tree.
+        """
+        return StringManipulate._parse_ids_cached(notation_string)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _parse_ids_cached(notation_string):
+        tokens = StringManipulate.tokenize(notation_string)
+        if all(token in _MOVE_IDS for token in tokens):
+            ids = np.array([_MOVE_IDS[token] for token in tokens], dtype=np.uint8)
+        else:
+            ids = StringManipulate.expand_tree(*StringManipulate.parse_tree(tokens))
+        ids.flags.writeable = False
+        return ids
+
     @staticmethod
     def parse_comm(s):
+        """
+        Expands commutators and conjugates into a move string.
+
+        Raises:
+            ValueError: For unbalanced brackets or unknown moves, see parse_tree.
+        """
         shortcut = set([",",":","[", "]"]).intersection(set(s))
         if len(shortcut) == 0:
             return(s)
-        start = 0
-        count = 0
-        out = []
-        for i in range(len(s)):
-            l = s[i]
-            if l == "[":
-                if count == 0:
-                    out.append(s[start:i])
-                    start = i+1
-                count += 1
-            elif l == "]":
-                count -= 1
-                if count == 0:
-                    out.append(s[start:i])
-                    start = i+1
-            elif (l == "," or l == ":") and count == 0:
-                a = " ".join([StringManipulate.parse_comm(x) for x in out]) + s[start: i]
-                b = s[i+1:len(s)]
-                a, b = StringManipulate.parse_comm(a), StringManipulate.parse_comm(b)
-                if l == ",":
-                    comm_out = a + b + " "+ StringManipulate.inverse(a) +" "+ StringManipulate.inverse(b)
-                if l == ":":
-                    comm_out = a + b + " " +StringManipulate.inverse(a)
-                return comm_out
-        if len(out) == 0:
-            return s
-        else:
-            if start < len(s):
-                out.append(s[start:len(s)])
-            out = [StringManipulate.parse_comm(x) for x in out]
-            return " ".join(out)
+        return notation_from_ids(StringManipulate.parse_ids(s))
 
 if __name__ == "__main__":
     # This runs tests on the commutator parser.
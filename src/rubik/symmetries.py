@@ -1,6 +1,7 @@
 # General Symmetries of the cube. 
 # This module helps find simple symmetries to incorporate as hard-coded rules.
 from rubik.string_tools import StringManipulate
+from rubik.tables import freeze
 
 class Symmetries:
     """Holds base rotational symmetries of the cube.
@@ -18,7 +19,7 @@ class Symmetries:
         'RF':"z'",
         'RD':"x z'",
         'RB':"z' y2",
-        'FU':"y z2",
+        'FU':"x y2",
         'FR':"x y",
         'FD':"x",
         'FL':"x y'",
@@ -45,7 +46,7 @@ class Symmetries:
                         'RF': {'L': 'U', 'U': 'R', 'F': 'F', 'R': 'D', 'D': 'L', 'B': 'B'}, 
                         'RD': {'B': 'U', 'U': 'R', 'L': 'F', 'F': 'D', 'D': 'L', 'R': 'B'}, 
                         'RB': {'R': 'U', 'U': 'R', 'B': 'F', 'L': 'D', 'D': 'L', 'F': 'B'}, 
-                        'FU': {'D': 'U', 'F': 'R', 'R': 'F', 'U': 'D', 'B': 'L', 'L': 'B'}, 
+                        'FU': {'F': 'U', 'L': 'R', 'U': 'F', 'B': 'D', 'R': 'L', 'D': 'B'}, 
                         'FR': {'R': 'U', 'F': 'R', 'U': 'F', 'L': 'D', 'B': 'L', 'D': 'B'}, 
                         'FD': {'B': 'U', 'R': 'R', 'U': 'F', 'F': 'D', 'L': 'L', 'D': 'B'}, 
                         'FL': {'L': 'U', 'B': 'R', 'U': 'F', 'R': 'D', 'F': 'L', 'D': 'B'}, 
@@ -64,11 +65,30 @@ class Symmetries:
     FACES = ['U', 'R', 'F', 'D', 'L', 'B'] # Standard cube faces
 
 
+    _shared_tables = None # Rotation tables shared by every instance, see shared_tables()
+
     def __init__(self):
-        """Initialize the Symmetries class and create rotation maps."""
-        self.__make_rotation_maps()
-        self.__make_orientations_map()
-        self.generate_rotational_symmetries()
+        """Initialize the Symmetries class and attach the shared rotation maps."""
+        self.__dict__.update(self.shared_tables())
+
+    @classmethod
+    def shared_tables(cls):
+        """
+        Returns the process-wide rotation tables, building them on first use.
+
+        Returns:
+            dict: The read-only _reorient, _orientations, rotation tables (rotation_names,
+                  rotation_ids, cayley, rotation_inverse, rotation_classes), equivalence_map and
+                  equivalence_classes tables, keyed by attribute name.
+        """
+        if Symmetries._shared_tables is None:
+            builder = object.__new__(Symmetries)
+            builder.__make_rotation_maps()
+            builder.__make_orientations_map()
+            builder.__make_cayley_table()
+            builder.generate_rotational_symmetries()
+            Symmetries._shared_tables = {name: freeze(table) for name, table in vars(builder).items()}
+        return Symmetries._shared_tables
 
     def __make_rotation_maps(self):
         """Helper to convert rotations to operations on faces. Later used for string manipulations"""
@@ -106,6 +126,60 @@ class Symmetries:
             else:
                 self._orientations[key] = self.__get_rotation_map(value)
 
+    def __make_cayley_table(self):
+        """
+        Numbers the 24 orientations and tabulates the rotation group, so rotation strings can be
+        composed, inverted and reduced with lookups instead of walking _reorient.
+        Orientation id i is reached by the rotation string rotation_names[i], in the order of ORIENTATIONS.
+            rotation_ids:     orientation (as in notation_to_orientation) or single rotation -> id
+            rotation_token_ids: single rotation ("I", x, x', x2, ...) -> id, the tokens of a rotation string
+            cayley:           cayley[a][b] is the id of doing rotation a, then rotation b
+            rotation_inverse: rotation_inverse[a] undoes rotation a
+        """
+        self.rotation_names = list(self.ORIENTATIONS.values())
+        orientations = ["".join(self.__get_orientation(rotation or "I")) for rotation in self.rotation_names]
+        ids = {orientation: i for i, orientation in enumerate(orientations)}
+        self.cayley = [[ids["".join(self.__get_orientation(f"{a or 'I'} {b or 'I'}"))] for b in self.rotation_names]
+                       for a in self.rotation_names]
+        identity = ids["".join(self.FACES)]
+        self.rotation_inverse = [row.index(identity) for row in self.cayley]
+        self.rotation_ids = {orientation[0] + orientation[2]: i for orientation, i in ids.items()}
+        for rotation in ["I", ""] + self.SINGLE_ROTATIONS:
+            self.rotation_ids[rotation] = ids["".join(self.__get_orientation(rotation or "I"))]
+        self.rotation_token_ids = {rotation: self.rotation_ids[rotation] for rotation in ["I"] + self.SINGLE_ROTATIONS}
+
+    def rotation_id(self, rotation_string):
+        """
+        Returns the orientation id reached by a rotation string.
+
+        Args:
+            rotation_string (str): Space-separated rotations, e.g. "x y2 z'". Empty or "I" is the identity.
+
+        Raises:
+            ValueError: If the string contains something other than x, y, z rotations.
+        """
+        orientation = self.rotation_ids["I"]
+        for rotation in rotation_string.split():
+            if rotation not in self.rotation_token_ids:
+                raise ValueError(f"Invalid rotation: {rotation}")
+            orientation = self.cayley[orientation][self.rotation_token_ids[rotation]]
+        return orientation
+
+    def reduce_rotation(self, rotation_string):
+        """Returns the shortest rotation string (from ORIENTATIONS) with the same effect, e.g. "x y x'" -> "z"."""
+        return self.rotation_names[self.rotation_id(rotation_string)]
+
+    def compose_rotations(self, *rotation_strings):
+        """Returns the reduced rotation string of doing each rotation string in turn."""
+        orientation = self.rotation_ids["I"]
+        for rotation_string in rotation_strings:
+            orientation = self.cayley[orientation][self.rotation_id(rotation_string)]
+        return self.rotation_names[orientation]
+
+    def invert_rotation(self, rotation_string):
+        """Returns the reduced rotation string that undoes rotation_string."""
+        return self.rotation_names[self.rotation_inverse[self.rotation_id(rotation_string)]]
+
     @staticmethod        
     def get_rotation_effects(faces, rotation):
         """Applies a rotation map to faces of cube. Utilized to determine where U, R, F, D, L, B go.
@@ -115,8 +189,8 @@ class Symmetries:
         return [rotation[face] for face in faces]
     
     def notation_to_orientation(self, rotation_string):
-        new_faces = self.__get_orientation(rotation_string)
         # shows the new UF faces, hence the result of a rotation from standard issue.
+        new_faces = self.__get_orientation(self.rotation_names[self.rotation_id(rotation_string)] or "I")
         return new_faces[0]+new_faces[2]
     
     def generate_rotational_symmetries(self):
@@ -125,26 +199,26 @@ class Symmetries:
 
         This reduction is made easier by converting rotations into their resulting orientations.
         There are 90 length 2 rotations, but only 24 orientations of the cube. 
+        Each rotation string is reduced through the Cayley table, rotation_classes[i] lists the
+        one and two rotation strings reaching orientation id i.
         """
-        #first, find one move cases
-        self.equivalence_map = {x: self.notation_to_orientation(x) for x in self.SINGLE_ROTATIONS}
-        # Next we produce all length 2 symmetries
-        all_rotations = [f"{x} {y}" for x in self.SINGLE_ROTATIONS for y in self.SINGLE_ROTATIONS]
-        for x in all_rotations:
-            self.equivalence_map[x] = self.notation_to_orientation(x)
-        self.equivalence_classes = {}
-        for key, value in self.equivalence_map.items():
-            if value not in self.equivalence_classes:
-                self.equivalence_classes[value] = [key]
-            else:
-                self.equivalence_classes[value].append(key)
-        for key in self.ORIENTATIONS.keys():
-            if key not in self.equivalence_classes:
-                print(f"FUCK: {key}")
+        names = ["".join(self.__get_orientation(rotation or "I")) for rotation in self.rotation_names]
+        names = [name[0] + name[2] for name in names]
+        single = self.SINGLE_ROTATIONS
+        #first, find one move cases, then all length 2 symmetries
+        reached = {x: self.rotation_ids[x] for x in single}
+        for x in single:
+            for y in single:
+                reached[f"{x} {y}"] = self.cayley[self.rotation_ids[x]][self.rotation_ids[y]]
+        self.equivalence_map = {key: names[value] for key, value in reached.items()}
+        self.rotation_classes = [[] for _ in names]
+        for key, value in reached.items():
+            self.rotation_classes[value].append(key)
+        self.equivalence_classes = {names[i]: rotations for i, rotations in enumerate(self.rotation_classes)
+                                    if rotations}
         
     def get_equivalent_rotations(self, rotation_string):
-        orientation = self.notation_to_orientation(rotation_string)
-        return self.equivalence_classes[orientation]
+        return list(self.rotation_classes[self.rotation_id(rotation_string)])
 
     def __get_rotation_map(self, rotation_string):
         final_orientation = self.__get_orientation(rotation_string)
@@ -176,6 +250,14 @@ class Symmetries:
         rotated_state = "".join(perm_map[x] for x in s)
         return rotated_state
     
+    def get_move_relabeling(self, rotation_string):
+        """
+        Maps each face to the face that is turned by the same move once the cube has been rotated.
+        "x U" is the same as "F x", so for "x" U maps to F: a move sequence m applied after a
+        rotation r equals the relabeled sequence applied before r.
+        """
+        return self.__get_rotation_map(rotation_string or "I")
+
     def rotate_state(self, rotation_str, state):
         orientation = self.notation_to_orientation(rotation_str)
         perm_map = self._orientations[orientation]
@@ -0,0 +1,226 @@
+# Array tables for the 24 whole-cube rotations and the 48 symmetries including mirrors.
+# Every orientation in Symmetries.ORIENTATIONS is stored once as a 54-entry gather and once as a
+# 6-entry color relabeling, so canonicalization and equivalence checks are array gathers over batches.
+import numpy as np
+from rubik.batch import compile_sequence, encode_states
+from rubik.cubie import CENTER_FACELETS
+from rubik.symmetries import Symmetries
+
+ORIENTATION_NAMES = list(Symmetries.ORIENTATIONS)
+# Row i applies the rotation of orientation ORIENTATION_NAMES[i]: rotated = state[ROTATION_GATHERS[i]]
+ROTATION_GATHERS = np.stack([compile_sequence(rotation) for rotation in Symmetries.ORIENTATIONS.values()])
+
+
+def _recolor_tables():
+    """
+    Row i maps every color code to its color in the canonical recoloring of a state whose
+    orientation (see Symmetries.get_canonical_orientation) is ORIENTATION_NAMES[i].
+    Also returns the lookup from (position of the U center) * 6 + (position of the F center)
+    to that row, -1 where the two centers cannot belong to one orientation.
+    """
+    orientations = Symmetries.shared_tables()["_orientations"]
+    recolor = np.array([[Symmetries.FACES.index(orientations[name][face]) for face in Symmetries.FACES]
+                        for name in ORIENTATION_NAMES], dtype=np.uint8)
+    lookup = np.full(36, -1, dtype=np.int8)
+    for row, name in enumerate(ORIENTATION_NAMES):
+        lookup[Symmetries.FACES.index(name[0]) * 6 + Symmetries.FACES.index(name[1])] = row
+    return recolor, lookup
+
+
+def _mirror_gather():
+    """
+    Gather of the reflection through the plane between the R and L faces: every facelet
+    moves to the mirrored column (r, c) -> (r, 2 - c) and the R and L faces trade places.
+    """
+    swap = {1: 4, 4: 1}
+    gather = np.empty(54, dtype=np.intp)
+    for face in range(6):
+        for row in range(3):
+            for column in range(3):
+                gather[face * 9 + row * 3 + column] = swap.get(face, face) * 9 + row * 3 + 2 - column
+    return gather
+
+
+RECOLOR_TABLES, ORIENTATION_LOOKUP = _recolor_tables()
+MIRROR_GATHER = _mirror_gather()
+# The mirror image of a cube has its R and L colors swapped, recoloring them keeps the centers a rotation
+MIRROR_COLORS = np.array([0, 4, 2, 3, 1, 5], dtype=np.uint8)
+# Rows 0-23 are the rotations, rows 24-47 the mirror followed by each rotation
+SYMMETRY_GATHERS = np.concatenate([ROTATION_GATHERS, MIRROR_GATHER[ROTATION_GATHERS]])
+SYMMETRY_COUNT = len(SYMMETRY_GATHERS)
+_U, _F = 0, 2
+_CHUNK_ROWS = 1 << 11
+_DIGIT_WEIGHTS = 6.0 ** np.arange(17, -1, -1)
+
+
+def orientation_indices(states):
+    """
+    Finds the orientation of each state from where its U and F colored centers are.
+
+    Args:
+        states: Cube strings or an (N, 54) array of color codes.
+
+    Returns:
+        np.ndarray: Array of shape (N,) with indices into ORIENTATION_NAMES.
+
+    Raises:
+        ValueError: If the centers of a state do not form an orientation.
+    """
+    centers = encode_states(states)[:, CENTER_FACELETS]
+    has_u, has_f = (centers == _U).any(axis=1), (centers == _F).any(axis=1)
+    key = np.argmax(centers == _U, axis=1) * 6 + np.argmax(centers == _F, axis=1)
+    indices = ORIENTATION_LOOKUP[key]
+    if not (has_u & has_f & (indices >= 0)).all():
+        raise ValueError("The centers of a state do not form one of the 24 orientations.")
+    return indices
+
+
+def canonical_recolor(states):
+    """
+    Batch version of Symmetries.get_canon_rotated_state: recolors every state so that its
+    centers show the standard colors, keeping the structure of the pieces.
+
+    Args:
+        states: Cube strings or an (N, 54) array of color codes.
+
+    Returns:
+        np.ndarray: Array of shape (N, 54) with color codes.
+    """
+    codes = encode_states(states)
+    return np.take_along_axis(RECOLOR_TABLES[orientation_indices(codes)], codes.astype(np.intp), axis=1)
+
+
+def all_rotations(states):
+    """
+    Applies each of the 24 rotations to every state.
+
+    Returns:
+        np.ndarray: Array of shape (N, 24, 54), rotation i in column i.
+    """
+    return encode_states(states)[:, ROTATION_GATHERS]
+
+
+def row_minimum(candidates):
+    """
+    Picks the lexicographically smallest of K candidate states per row.
+
+    Args:
+        candidates (np.ndarray): Array of shape (N, K, 54) with color codes.
+
+    Returns:
+        np.ndarray: Array of shape (N,) with the index of the smallest candidate of each row.
+    """
+    n, k = candidates.shape[:2]
+    # 18 base-6 digits stay below 2**53, so three exact float words order the states like their strings
+    words = candidates.reshape(n, k, 3, 18).astype(np.float64) @ _DIGIT_WEIGHTS
+    remaining = np.ones((n, k), dtype=bool)
+    for column in range(3):
+        word = np.where(remaining, words[:, :, column], np.inf)
+        remaining &= word == word.min(axis=1, keepdims=True)
+    return np.argmax(remaining, axis=1)
+
+
+def _smallest_image(states, gathers, recolor):
+    """
+    Returns the smallest canonically recolored image of every state under the given gathers,
+    with its index. recolor[o, g] maps the colors of a state in orientation o to the canonical
+    colors of its image under gathers[g].
+    """
+    codes = encode_states(states)
+    representatives = np.empty_like(codes)
+    indices = np.empty(len(codes), dtype=np.intp)
+    for start in range(0, len(codes), _CHUNK_ROWS):
+        chunk = codes[start:start + _CHUNK_ROWS]
+        tables = recolor[orientation_indices(chunk)]
+        images = np.take_along_axis(tables, chunk[:, gathers].astype(np.intp), axis=2)
+        best = row_minimum(images)
+        representatives[start:start + _CHUNK_ROWS] = images[np.arange(len(chunk)), best]
+        indices[start:start + _CHUNK_ROWS] = best
+    return representatives, indices
+
+
+def rotation_canonical(states):
+    """
+    Returns the representative of every state's rotation class: the smallest canonical
+    recoloring over the 24 rotations of the state. Two states are equivalent in the
+    sense of RubiksCube.is_equivalent exactly when their representatives are equal.
+
+    Args:
+        states: Cube strings or an (N, 54) array of color codes.
+
+    Returns:
+        tuple: (representatives, rotations) with the (N, 54) representatives and the (N,)
+               index into ORIENTATION_NAMES of the rotation that produces them.
+    """
+    return _smallest_image(states, ROTATION_GATHERS, SYMMETRY_RECOLOR[:, :len(ROTATION_GATHERS)])
+
+
+def all_symmetries(states):
+    """
+    Applies each of the 48 symmetries to every state, with the mirror images recolored
+    so that their centers still form an orientation.
+
+    Returns:
+        np.ndarray: Array of shape (N, 48, 54), symmetry i (see SYMMETRY_GATHERS) in column i.
+    """
+    images = encode_states(states)[:, SYMMETRY_GATHERS]
+    images[:, len(ROTATION_GATHERS):] = MIRROR_COLORS[images[:, len(ROTATION_GATHERS):]]
+    return images
+
+
+def canonical_key(states, return_symmetry=False):
+    """
+    Returns the symmetry-reduced representative of every state: the smallest canonical
+    recoloring over all 48 rotations and reflections. States that are rotations, mirror
+    images or recolorings of each other share one key, so tables keyed on it shrink by up
+    to 48x. Use encoding.pack or encoding.state_hash on the result for compact keys.
+
+    Args:
+        states: Cube strings or an (N, 54) array of color codes.
+        return_symmetry (bool, optional): Also return the index into SYMMETRY_GATHERS of the
+                                          symmetry that produces each key.
+
+    Returns:
+        np.ndarray: Array of shape (N, 54) with color codes, or a (keys, symmetries) tuple.
+    """
+    keys, symmetries = _smallest_image(states, SYMMETRY_GATHERS, SYMMETRY_RECOLOR)
+    return (keys, symmetries) if return_symmetry else keys
+
+
+def _symmetry_recolor():
+    """
+    Builds the (24, 48, 6) table used by _smallest_image: entry [o, g] maps each color of a
+    state in orientation o to its canonical color in the image of the state under symmetry g.
+    The image's centers only depend on the orientation, so a rotated solved cube stands in for all states.
+    """
+    solved = np.arange(54, dtype=np.uint8) // 9
+    table = np.empty((len(ROTATION_GATHERS), SYMMETRY_COUNT, 6), dtype=np.uint8)
+    for gather in ROTATION_GATHERS:
+        state = solved[gather][None]
+        images = all_symmetries(state)[0]
+        colors = np.tile(np.arange(6, dtype=np.uint8), (SYMMETRY_COUNT, 1))
+        colors[len(ROTATION_GATHERS):] = MIRROR_COLORS
+        recolor = RECOLOR_TABLES[orientation_indices(images)]
+        table[orientation_indices(state)[0]] = np.take_along_axis(recolor, colors.astype(np.intp), axis=1)
+    return table
+
+
+SYMMETRY_RECOLOR = _symmetry_recolor()
+
+
+def equivalent(states, others):
+    """
+    Batch version of RubiksCube.is_equivalent.
+
+    Args:
+        states: Cube strings or an (N, 54) array of color codes.
+        others: The states to compare against, one per state (or a single one for all).
+
+    Returns:
+        np.ndarray: Boolean array of shape (N,).
+    """
+    targets = canonical_recolor(states)
+    rotated = all_rotations(others)
+    n = len(rotated)
+    recolored = canonical_recolor(rotated.reshape(n * 24, 54)).reshape(n, 24, 54)
+    return (recolored == targets[:, None, :]).all(axis=2).any(axis=1)
@@ -0,0 +1,69 @@
+# Process-wide lookup tables for the cube simulator.
+# The move and rotation tables are built once, frozen, and shared by every RubiksCube/Symmetries instance.
+# They can also be written to a file once and loaded by worker processes instead of rebuilt.
+import json
+from types import MappingProxyType
+
+
+def freeze(table):
+    """
+    Recursively converts dicts into read-only mappings and lists into tuples.
+
+    Args:
+        table: A dict, list, or scalar.
+
+    Returns:
+        The same structure, made immutable.
+    """
+    if isinstance(table, dict):
+        return MappingProxyType({key: freeze(value) for key, value in table.items()})
+    if isinstance(table, (list, tuple)):
+        return tuple(freeze(value) for value in table)
+    return table
+
+
+def _thaw(table):
+    """Converts frozen tables back into plain dicts/lists so they can be written as JSON."""
+    if isinstance(table, MappingProxyType):
+        return {key: _thaw(value) for key, value in table.items()}
+    if isinstance(table, tuple):
+        return [_thaw(value) for value in table]
+    return table
+
+
+def save_tables(path):
+    """
+    Writes the move and rotation tables to a JSON file.
+
+    Args:
+        path (str): Destination file.
+    """
+    from rubik.cube import RubiksCube
+    from rubik.symmetries import Symmetries
+
+    permutations = {move: [perm_map[i] for i in range(54)]
+                    for move, perm_map in RubiksCube.shared_permutations().items()}
+    tables = {
+        "permutations": permutations,
+        "symmetries": _thaw(MappingProxyType(Symmetries.shared_tables())),
+    }
+    with open(path, "w") as file:
+        json.dump(tables, file)
+
+
+def load_tables(path):
+    """
+    Installs the move and rotation tables from a file written by save_tables,
+    so no RubiksCube or Symmetries instance has to build them.
+
+    Args:
+        path (str): File written by save_tables.
+    """
+    from rubik.cube import RubiksCube
+    from rubik.symmetries import Symmetries
+
+    with open(path) as file:
+        tables = json.load(file)
+    permutations = {move: dict(enumerate(targets)) for move, targets in tables["permutations"].items()}
+    RubiksCube._shared_permutations = freeze(permutations)
+    Symmetries._shared_tables = {name: freeze(table) for name, table in tables["symmetries"].items()}
@@ -1,14 +1,16 @@
 from rubik.symmetries import Symmetries
+from rubik.utils.validation import CENTER_ARRANGEMENTS
+
+# Centers (U, R, F, D, L, B) of the solved cube in each of the 24 orientations
+VALID_CENTERS = frozenset("".join(Symmetries.FACES[code] for code in row) for row in CENTER_ARRANGEMENTS.tolist())
 
 class CenterValidate:
     def _get_centers(self, s):
         return s[4:54:9]
     
     def validate_centers(self, s):
-        right_orientation = Symmetries.get_canonical_orientation(s)
-        centers = self._get_centers(right_orientation)
-        # Check if the centers are in the correct orientation
-        return centers == "URFDLB"
+        # Rotating the cube into its canonical orientation gives URFDLB centers exactly for these
+        return self._get_centers(s) in VALID_CENTERS
     
     @staticmethod
     def center_loss(s1, s2):
@@ -1,20 +1,82 @@
+from rubik.cubie import CORNER_COLORS, CORNER_FACELETS, CORNER_LOOKUP, CORNERS
+from rubik.utils.validation import ValidateState
+
+# Facelet indices of every corner position, listed clockwise starting from the U/D facelet.
+# This allows for easy orientation and permutation checks (taken from rubik.cubie.CORNER_FACELETS).
+CORNER_INDEX = {name: tuple(facelets) for name, facelets in zip(CORNERS, CORNER_FACELETS.tolist())}
+_U, _D = 0, 3
+
+
+def _corner_tables():
+    """
+    Builds the lookups from a color triple, written as c0*36 + c1*6 + c2 with every color as
+    the index of the face whose center shows it, to:
+        the corner whose colors these are (index into CORNER_INDEX), -1 if there is none
+        the orientation: position of the U (else D) color, -1 if it shows up twice or not at all
+    Real corners are read from rubik.cubie.CORNER_LOOKUP.
+    """
+    color_sets = [sorted(colors) for colors in CORNER_COLORS.tolist()]
+    pieces, twists = [], []
+    for key, entry in enumerate(CORNER_LOOKUP.tolist()):
+        if entry >= 0:
+            piece, twist = divmod(entry, 3)
+        else:
+            # Legacy behavior kept on purpose: CornerValidate identifies a corner by its set of colors,
+            # so a mirrored corner (the right colors in counterclockwise order) still counts as that
+            # corner, and any triple gets the twist of its U/D color. Use CORNER_LOOKUP to reject them.
+            colors = [key // 36, key // 6 % 6, key % 6]
+            piece = color_sets.index(sorted(colors)) if sorted(colors) in color_sets else -1
+            face = _U if _U in colors else _D
+            twist = colors.index(face) if colors.count(face) == 1 else -1
+        pieces.append(piece)
+        twists.append(twist)
+    return tuple(pieces), tuple(twists)
+
+
+CORNER_PIECES, CORNER_TWISTS = _corner_tables()
+
+
+def color_keys(pieces, state_string):
+    """
+    Encodes every piece as its key into the lookup tables, relative to the centers of the state.
+
+    Args:
+        pieces (dict): Location to piece colors, as returned by CornerValidate.get or EdgeValidate.get.
+        state_string (str): The cube string the pieces come from.
+
+    Returns:
+        dict: Location to key, None for pieces with a color no center shows. If two centers
+              show the same color, it counts as the color of the first of them (in URFDLB order).
+    """
+    center_map = {letter: i for i, letter in reversed(list(enumerate(state_string[4:54:9])))}
+    keys = {}
+    for location, piece in pieces.items():
+        key = 0
+        for letter in piece:
+            if letter not in center_map:
+                key = None
+                break
+            key = key * 6 + center_map[letter]
+        keys[location] = key
+    return keys
+
+
 class CornerValidate:
     """
     This class is used to validate the corner pieces of the cube string:
 
-    The weirdness of the code is due to checking relitive to arbitrary coloring schemes
+    Colors are read relative to the centers, so any coloring scheme works. Pieces are identified
+    with the CORNER_PIECES and CORNER_TWISTS tables.
     """
     FACES = "URFDLB"
-    CORNERS = ['URF', 'UFL', 'ULB', 'UBR', 'DFR', 'DLF', 'DBL', 'DRB']
+    CORNERS = list(CORNER_INDEX)
     @staticmethod
     def get_valid(state_string):
         """This method extracts the valid corner pieces from the cube string. 
         Compares this to the corners in the string"""
         centers = state_string[4:54:9]
-        center_map = {letter: i for i, letter in enumerate(CornerValidate.FACES)}
-        center_index = {x: [center_map[letter] for letter in x] for x in CornerValidate.CORNERS}
         # Get the possible corners from the centers of the cube string
-        corners = [[centers[i] for i in center_index[x]] for x in CornerValidate.CORNERS]
+        corners = [[centers[i // 9] for i in index_list] for index_list in CORNER_INDEX.values()]
         return corners
 
 
@@ -24,51 +86,18 @@ class CornerValidate:
         This method extracts the corner pieces from the cube string.
         It returns a dictionary of location and the corner piece.
         """
-        u = "U"
-        r = "R"
-        f = "F"
-        d = "D"
-        l = "L"
-        b = "B"
-        # Multiplier for each face
-        multiplier = {letter: i for i, letter in enumerate(CornerValidate.FACES)}
-        # Solver for the location + face to a single number (exact location in string)
-        def s(location, face):
-            return location + multiplier[face]*9
-        # Requires the corners to be listed in clockwise order. This allows for easy orientation check and permutation checks.
-        corner_index = {
-            'URF': [s(8, u), s(0, r), s(2, f)],
-            'UFL': [s(6, u), s(0, f), s(2, l)],
-            'ULB': [s(0, u), s(0, l), s(2, b)],
-            'UBR': [s(2, u), s(0, b), s(2, r)],
-            'DFR': [s(2, d), s(8, f), s(6, r)],
-            'DLF': [s(0, d), s(8, l), s(6, f)],
-            'DBL': [s(6, d), s(8, b), s(6, l)],
-            'DRB': [s(8, d), s(8, r), s(6, b)],
-        }
-        # Get the actual corners from the cube string
-        corners = {x: "".join([state_string[i] for i in index_list]) for x, index_list in corner_index.items()}
-        return corners
+        return {x: state_string[a] + state_string[b] + state_string[c] for x, (a, b, c) in CORNER_INDEX.items()}
 
     @staticmethod
     def orientation(corners, state_string):
         """
         This method checks the orientation of the corners.
-        It returns a dictionary of location and it's orientation
+        It returns a dictionary of location and it's orientation (None for invalid corners)
         """
-        centers = state_string[4:54:9]
-        top, bottom = centers[0], centers[3]
-        corners = corners.copy()
-        #Could do this as a dictionary comprehension, but invalid corners will fail. 
         orientations = {}
-        for location, corner in corners.items():
-            if top in corner:
-                orientations[location] = None if corner.count(top) > 1 else corner.index(top)
-            elif bottom in corner:
-                orientations[location] = None if corner.count(bottom) > 1 else corner.index(bottom)
-            else:
-                print(f"Invalid corner {corner} at location {location}")
-                orientations[location] = None
+        for location, key in color_keys(corners, state_string).items():
+            twist = -1 if key is None else CORNER_TWISTS[key]
+            orientations[location] = None if twist < 0 else twist
         return orientations
     
     @staticmethod
@@ -136,39 +165,12 @@ class CornerValidate:
         Returns:
             Dictionary describing corner permutation cycles
         """
-        # Get the valid corner colors for each position
-        valid_corners = CornerValidate.get_valid(state_string)
-        
-        # Map position names to their respective valid corner colors
-        position_to_valid_colors = {
-            CornerValidate.CORNERS[i]: ''.join(sorted(valid_corners[i])) 
-            for i in range(len(CornerValidate.CORNERS))
-        }
-        
-        # Orient the corners to normalize comparisons
-        oriented_corners = CornerValidate.orient(corners, state_string)
-        
-        # Map each oriented corner's sorted colors to its position
-        oriented_colors_to_position = {}
-        for position, corner in oriented_corners.items():
-            sorted_colors = ''.join(sorted(corner))
-            oriented_colors_to_position[sorted_colors] = position
-        
         # Build the permutation map: current position → should be position
         permutation = {}
-        
-        # For each corner position
-        for position, corner in oriented_corners.items():
-            # Sort colors for comparison
-            sorted_colors = ''.join(sorted(corner))
-            
-            # Try to find where this corner should be
-            for valid_pos, valid_colors in position_to_valid_colors.items():
-                if sorted_colors == valid_colors:
-                    # This corner should be at valid_pos
-                    permutation[position] = valid_pos
-                    break
-        
+        for position, key in color_keys(corners, state_string).items():
+            piece = -1 if key is None else CORNER_PIECES[key]
+            if piece >= 0:
+                permutation[position] = CornerValidate.CORNERS[piece]
         return permutation
 
     @staticmethod
@@ -207,8 +209,9 @@ class CornerValidate:
                     
                 current = corner_permutation[current]
                 
-                # Check if we've completed the cycle or reached a corner not in the mapping
-                if current == start or current not in corner_permutation:
+                # Check if we've completed the cycle, reached a corner not in the mapping,
+                # or run into a chain already counted (a corner that shows up twice)
+                if current == start or current not in corner_permutation or current in visited:
                     break
             
             # Each cycle of length k contributes (k-1) to the parity count
@@ -220,33 +223,27 @@ class CornerValidate:
     
     def get_total_orientation(self, corners, state_string):
         """
-        This method checks the orientation of the corners.
-        It returns a dictionary of location and it's orientation
+        This method sums the orientation of the corners.
+        It returns the total mod 3, or None if a corner has no orientation
         """
         orientations = self.orientation(corners, state_string)
-        sum = 0
-        for orientation in orientations.values():
-            if orientation is None:
-                return 10
-            else:
-                sum += orientation
-        return sum % 3
+        if None in orientations.values():
+            return None
+        return sum(orientations.values()) % 3
     
     def get_cubie_parity():
         pass
 
 class CornerSingleLoss:
     def corner_orientation_loss(self, string):
-        corners = CornerValidate.get(string)
-        orientations = CornerValidate.orientation(corners, string)
+        return ValidateState.analyze(string).corner_orientation
 
 
 class CornerPairLoss:
     def corner_loss(self, s1, s2):
-        c1 = CornerValidate.get_corners(s1)
-        c2 = CornerValidate.get_corners(s2)
-        o1 = CornerValidate.corner_orientation(c1, s1)
-        o2 = CornerValidate.corner_orientation(c2, s2)
+        """Number of corner positions twisted differently in the two states."""
+        o1 = CornerValidate.orientation(CornerValidate.get(s1), s1)
+        o2 = CornerValidate.orientation(CornerValidate.get(s2), s2)
         sum = 0
         for location, orientation in o1.items():
             if o2[location] != orientation:
@@ -254,23 +251,10 @@ class CornerPairLoss:
         return sum 
     
     def corner_orientation_single_loss(self, s1):
-        pass
-
-
-        
-            
-
+        return ValidateState.analyze(s1).corner_orientation
 
     def corner_permutation(self, s):
-        pass
-
-class ValidateState:
-    """
-    This class is used to validate the state of the cube string:
-    """
-
-    def corner_orientation(self, s):
-        pass
+        return ValidateState.analyze(s).corner_permutation
 
 def print_assist():
     pass 
@@ -1,70 +1,59 @@
+from rubik.cubie import EDGE_FACELETS, EDGE_LOOKUP, EDGES
+from rubik.utils.corner import color_keys
+
+# Facelet indices of every edge position, starting from the U/D facelet (F/B facelet for the
+# middle layer edges). Taken from rubik.cubie.EDGE_FACELETS, in this module's position order.
+EDGE_INDEX = {name: tuple(EDGE_FACELETS[EDGES.index(name)].tolist())
+              for name in ['UR', 'UF', 'UL', 'UB', 'FR', 'FL', 'BR', 'BL', 'DR', 'DF', 'DL', 'DB']}
+
+
+def _edge_tables():
+    """
+    Builds the lookups from a color pair, written as c0*6 + c1 with every color as the index
+    of the face whose center shows it, to:
+        the edge whose colors these are (index into EdgeValidate.EDGES), -1 if there is none
+        the orientation: position of the U/D (else F/B) color, -1 if it is undefined
+    Both are rubik.cubie.EDGE_LOOKUP, re-indexed by EdgeValidate.EDGES. Unlike corners, no
+    legacy case differs: a pair of colors is either a real edge in one of its two flips or no edge.
+    """
+    pieces = [EdgeValidate.EDGES.index(EDGES[entry // 2]) if entry >= 0 else -1 for entry in EDGE_LOOKUP.tolist()]
+    flips = [entry % 2 if entry >= 0 else -1 for entry in EDGE_LOOKUP.tolist()]
+    return tuple(pieces), tuple(flips)
+
+
 class EdgeValidate:
     """This class is used to validate the edges of a cube string:
+
+    Colors are read relative to the centers, so any coloring scheme works. Pieces are identified
+    with the EDGE_PIECES and EDGE_FLIPS tables.
     """
-    FACES = "UFRDLB" # Standard cube faces
+    FACES = "URFDLB" # Standard cube faces
     EDGES = ["UR", "UF", "UL", "UB", "FR", "FL", "DR", "DF", "DL", "DB", "BR", "BL"]
     @staticmethod
     def get_valid(state_string):
         centers = state_string[4:54:9]
-        center_map = {letter: i for i, letter in enumerate(EdgeValidate.FACES)}
-        center_index = {x: [center_map[letter] for letter in x] for x in EdgeValidate.EDGES}
         # Get the possible edges from the centers of the cube string
-        edges = [[centers[i] for i in center_index[x]] for x in EdgeValidate.EDGES]
+        edges = [[centers[i // 9] for i in EDGE_INDEX[x]] for x in EdgeValidate.EDGES]
         return edges
     
     @staticmethod
     def get(state_string):
         """
-        This method extracts the corner pieces from the cube string.
-        It returns a dictionary of location and the corner piece.
+        This method extracts the edge pieces from the cube string.
+        It returns a dictionary of location and the edge piece.
         """
-        u = "U"
-        r = "R"
-        f = "F"
-        d = "D"
-        l = "L"
-        b = "B"
-        # Multiplier for each face
-        multiplier = {letter: i for i, letter in enumerate(EdgeValidate.FACES)}
-        # Solver for the location + face to a single number (exact location in string)
-        def s(location, face):
-            return location + multiplier[face]*9
-        # Requires the edges to be listed in clockwise order. This allows for easy orientation check and permutation checks.
-        edge_index = {
-            'UR': [s(5, u), s(1, r)],
-            'UF': [s(7, u), s(1, f)],
-            'UL': [s(3, u), s(1, l)],
-            'UB': [s(1, u), s(1, b)],
-            "FR": [s(5, f), s(3, r)],
-            "FL": [s(3, f), s(5, l)],
-            "BR": [s(3, b), s(5, r)],
-            "BL": [s(5, b), s(3, l)],
-            "DR": [s(5, d), s(7, r)],
-            "DF": [s(1, d), s(7, f)],
-            "DL": [s(3, d), s(7, l)],
-            "DB": [s(7, d), s(7, b)],
-        }
-        # Get the actual edges from the cube string
-        edges = {x: "".join([state_string[i] for i in index_list]) for x, index_list in edge_index.items()}
-        return edges
+        return {x: state_string[a] + state_string[b] for x, (a, b) in EDGE_INDEX.items()}
     
     @staticmethod
     def orientation(edges, state_string):
-        centers = state_string[4:54:9]
-        top, bottom, front, back = centers[0], centers[3], centers[2], centers[5]
-        edges = edges.copy()
+        """
+        This method checks the orientation of the edges.
+        It returns a dictionary of location and it's orientation (None for invalid edges)
+        """
         orientations = {}
-        for location, edge in edges.items():
-            if top in edge:
-                orientations[location] = None if edge.count(top) > 1 or bottom in edge else edge.index(top)
-            elif bottom in edge:
-                orientations[location] = None if edge.count(bottom) > 1 or top in edge else edge.index(bottom)
-            elif front in edge:
-                orientations[location] = None if edge.count(front) > 1 or back in edge else edge.index(front)
-            elif back in edge:
-                orientations[location] = None if edge.count(back) > 1 or front in edge else edge.index(back)
-            else:
-                orientations[location] = None
+        for location, key in color_keys(edges, state_string).items():
+            flip = -1 if key is None else EDGE_FLIPS[key]
+            orientations[location] = None if flip < 0 else flip
         return orientations
     
     @staticmethod
@@ -86,49 +75,22 @@ class EdgeValidate:
     @staticmethod
     def permutation(edges, state_string):
         """
-        Calculate the corner permutation by mapping where each corner currently is
+        Calculate the edge permutation by mapping where each edge currently is
         to where it should be in a solved cube.
         
         Args:
-            corners: Dictionary mapping position names to corner cubies at those positions
+            edges: Dictionary mapping position names to edge cubies at those positions
             state_string: Full cube state string
             
         Returns:
-            Dictionary describing corner permutation cycles
+            Dictionary describing edge permutation cycles
         """
-        # Get the valid corner colors for each position
-        valid_edges = EdgeValidate.get_valid(state_string)
-        
-        # Map position names to their respective valid corner colors
-        position_to_valid_colors = {
-            EdgeValidate.EDGES[i]: ''.join(sorted(valid_edges[i])) 
-            for i in range(len(EdgeValidate.EDGES))
-        }
-        
-        # Orient the corners to normalize comparisons
-        oriented_edges = EdgeValidate.orient(edges, state_string)
-        
-        # Map each oriented corner's sorted colors to its position
-        oriented_colors_to_position = {}
-        for position, edge in oriented_edges.items():
-            sorted_colors = ''.join(sorted(edge))
-            oriented_colors_to_position[sorted_colors] = position
-        
         # Build the permutation map: current position → should be position
         permutation = {}
-        
-        # For each corner position
-        for position, edge in oriented_edges.items():
-            # Sort colors for comparison
-            sorted_colors = ''.join(sorted(edge))
-            
-            # Try to find where this corner should be
-            for valid_pos, valid_colors in position_to_valid_colors.items():
-                if sorted_colors == valid_colors:
-                    # This corner should be at valid_pos
-                    permutation[position] = valid_pos
-                    break
-        
+        for position, key in color_keys(edges, state_string).items():
+            piece = -1 if key is None else EDGE_PIECES[key]
+            if piece >= 0:
+                permutation[position] = EdgeValidate.EDGES[piece]
         return permutation
     
     @staticmethod
@@ -167,8 +129,9 @@ class EdgeValidate:
                     
                 current = corner_permutation[current]
                 
-                # Check if we've completed the cycle or reached a corner not in the mapping
-                if current == start or current not in corner_permutation:
+                # Check if we've completed the cycle, reached a corner not in the mapping,
+                # or run into a chain already counted (a corner that shows up twice)
+                if current == start or current not in corner_permutation or current in visited:
                     break
             
             # Each cycle of length k contributes (k-1) to the parity count
@@ -179,14 +142,13 @@ class EdgeValidate:
     
     def get_total_orientation(self, edges, state_string):
         """
-        This method checks the orientation of the corners.
-        It returns a dictionary of location and it's orientation
+        This method sums the orientation of the edges.
+        It returns the total mod 2, or None if an edge has no orientation
         """
         orientations = self.orientation(edges, state_string)
-        sum = 0
-        for orientation in orientations.values():
-            if orientation is None:
-                return 10
-            else:
-                sum += orientation
-        return sum % 3
\ No newline at end of file
+        if None in orientations.values():
+            return None
+        return sum(orientations.values()) % 2
+
+
+EDGE_PIECES, EDGE_FLIPS = _edge_tables()
\ No newline at end of file
@@ -0,0 +1,336 @@
+# Incremental validation of one cube string under single sticker edits and moves.
+# Running totals (sticker counts, piece identities, twist/flip sums, piece counts, parity) are
+# updated for the few pieces an edit or face turn touches, instead of re-running every validator.
+import collections
+from rubik.batch import move_gathers
+from rubik.cubie import CORNER_LOOKUP, EDGE_LOOKUP
+from rubik.utils.center import VALID_CENTERS
+from rubik.utils.corner import CORNER_INDEX, CORNER_PIECES, CORNER_TWISTS, CornerValidate, color_keys
+from rubik.utils.edge import EDGE_FLIPS, EDGE_INDEX, EDGE_PIECES, EdgeValidate
+
+_CENTER_INDEX = (4, 13, 22, 31, 40, 49)
+# Keys that read as a real piece in the cubie lookups. The validator tables also identify mirrored
+# corners (see rubik.utils.corner), which is_valid has to reject.
+_PROPER_CORNERS = tuple(entry >= 0 for entry in CORNER_LOOKUP.tolist())
+_PROPER_EDGES = tuple(entry >= 0 for entry in EDGE_LOOKUP.tolist())
+_SCHEME = frozenset("URFDLB")
+
+
+def _facelet_pieces():
+    """Maps every facelet to (0 for corners or 1 for edges, position), None for centers."""
+    pieces = [None] * 54
+    for kind, index in enumerate((CORNER_INDEX, EDGE_INDEX)):
+        for position, facelets in enumerate(index.values()):
+            for facelet in facelets:
+                pieces[facelet] = (kind, position)
+    return pieces
+
+
+_FACELET_PIECES = _facelet_pieces()
+
+MovePlan = collections.namedtuple("MovePlan", ["gather", "turns_centers", "positions", "parities"])
+_move_plans = {}
+
+
+def _position_permutation(gather, index):
+    """Returns the position each position of index takes its piece from, and the parity of that permutation."""
+    sources = {frozenset(facelets): position for position, facelets in enumerate(index.values())}
+    permutation = [sources[frozenset(int(gather[facelet]) for facelet in facelets)] for facelets in index.values()]
+    return permutation, _parity(permutation)
+
+
+def _parity(permutation):
+    """Parity of a permutation given as a list, by counting the even-length cycles."""
+    seen = [False] * len(permutation)
+    parity = 0
+    for start in range(len(permutation)):
+        length = 0
+        position = start
+        while not seen[position]:
+            seen[position] = True
+            position = permutation[position]
+            length += 1
+        if length and length % 2 == 0:
+            parity ^= 1
+    return parity
+
+
+def move_plan(move):
+    """
+    Returns what a move does to the totals: its gather, whether it moves the centers, and for face turns the permutation of the corner/edge positions with its parity.
+
+    Raises:
+        ValueError: If the move is not defined.
+    """
+    if move not in _move_plans:
+        gathers = move_gathers()
+        if move not in gathers:
+            raise ValueError(f"Invalid or undefined move: {move}")
+        gather = gathers[move]
+        turns_centers = any(gather[facelet] != facelet for facelet in _CENTER_INDEX)
+        positions, parities = (), ()
+        if not turns_centers:
+            (corners, corner_parity), (edges, edge_parity) = (_position_permutation(gather, CORNER_INDEX),
+                                                              _position_permutation(gather, EDGE_INDEX))
+            positions, parities = (corners, edges), (corner_parity, edge_parity)
+        _move_plans[move] = MovePlan(gather.tolist(), turns_centers, positions, parities)
+    return _move_plans[move]
+
+
+class _PieceTotals:
+    """Running totals for the corners or the edges of a state."""
+
+    def __init__(self, index, pieces, orientations, proper, modulus):
+        self.index = list(index.values())
+        self.names = list(index)
+        self.piece_table = pieces
+        self.orientation_table = orientations
+        self.proper_table = proper
+        self.modulus = modulus
+        self.reset()
+
+    def reset(self):
+        n = len(self.index)
+        self.pieces = [-1] * n
+        self.orientations = [-1] * n
+        self.counts = [0] * n # Positions holding each piece
+        self.orientation_sum = 0
+        self.undefined = n    # Positions without an orientation
+        self.unidentified = n # Positions without a piece
+        self.duplicates = 0   # Positions holding a piece already held elsewhere
+        self.improper = [False] * n # Positions holding an identified piece whose colors are mirrored
+        self.improper_count = 0
+        self.parity = None    # Cached parity while the pieces form a permutation
+
+    def remove(self, position):
+        piece, orientation = self.pieces[position], self.orientations[position]
+        if orientation >= 0:
+            self.orientation_sum -= orientation
+            self.undefined += 1
+        if piece >= 0:
+            self.counts[piece] -= 1
+            if self.counts[piece] >= 1:
+                self.duplicates -= 1
+            self.unidentified += 1
+        if self.improper[position]:
+            self.improper[position] = False
+            self.improper_count -= 1
+        self.pieces[position] = self.orientations[position] = -1
+        self.parity = None
+
+    def add(self, position, key):
+        piece = -1 if key is None else self.piece_table[key]
+        orientation = -1 if key is None else self.orientation_table[key]
+        if orientation >= 0:
+            self.orientation_sum += orientation
+            self.undefined -= 1
+        if piece >= 0:
+            if self.counts[piece] >= 1:
+                self.duplicates += 1
+            self.counts[piece] += 1
+            self.unidentified -= 1
+            if not self.proper_table[key]:
+                self.improper[position] = True
+                self.improper_count += 1
+        self.pieces[position], self.orientations[position] = piece, orientation
+        self.parity = None
+
+    def is_permutation(self):
+        return self.unidentified == 0 and self.duplicates == 0
+
+    def total_orientation(self):
+        return None if self.undefined else self.orientation_sum % self.modulus
+
+    def orientation(self):
+        return {name: (None if o < 0 else o) for name, o in zip(self.names, self.orientations)}
+
+    def permutation(self, piece_names):
+        return {name: piece_names[piece] for name, piece in zip(self.names, self.pieces) if piece >= 0}
+
+
+class IncrementalValidator:
+    """
+    Validates one cube string and keeps the results up to date under single sticker edits
+    and moves. A sticker edit updates the one piece holding it and a face turn the 8 pieces
+    it moves; edits of a center and moves that turn the centers (slices, wide moves, rotations)
+    change how every piece reads relative to the centers and rebuild the totals (20 pieces).
+
+    The results match a full pass of CornerValidate, EdgeValidate and CenterValidate on the
+    current state.
+
+    Examples:
+        validator = IncrementalValidator(RubiksCube.SOLVED_STATE)
+        validator.apply_moves("R U R' U'")
+        validator.set_sticker(8, "F")
+        validator.is_valid() → False
+    """
+
+    def __init__(self, state_string):
+        """
+        Args:
+            state_string (str): A 54 character cube string, in any coloring scheme.
+
+        Raises:
+            ValueError: If the string is not 54 characters long.
+        """
+        if len(state_string) != 54:
+            raise ValueError("Cube strings must be 54 characters long.")
+        self._stickers = list(state_string)
+        self._counts = collections.Counter(self._stickers)
+        self._corners = _PieceTotals(CORNER_INDEX, CORNER_PIECES, CORNER_TWISTS, _PROPER_CORNERS, 3)
+        self._edges = _PieceTotals(EDGE_INDEX, EDGE_PIECES, EDGE_FLIPS, _PROPER_EDGES, 2)
+        self._rebuild()
+
+    @property
+    def state(self):
+        """The current cube string."""
+        return "".join(self._stickers)
+
+    def _totals(self, kind):
+        return self._edges if kind else self._corners
+
+    def _rebuild(self):
+        """Recomputes the piece totals from scratch, after the centers changed."""
+        state = self.state
+        self._center_map = {letter: i for i, letter in reversed(list(enumerate(state[4:54:9])))}
+        for totals in (self._corners, self._edges):
+            totals.reset()
+            keys = color_keys({position: "".join(state[f] for f in facelets)
+                               for position, facelets in enumerate(totals.index)}, state)
+            for position, key in keys.items():
+                totals.add(position, key)
+
+    def _key(self, facelets):
+        key = 0
+        for facelet in facelets:
+            face = self._center_map.get(self._stickers[facelet])
+            if face is None:
+                return None
+            key = key * 6 + face
+        return key
+
+    def _update(self, kind, position):
+        totals = self._totals(kind)
+        totals.remove(position)
+        totals.add(position, self._key(totals.index[position]))
+
+    def set_sticker(self, index, letter):
+        """
+        Changes the color of one sticker.
+
+        Args:
+            index (int): Facelet index, 0-53.
+            letter (str): The new color.
+        """
+        old = self._stickers[index]
+        if old == letter:
+            return
+        self._stickers[index] = letter
+        self._counts[old] -= 1
+        if not self._counts[old]:
+            del self._counts[old]
+        self._counts[letter] += 1
+        if _FACELET_PIECES[index] is None:
+            self._rebuild()
+        else:
+            self._update(*_FACELET_PIECES[index])
+
+    def apply_move(self, move):
+        """
+        Applies a single move (any move defined by RubiksCube, e.g. "R'", "M2", "y").
+
+        Raises:
+            ValueError: If the move is not defined.
+        """
+        plan = move_plan(move)
+        old = self._stickers
+        self._stickers = [old[source] for source in plan.gather]
+        if plan.turns_centers:
+            self._rebuild()
+            return
+        # A face turn keeps the centers, so only the 8 pieces it moves are read again, and
+        # the parity changes by the parity of the turn's position permutation
+        for kind, totals in enumerate((self._corners, self._edges)):
+            parity = totals.parity
+            moved = {position for position, source in enumerate(plan.positions[kind]) if source != position}
+            for position in moved:
+                totals.remove(position)
+            for position in moved:
+                totals.add(position, self._key(totals.index[position]))
+            if parity is not None and totals.is_permutation():
+                totals.parity = parity ^ plan.parities[kind]
+
+    def apply_moves(self, move_sequence):
+        """Applies a space-separated sequence of moves, or a MoveSeq."""
+        moves = move_sequence if not isinstance(move_sequence, str) else move_sequence.split()
+        for move in moves:
+            self.apply_move(move)
+
+    def sticker_counts(self):
+        """Number of stickers of every color."""
+        return dict(self._counts)
+
+    def centers_valid(self):
+        """
+        Same as CenterValidate().validate_centers for a state in URFDLB letters. Other coloring
+        schemes do not tell which colors are opposite, so their centers only have to show six
+        different colors; a mirrored scheme then shows up as mirrored corners.
+        """
+        centers = "".join(self._stickers[i] for i in _CENTER_INDEX)
+        if set(centers) == _SCHEME:
+            return centers in VALID_CENTERS
+        return len(set(centers)) == 6
+
+    def corner_orientation(self):
+        """Same as CornerValidate.orientation on the current state."""
+        return self._corners.orientation()
+
+    def corner_permutation(self):
+        """Same as CornerValidate.permutation on the current state."""
+        return self._corners.permutation(CornerValidate.CORNERS)
+
+    def corner_total_orientation(self):
+        """Same as CornerValidate().get_total_orientation on the current state."""
+        return self._corners.total_orientation()
+
+    def corner_parity(self):
+        """Same as CornerValidate.parity of the corner permutation."""
+        return self._parity(self._corners, CornerValidate.parity, self.corner_permutation)
+
+    def edge_orientation(self):
+        """Same as EdgeValidate.orientation on the current state."""
+        return self._edges.orientation()
+
+    def edge_permutation(self):
+        """Same as EdgeValidate.permutation on the current state."""
+        return self._edges.permutation(EdgeValidate.EDGES)
+
+    def edge_total_orientation(self):
+        """Same as EdgeValidate().get_total_orientation on the current state."""
+        return self._edges.total_orientation()
+
+    def edge_parity(self):
+        """Same as EdgeValidate.parity of the edge permutation."""
+        return self._parity(self._edges, EdgeValidate.parity, self.edge_permutation)
+
+    @staticmethod
+    def _parity(totals, partial_parity, permutation):
+        if not totals.is_permutation():
+            # Follows the chains of the partial map like the validators do
+            return partial_parity(permutation())
+        if totals.parity is None:
+            totals.parity = _parity(totals.pieces)
+        return totals.parity
+
+    def is_valid(self):
+        """
+        Whether the state is a valid cube: 9 stickers of each of 6 colors, valid centers,
+        every corner and edge present once with its colors in clockwise order, zero total twist
+        and flip, and equal parities.
+        """
+        return (len(self._counts) == 6 and all(count == 9 for count in self._counts.values())
+                and self.centers_valid()
+                and self._corners.is_permutation() and self._edges.is_permutation()
+                and not self._corners.improper_count and not self._edges.improper_count
+                and self._corners.total_orientation() == 0 and self._edges.total_orientation() == 0
+                and self.corner_parity() == self.edge_parity())
@@ -0,0 +1,188 @@
+# Batch generation of scrambles and scrambled states for synthetic data.
+import numpy as np
+from rubik.batch import BatchCube, compile_sequence, decode_states, move_gathers
+from rubik.cube import RubiksCube
+from rubik.cubie import CubieCube, permutation_parity
+from rubik.moves import FACES, FACE_MOVE_COUNT, MOVES, notation_from_ids
+
+# Opposite faces share an axis: U/D, R/L, F/B
+_AXIS = np.arange(len(FACES)) % 3
+_CHUNK_ROWS = 1 << 12
+_move_tables = None
+
+
+def _allowed_faces():
+    """
+    Builds the canonical-sequence rule as a table. Row p lists the faces that may follow
+    face p (row 6 is the start of a sequence): never the same face twice in a row, and
+    commuting opposite faces only in the fixed order U before D, R before L, F before B.
+    """
+    allowed = np.zeros((len(FACES) + 1, len(FACES)), dtype=np.uint8)
+    counts = np.zeros(len(FACES) + 1, dtype=np.uint8)
+    for previous in range(len(FACES) + 1):
+        options = [face for face in range(len(FACES)) if previous == len(FACES)
+                   or (face != previous and not (_AXIS[face] == _AXIS[previous] and face < previous))]
+        allowed[previous, :len(options)] = options
+        counts[previous] = len(options)
+    return allowed, counts
+
+
+ALLOWED_FACES, ALLOWED_COUNTS = _allowed_faces()
+
+
+def spawn_generators(seed, workers):
+    """
+    Creates independent, reproducible random generators, one per worker.
+
+    Args:
+        seed (int): The seed of the whole job.
+        workers (int): Number of generators to create.
+
+    Returns:
+        list of np.random.Generator: The same seed always gives the same generators.
+    """
+    return [np.random.default_rng(child) for child in np.random.SeedSequence(seed).spawn(workers)]
+
+
+def scramble_moves(n, length=25, rng=None):
+    """
+    Generates n canonical scramble sequences of face turns.
+
+    Each move is drawn uniformly from the faces allowed after the previous one, with a
+    uniform quarter/half/inverse power.
+
+    Args:
+        n (int): Number of sequences.
+        length (int, optional): Moves per sequence. Defaults to 25.
+        rng (np.random.Generator or int, optional): Generator or seed.
+
+    Returns:
+        np.ndarray: Array of shape (n, length) and dtype uint8 with move ids (see rubik.moves).
+    """
+    rng = np.random.default_rng(rng)
+    faces = np.empty((n, length), dtype=np.uint8)
+    previous = np.full(n, len(FACES), dtype=np.uint8)
+    for step in range(length):
+        choice = (rng.random(n) * ALLOWED_COUNTS[previous]).astype(np.uint8)
+        previous = ALLOWED_FACES[previous, choice]
+        faces[:, step] = previous
+    powers = rng.integers(0, 3, size=(n, length), dtype=np.uint8)
+    return faces * 3 + powers
+
+
+def _face_move_tables():
+    """
+    Returns the gathers of the 18 face turns and of every sequence of three face turns,
+    (18, 54) and (18**3, 54) uint8 arrays. Row (a * 18 + b) * 18 + c of the second
+    table applies a, then b, then c in a single gather.
+    """
+    global _move_tables
+    if _move_tables is None:
+        gathers = move_gathers()
+        single = np.stack([gathers[move] for move in MOVES[:FACE_MOVE_COUNT]])
+        pairs = single[:, single].reshape(-1, 54)
+        triples = pairs[:, single].reshape(-1, 54)
+        _move_tables = single.astype(np.uint8), triples.astype(np.uint8)
+    return _move_tables
+
+
+def apply_move_ids(states, moves):
+    """
+    Applies a different sequence of face turns to every state, three moves per gather.
+
+    Args:
+        states (np.ndarray): Array of shape (N, 54) with color codes, modified in place.
+        moves (np.ndarray): Array of shape (N, length) with face turn ids.
+
+    Returns:
+        np.ndarray: The scrambled states.
+    """
+    single, triples = _face_move_tables()
+    moves = np.asarray(moves, dtype=np.intp)
+    length = moves.shape[1]
+    for start in range(0, len(states), _CHUNK_ROWS):
+        chunk = states[start:start + _CHUNK_ROWS]
+        rows = moves[start:start + _CHUNK_ROWS]
+        for step in range(0, length - length % 3, 3):
+            code = (rows[:, step] * FACE_MOVE_COUNT + rows[:, step + 1]) * FACE_MOVE_COUNT + rows[:, step + 2]
+            chunk = np.take_along_axis(chunk, triples[code], axis=1)
+        for step in range(length - length % 3, length):
+            chunk = np.take_along_axis(chunk, single[rows[:, step]], axis=1)
+        states[start:start + _CHUNK_ROWS] = chunk
+    return states
+
+
+def scramble_batch(n, length=25, rng=None):
+    """
+    Generates n scrambles and the states they produce from a solved cube.
+
+    Args:
+        n (int): Number of scrambles.
+        length (int, optional): Moves per scramble. Defaults to 25.
+        rng (np.random.Generator or int, optional): Generator or seed, e.g. one from spawn_generators.
+
+    Returns:
+        tuple: (moves, states) with moves of shape (n, length) holding move ids and
+               states of shape (n, 54) holding color codes.
+    """
+    moves = scramble_moves(n, length, rng)
+    states = apply_move_ids(BatchCube.solved(n).states, moves)
+    return moves, states
+
+
+def scramble_strings(moves):
+    """Converts an (N, length) array of move ids into one scramble string per row."""
+    return [notation_from_ids(row) for row in np.asarray(moves)]
+
+
+def random_cubies(n, rng=None):
+    """
+    Samples n states uniformly from the cube group, directly at the cubie level.
+
+    Corner and edge permutations are uniform with matching parity, and the twists and
+    flips are uniform with a zero sum. Unlike random-move scrambles the distribution is exact.
+
+    Args:
+        n (int): Number of states.
+        rng (np.random.Generator or int, optional): Generator or seed.
+
+    Returns:
+        CubieCube: The sampled states in the standard orientation.
+    """
+    rng = np.random.default_rng(rng)
+    cp = np.argsort(rng.random((n, 8)), axis=1)
+    ep = np.argsort(rng.random((n, 12)), axis=1)
+    # Swapping two edges is a bijection between odd and even permutations, so this stays uniform
+    mismatch = permutation_parity(cp) != permutation_parity(ep)
+    ep[mismatch, 0], ep[mismatch, 1] = ep[mismatch, 1], ep[mismatch, 0].copy()
+    co = rng.integers(0, 3, size=(n, 8))
+    co[:, -1] = (-co[:, :-1].sum(axis=1)) % 3
+    eo = rng.integers(0, 2, size=(n, 12))
+    eo[:, -1] = (-eo[:, :-1].sum(axis=1)) % 2
+    return CubieCube(cp, co, ep, eo, np.tile(np.arange(6), (n, 1)))
+
+
+def random_states(n, rng=None, random_orientation=False):
+    """
+    Samples n uniformly random cube states as facelets.
+
+    Args:
+        n (int): Number of states.
+        rng (np.random.Generator or int, optional): Generator or seed.
+        random_orientation (bool, optional): Also rotate every state into one of the 24
+                                             orientations in Symmetries.ORIENTATIONS, uniformly.
+
+    Returns:
+        np.ndarray: Array of shape (n, 54) with color codes.
+    """
+    rng = np.random.default_rng(rng)
+    states = random_cubies(n, rng).to_facelets()
+    if random_orientation:
+        rotations = np.stack([compile_sequence(rotation) for rotation in RubiksCube.ORIENTATIONS.values()])
+        states = np.take_along_axis(states, rotations[rng.integers(0, len(rotations), size=n)], axis=1)
+    return states
+
+
+def random_state_strings(n, rng=None, random_orientation=False):
+    """Same as random_states, returning cube strings."""
+    return decode_states(random_states(n, rng, random_orientation))
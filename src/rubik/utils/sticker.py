@@ -1,18 +1,22 @@
-
+from rubik.utils.validation import ValidateState
 
 class StickerValidate:
     @staticmethod
     def corner(state_string):
-        pass 
+        """Stickers to recolor to make the worst corner a real corner (0-2)."""
+        return ValidateState.analyze(state_string).corner_cubie
 
     @staticmethod
     def edge(state_string):
-        pass
+        """Stickers to recolor to make the worst edge a real edge (0-1)."""
+        return ValidateState.analyze(state_string).edge_cubie
 
     @staticmethod
     def center(state_string):
-        pass
+        """Centers to recolor to make them one of the 24 orientations (0-5)."""
+        return ValidateState.analyze(state_string).centers
 
     @staticmethod
     def loss(state_string):
-        pass
+        """Stickers to recolor so that every color shows up 9 times (0-45)."""
+        return ValidateState.analyze(state_string).stickers
@@ -0,0 +1,186 @@
+# Vectorized validation of many cube states at once.
+# The per-piece checks of CornerValidate and EdgeValidate are computed for an (N, 54) batch
+# with a few gathers over the cubie tables, and returned as one structured array.
+# ValidateState turns the same single extraction into the loss terms listed in the README.
+import collections
+import numpy as np
+from rubik.batch import encode_states
+from rubik.cubie import CENTER_FACELETS, CORNER_STICKERS, EDGE_STICKERS, CubieCube, piece_keys, valid_center_keys
+
+# One record per state. Sums and parities are -1 where they are undefined:
+# a twist/flip sum when a piece is unidentifiable, a parity when the pieces are not a permutation.
+VALIDATION_DTYPE = np.dtype([
+    ("corner_twist", "i1"),     # Total corner twist mod 3, 0 when valid
+    ("corner_parity", "i1"),    # Parity of the corner permutation
+    ("edge_flip", "i1"),        # Total edge flip mod 2, 0 when valid
+    ("edge_parity", "i1"),      # Parity of the edge permutation
+    ("parity_match", "?"),      # Corner and edge parities are defined and equal
+    ("centers_valid", "?"),     # The centers form one of the 24 orientations
+    ("sticker_counts", "u1", (6,)), # Stickers of each color, 9 each when valid
+    ("valid", "?"),             # All of the above hold
+])
+
+
+# Loss terms of a state, 0 when it is a valid cube. Pieces are read relative to the centers.
+ANALYSIS_FIELDS = [
+    "corner_orientation", # Total twist of the identified corners mod 3 (0-2)
+    "corner_permutation", # 1 if a corner is missing or duplicated (0-1)
+    "corner_cubie",       # Stickers to recolor to make the worst corner a real corner (0-2)
+    "edge_orientation",   # Total flip of the identified edges mod 2 (0-1)
+    "edge_permutation",   # 1 if an edge is missing or duplicated (0-1)
+    "edge_cubie",         # Stickers to recolor to make the worst edge a real edge (0-1)
+    "parity",             # 1 if the corner and edge permutations have different parities (0-1)
+    "centers",            # Centers to recolor to make them one of the 24 orientations (0-5)
+    "stickers",           # Stickers to recolor so that every color shows up 9 times (0-45)
+    "total",              # 0 for a valid state, 1 otherwise
+]
+ANALYSIS_DTYPE = np.dtype([(field, "u1") for field in ANALYSIS_FIELDS])
+
+
+class StateAnalysis(collections.namedtuple("StateAnalysis", ANALYSIS_FIELDS)):
+    """The loss terms of one state, see ANALYSIS_FIELDS."""
+    __slots__ = ()
+
+    @property
+    def valid(self):
+        return self.total == 0
+
+
+def _fixes(stickers, size):
+    """
+    Maps every color key (see rubik.cubie.piece_keys) to the fewest stickers to recolor
+    to turn it into one of the given real pieces.
+    """
+    keys = np.arange(6 ** size)
+    colors = np.stack([keys // 6 ** (size - 1 - i) % 6 for i in range(size)], axis=1)
+    return (colors[:, None, :] != stickers[None]).sum(axis=2).min(axis=1).astype(np.uint8)
+
+
+CORNER_FIXES = _fixes(CORNER_STICKERS, 3)
+EDGE_FIXES = _fixes(EDGE_STICKERS, 2)
+# Colors of the centers (U, R, F, D, L, B) in each of the 24 orientations
+CENTER_ARRANGEMENTS = (valid_center_keys()[:, None] // 6 ** np.arange(6) % 6).astype(np.uint8)
+
+
+def recolor_by_centers(states):
+    """
+    Relabels the colors of every state by the position of their center, so that the
+    centers read URFDLB. Pieces are then compared relative to the centers like
+    CornerValidate does, whatever the color scheme or orientation of the cube.
+
+    Args:
+        states: Cube strings or an (N, 54) array of color codes.
+
+    Returns:
+        np.ndarray: Array of shape (N, 54) with color codes.
+    """
+    codes = encode_states(states)
+    relabel = np.argsort(codes[:, CENTER_FACELETS], axis=1, kind="stable").astype(np.uint8)
+    return np.take_along_axis(relabel, codes.astype(np.intp), axis=1)
+
+
+def validate_batch(states):
+    """
+    Runs every corner, edge, center and sticker check on a batch of states.
+
+    Examples:
+        result = validate_batch(["UUUUUUUUURRRRRRRRRFFFFFFFFFDDDDDDDDDLLLLLLLLLBBBBBBBBB"])
+        result["valid"][0] → True
+
+    Args:
+        states: Cube strings or an (N, 54) array of color codes.
+
+    Returns:
+        np.ndarray: Structured array of shape (N,) with dtype VALIDATION_DTYPE.
+
+    Raises:
+        ValueError: If a string does not have 54 face letters.
+    """
+    codes = encode_states(states)
+    cubies = CubieCube.from_facelets(recolor_by_centers(codes))
+    result = np.zeros(len(codes), dtype=VALIDATION_DTYPE)
+    corners = (np.sort(cubies.cp, axis=1) == np.arange(8)).all(axis=1)
+    edges = (np.sort(cubies.ep, axis=1) == np.arange(12)).all(axis=1)
+    result["corner_twist"] = cubies.corner_twist()
+    result["corner_parity"] = np.where(corners, cubies.corner_parity(), -1)
+    result["edge_flip"] = cubies.edge_flip()
+    result["edge_parity"] = np.where(edges, cubies.edge_parity(), -1)
+    result["parity_match"] = corners & edges & (result["corner_parity"] == result["edge_parity"])
+    original = CubieCube(cubies.cp, cubies.co, cubies.ep, cubies.eo, codes[:, CENTER_FACELETS])
+    result["centers_valid"] = original.centers_valid()
+    result["sticker_counts"] = _sticker_counts(codes)
+    result["valid"] = ((result["corner_twist"] == 0) & (result["edge_flip"] == 0) & result["parity_match"]
+                       & result["centers_valid"] & (result["sticker_counts"] == 9).all(axis=1))
+    return result
+
+
+def _sticker_counts(codes):
+    offsets = np.arange(len(codes))[:, None] * 6
+    return np.bincount((offsets + codes).ravel(), minlength=6 * len(codes)).reshape(-1, 6)
+
+
+def analyze_batch(states):
+    """
+    Computes every loss term of a batch of states from one extraction of their pieces.
+
+    Args:
+        states: Cube strings or an (N, 54) array of color codes.
+
+    Returns:
+        np.ndarray: Structured array of shape (N,) with dtype ANALYSIS_DTYPE (one field per
+                    entry of ANALYSIS_FIELDS).
+
+    Raises:
+        ValueError: If a string does not have 54 face letters.
+    """
+    codes = encode_states(states)
+    corner_keys, edge_keys = piece_keys(recolor_by_centers(codes))
+    cubies = CubieCube.from_piece_keys(corner_keys, edge_keys, codes[:, CENTER_FACELETS])
+    corners = (np.sort(cubies.cp, axis=1) == np.arange(8)).all(axis=1)
+    edges = (np.sort(cubies.ep, axis=1) == np.arange(12)).all(axis=1)
+    result = np.zeros(len(codes), dtype=ANALYSIS_DTYPE)
+    result["corner_orientation"] = np.maximum(cubies.co, 0).sum(axis=1) % 3
+    result["corner_permutation"] = ~corners
+    result["corner_cubie"] = CORNER_FIXES[corner_keys].max(axis=1, initial=0)
+    result["edge_orientation"] = np.maximum(cubies.eo, 0).sum(axis=1) % 2
+    result["edge_permutation"] = ~edges
+    result["edge_cubie"] = EDGE_FIXES[edge_keys].max(axis=1, initial=0)
+    result["parity"] = corners & edges & (cubies.corner_parity() != cubies.edge_parity())
+    mismatches = codes[:, None, CENTER_FACELETS] != CENTER_ARRANGEMENTS
+    result["centers"] = mismatches.sum(axis=2).min(axis=1)
+    result["stickers"] = np.maximum(_sticker_counts(codes) - 9, 0).sum(axis=1)
+    result["total"] = np.stack([result[field] for field in ANALYSIS_FIELDS[:-1]]).any(axis=0)
+    return result
+
+
+class ValidateState:
+    """
+    This class is used to validate the state of the cube string:
+
+    Centers, edges and corners are extracted once and every loss term of the README is
+    computed from them (see ANALYSIS_FIELDS).
+    """
+
+    @staticmethod
+    def analyze(state):
+        """
+        Computes every loss term of a state.
+
+        Examples:
+            ValidateState.analyze(RubiksCube.SOLVED_STATE).valid → True
+
+        Args:
+            state (str): A cube string.
+
+        Returns:
+            StateAnalysis: The loss terms, as ints.
+        """
+        return StateAnalysis(*analyze_batch(state)[0].tolist())
+
+    @staticmethod
+    def analyze_batch(states):
+        """Batch version of analyze, see analyze_batch."""
+        return analyze_batch(states)
+
+    def corner_orientation(self, s):
+        return self.analyze(s).corner_orientation
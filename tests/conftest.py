@@ -0,0 +1,28 @@
+import random
+import pytest
+from rubik.batch import BatchCube
+from rubik.cube import RubiksCube
+
+
+def _swap(state, *positions):
+    """Cycles the stickers at the given positions (the first gets the color of the last)."""
+    state = list(state)
+    colors = [state[p] for p in positions]
+    for position, color in zip(positions, colors[-1:] + colors[:-1]):
+        state[position] = color
+    return "".join(state)
+
+
+@pytest.fixture
+def swap():
+    """The sticker cycling helper, e.g. swap(state, 5, 10) flips the UR edge of a solved cube."""
+    return _swap
+
+
+@pytest.fixture
+def scrambled():
+    """100 states reached by random 25 move sequences."""
+    cube = RubiksCube()
+    rng = random.Random(3)
+    sequences = [" ".join(rng.choice(cube.valid_moves) for _ in range(25)) for _ in range(100)]
+    return [BatchCube.solved(1).apply_moves(sequence).to_strings()[0] for sequence in sequences]
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+from rubik.cube import RubiksCube
+from rubik.batch import BatchCube, compile_sequence, encode_states, decode_states
+from rubik.moves import MoveSeq
+
+
+class TestBatchCube:
+    @pytest.fixture
+    def cube(self):
+        return RubiksCube()
+
+    def test_encode_round_trip(self):
+        states = [RubiksCube.SOLVED_STATE, 'URFBULBLDLDDRRDULRDUFFFBDRBBULDDFULBFURFLUFBLRDLFBRUBR']
+        codes = encode_states(states)
+        assert codes.shape == (2, 54)
+        assert codes.dtype == np.uint8
+        assert decode_states(codes) == states
+
+    def test_invalid_letters(self):
+        with pytest.raises(ValueError):
+            encode_states("X" * 54)
+
+    def test_invalid_lengths(self):
+        state = RubiksCube.SOLVED_STATE
+        with pytest.raises(ValueError, match="row 0"):
+            encode_states([state[:53], "U" + state])
+        with pytest.raises(ValueError, match="row 1"):
+            encode_states([state, state + "U"])
+
+    def test_matches_single_cube(self, cube):
+        """Every move must agree with RubiksCube.turn"""
+        batch = BatchCube.solved(3)
+        for move in cube.valid_moves:
+            cube.reset()
+            cube.turn(move)
+            batch_move = BatchCube.solved(3).turn(move)
+            assert batch_move.to_strings() == [cube.get_state_string()] * 3, move
+        assert batch.is_solved().all()
+
+    def test_algorithm(self, cube):
+        alg = "D B2 D2 L2 B2 L2 B2 U' B2 F2 U2 R D' L2 B D L R' F D2 R"
+        batch = BatchCube([RubiksCube.SOLVED_STATE, "".join(cube.apply_moves("R U", list(RubiksCube.SOLVED_STATE)))])
+        batch.apply_moves(alg)
+        assert batch[0] == 'URFBULBLDLDDRRDULRDUFFFBDRBBULDDFULBFURFLUFBLRDLFBRUBR'
+        assert not batch.is_solved().any()
+
+    def test_invalid_move(self):
+        with pytest.raises(ValueError):
+            BatchCube.solved(1).turn("Q")
+
+
+class TestCompileSequence:
+    def test_matches_sequential_turns(self):
+        alg = "R U R' U' R' F R2 U' R' U' R U R' F'"
+        expected = RubiksCube().apply_moves(alg, list(RubiksCube.SOLVED_STATE))
+        compiled = compile_sequence(alg)
+        solved = encode_states(RubiksCube.SOLVED_STATE)[0]
+        assert decode_states(solved[compiled]) == ["".join(expected)]
+
+    def test_cached_on_normalized_sequence(self):
+        first = compile_sequence("R U R' U'")
+        assert compile_sequence("  R  U R'   U' ") is first
+        assert not first.flags.writeable
+        assert compile_sequence(MoveSeq("R U R' U'")) is first
+
+    def test_empty_sequence_is_identity(self):
+        assert (compile_sequence("") == np.arange(54)).all()
+        assert compile_sequence("I") is compile_sequence("")
+
+    def test_undefined_move(self):
+        with pytest.raises(ValueError):
+            compile_sequence("R Q")
@@ -1,6 +1,7 @@
 import pytest
 from rubik.cube import RubiksCube
-from rubik.utils.corner import CornerValidate
+from rubik.cubie import CORNER_LOOKUP
+from rubik.utils.corner import CORNER_INDEX, CORNER_PIECES, CORNER_TWISTS, CornerValidate
 
 class TestCornerValidation:
     def setup_method(self):
@@ -192,4 +193,36 @@ class TestCornerValidation:
         assert permutation == expected_permutation, \
             f"Expected permutation {expected_permutation}, got {permutation}"
         assert orientations == expected_orientations, \
-            f"Expected orientations {expected_orientations}, got {orientations}"
\ No newline at end of file
+            f"Expected orientations {expected_orientations}, got {orientations}"
+
+    def test_lookup_tables(self):
+        """Every corner in every twist is found with one table index"""
+        for piece, facelets in enumerate(CORNER_INDEX.values()):
+            colors = [index // 9 for index in facelets]
+            for twist in range(3):
+                seen = colors[-twist:] + colors[:-twist] if twist else colors
+                key = seen[0] * 36 + seen[1] * 6 + seen[2]
+                assert CORNER_PIECES[key] == piece
+                assert CORNER_TWISTS[key] == twist
+        assert CORNER_PIECES[0 * 36 + 0 * 6 + 1] == -1
+        assert CORNER_TWISTS[0 * 36 + 0 * 6 + 1] == -1
+        assert sum(piece >= 0 for piece in CORNER_PIECES) == 8 * 6
+
+    def test_tables_match_cubie_lookup(self):
+        """Real corners read the same as rubik.cubie, mirrored corners keep the legacy reading"""
+        for key, entry in enumerate(CORNER_LOOKUP.tolist()):
+            if entry >= 0:
+                assert (CORNER_PIECES[key], CORNER_TWISTS[key]) == divmod(entry, 3)
+        mirrored = 0 * 36 + 2 * 6 + 1 # URF read as U, F, R
+        assert CORNER_LOOKUP[mirrored] == -1
+        assert (CORNER_PIECES[mirrored], CORNER_TWISTS[mirrored]) == (0, 0)
+
+    def test_color_scheme(self, validator, cube):
+        """Colors are read relative to the centers"""
+        cube.apply_moves("R U R' U R U2 R'")
+        state = cube.get_state_string()
+        recolored = state.translate(str.maketrans("URFDLB", "WRGYOB"))
+        corners = validator.get(recolored)
+        assert validator.permutation(corners, recolored) == validator.permutation(validator.get(state), state)
+        assert validator.get_total_orientation(corners, recolored) == 0
+        assert validator.get_total_orientation(corners, recolored.replace("W", "X")) is None
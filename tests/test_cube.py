@@ -1,5 +1,5 @@
 import pytest
-from src.rubik.cube import RubiksCube  # Adjust the import path as needed
+from rubik.cube import RubiksCube  # Adjust the import path as needed
 
 
 
@@ -59,4 +59,28 @@ class TestRubiksCubeState:
         solution = self.cube.solve()
         self.cube.apply_moves(solution)
         assert self.cube.get_state_string() == self.solved_state
-        assert self.cube.is_solved() is True
\ No newline at end of file
+        assert self.cube.is_solved() is True
+
+    @pytest.mark.parametrize("wide, equivalent", [
+        ("r", "L x"), ("l", "R x'"), ("u", "D y"), ("d", "U y'"), ("f", "B z"), ("b", "F z'"),
+        ("r2", "L2 x2"), ("u'", "D' y'"), ("Rw", "r"), ("Fw'", "f'"), ("Dw2", "d2"),
+    ])
+    def test_wide_moves(self, wide, equivalent):
+        other = RubiksCube()
+        self.cube.apply_moves(f"R U F {wide}")
+        other.apply_moves(f"R U F {equivalent}")
+        assert self.cube.get_state_string() == other.get_state_string()
+
+    def test_slice_doubles(self):
+        for slice_move in ["M", "E", "S"]:
+            self.cube.apply_moves(f"{slice_move} {slice_move}")
+            other = RubiksCube()
+            other.apply_moves(f"{slice_move}2")
+            assert self.cube.get_state_string() == other.get_state_string()
+            self.cube.reset()
+
+    def test_scramble_uses_face_turns_only(self, monkeypatch):
+        chosen = []
+        monkeypatch.setattr("random.choice", lambda moves: chosen.extend(moves) or moves[0])
+        self.cube.scramble(1)
+        assert sorted(chosen) == sorted(f + s for f in RubiksCube.FACES for s in ["", "'", "2"])
@@ -0,0 +1,59 @@
+import random
+import numpy as np
+import pytest
+from rubik.cube import RubiksCube
+from rubik.batch import BatchCube
+from rubik.cubie import CubieCube
+
+
+class TestCubieCube:
+    @pytest.fixture
+    def cube(self):
+        return RubiksCube()
+
+    def test_solved_round_trip(self):
+        solved = CubieCube.from_facelets(RubiksCube.SOLVED_STATE)
+        assert (solved.cp == np.arange(8)).all()
+        assert (solved.ep == np.arange(12)).all()
+        assert solved.to_strings() == [RubiksCube.SOLVED_STATE]
+
+    def test_moves_match_facelet_engine(self, cube):
+        rng = random.Random(0)
+        sequences = [" ".join(rng.choice(cube.valid_moves) for _ in range(20)) for _ in range(50)]
+        for sequence in sequences:
+            expected = BatchCube.solved(1).apply_moves(sequence)
+            result = CubieCube.solved(1).apply_moves(sequence)
+            assert result.to_strings() == expected.to_strings(), sequence
+            assert result.is_valid().all(), sequence
+
+    def test_batch_conversion(self):
+        states = BatchCube.solved(3)
+        states.states[1] = BatchCube.solved(1).apply_moves("R U R' U'").states[0]
+        states.states[2] = BatchCube.solved(1).apply_moves("x M2 U").states[0]
+        cubies = CubieCube.from_facelets(states.states)
+        assert (cubies.to_facelets() == states.states).all()
+
+    def test_single_move_properties(self):
+        r = CubieCube.move("R")
+        assert r.corner_parity()[0] == 1
+        assert r.edge_parity()[0] == 1
+        assert r.corner_twist()[0] == 0
+        m = CubieCube.move("M")
+        assert m.center_parity()[0] == 1
+        assert m.is_valid()[0]
+
+    def test_invalid_states(self):
+        state = list(RubiksCube.SOLVED_STATE)
+        # Twist the URF corner in place
+        state[8], state[9], state[20] = state[20], state[8], state[9]
+        twisted = CubieCube.from_facelets("".join(state))
+        assert twisted.corner_twist()[0] != 0
+        assert not twisted.is_valid()[0]
+
+        state = list(RubiksCube.SOLVED_STATE)
+        state[10], state[20] = state[20], state[10]
+        swapped = CubieCube.from_facelets("".join(state))
+        assert not swapped.is_identified()[0]
+        assert not swapped.is_valid()[0]
+        with pytest.raises(ValueError):
+            swapped.to_facelets()
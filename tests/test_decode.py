@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from rubik.batch import encode_states
+from rubik.cube import RubiksCube
+from rubik.decode import Decoding, decode, decode_batch, top_k
+from rubik.utils.validation import validate_batch
+
+
+def one_hot(states, confidence=4.0):
+    return np.eye(6)[encode_states(states)] * confidence
+
+
+def log_likelihood(logits, state):
+    scores = logits - np.log(np.exp(logits).sum(axis=-1, keepdims=True))
+    return scores[np.arange(54), encode_states(state)[0]].sum()
+
+
+def test_confident_scores(scrambled):
+    decoded = decode_batch(one_hot(scrambled))
+    assert [entries[0].state for entries in decoded] == scrambled
+    assert decode(one_hot(scrambled[0])[0]) == decoded[0][0]
+
+
+def test_noisy_scores(scrambled):
+    rng = np.random.default_rng(0)
+    logits = one_hot(scrambled, 3.0) + rng.normal(0, 1.0, (len(scrambled), 54, 6))
+    assert not validate_batch(logits.argmax(axis=2).astype(np.uint8))["valid"].all()
+    decoded = [entries[0] for entries in decode_batch(logits)]
+    assert validate_batch([d.state for d in decoded])["valid"].all()
+    for d, state, row in zip(decoded, scrambled, logits):
+        assert d.score == pytest.approx(log_likelihood(row, d.state))
+        assert d.score >= log_likelihood(row, state) - 1e-9
+
+
+@pytest.mark.parametrize("positions", [(8, 9, 20), (5, 10)], ids=["twist", "flip"])
+def test_fixes_orientation(scrambled, positions, swap):
+    # Slightly prefer the state with one twisted corner / flipped edge
+    state = scrambled[0]
+    logits = one_hot(state)[0] + one_hot(swap(state, *positions), 4.5)[0]
+    assert not validate_batch(logits.argmax(axis=1).astype(np.uint8))["valid"][0]
+    assert decode(logits).state == state
+
+
+def test_fixes_parity(swap):
+    state = RubiksCube.SOLVED_STATE
+    logits = one_hot(state)[0] + one_hot(swap(swap(state, 5, 7), 10, 19), 4.5)[0]
+    assert decode(logits).state == state
+
+
+def test_any_orientation(scrambled):
+    cube = RubiksCube(scrambled[0])
+    cube.apply_moves("x y")
+    state = cube.get_state_string()
+    rng = np.random.default_rng(1)
+    logits = one_hot(state)[0] + rng.normal(0, 0.5, (54, 6))
+    assert top_k(logits, 2)[0].state == state
+
+
+def test_top_k(scrambled):
+    rng = np.random.default_rng(2)
+    logits = one_hot(scrambled[:5], 3.0) + rng.normal(0, 1.0, (5, 54, 6))
+    for row, entries in zip(logits, decode_batch(logits, k=4)):
+        assert len(entries) == 4
+        assert len({d.state for d in entries}) == 4
+        assert validate_batch([d.state for d in entries])["valid"].all()
+        scores = [d.score for d in entries]
+        assert scores == sorted(scores, reverse=True)
+        assert scores == pytest.approx([log_likelihood(row, d.state) for d in entries])
+        assert entries[0].state == decode(row).state
+
+
+def test_shapes():
+    assert decode_batch(np.zeros((0, 54, 6))) == []
+    entries = decode_batch(np.zeros((54, 6)))
+    assert len(entries) == 1 and isinstance(entries[0][0], Decoding)
+    assert validate_batch([entries[0][0].state])["valid"].all()
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from rubik.cube import RubiksCube
+from rubik.dedup import Deduplicator, deduplicate, main, read_states
+from rubik.utils.scrambles import random_state_strings
+
+
+def equivalent_copies(state, count, rng):
+    """Rotated and recolored copies of a state."""
+    cube = RubiksCube()
+    rotations = list(cube.ORIENTATIONS.values())
+    copies = []
+    for _ in range(count):
+        rotated = "".join(cube.apply_moves(rotations[rng.integers(len(rotations))], list(state)))
+        copies.append(cube.get_canon_rotated_state(rotated) if rng.random() < 0.5 else rotated)
+    return copies
+
+
+@pytest.fixture
+def stream():
+    rng = np.random.default_rng(11)
+    bases = random_state_strings(20, rng=rng)
+    states = []
+    for i, state in enumerate(bases):
+        states.extend([state] + equivalent_copies(state, i, rng))
+    order = rng.permutation(len(states))
+    return bases, [states[i] for i in order]
+
+
+def test_counts_match_pairwise_is_equivalent(stream):
+    bases, states = stream
+    classes = list(deduplicate(states))
+    assert len(classes) == len(bases)
+    assert sum(cls.count for cls in classes) == len(states)
+    cube = RubiksCube()
+    for cls in classes:
+        base = next(i for i, b in enumerate(bases) if cube.is_equivalent(cls.state, list(b)))
+        assert cls.count == base + 1
+        assert states[cls.first_index] == cls.state
+
+
+def test_spilling_gives_same_classes(stream, tmp_path):
+    _, states = stream
+    expected = sorted(deduplicate(states))
+    with Deduplicator(max_classes=3, spill_dir=str(tmp_path), partitions=4, chunksize=7) as dedup:
+        dedup.add(states)
+        assert dedup.spills > 0
+        assert sorted(dedup.classes()) == expected
+    assert not list(tmp_path.iterdir())
+
+
+def test_invalid_states(tmp_path):
+    states = [RubiksCube.SOLVED_STATE, "not a cube", RubiksCube.SOLVED_STATE]
+    with pytest.raises(ValueError):
+        list(deduplicate(states))
+    with Deduplicator(skip_invalid=True) as dedup:
+        dedup.add(states)
+        assert [cls.count for cls in dedup.classes()] == [2]
+        assert dedup.skipped == 1
+
+
+def test_invalid_lengths():
+    state = RubiksCube.SOLVED_STATE
+    classes = list(deduplicate([state, state[:53], "U" + state], skip_invalid=True))
+    assert [(cls.state, cls.count) for cls in classes] == [(state, 1)]
+    with pytest.raises(ValueError):
+        list(deduplicate([state, state[:53], "U" + state]))
+
+
+def test_command_line(stream, tmp_path):
+    _, states = stream
+    source = tmp_path / "states.txt"
+    source.write_text("\n".join(states) + "\n\n")
+    assert list(read_states(str(source))) == states
+    output = tmp_path / "classes.tsv"
+    main([str(source), "-o", str(output), "--max-classes", "5"])
+    lines = output.read_text().splitlines()
+    assert len(lines) == 20
+    assert sum(int(line.split("\t")[1]) for line in lines) == len(states)
@@ -0,0 +1,60 @@
+import pytest
+from rubik.cube import RubiksCube
+from rubik.utils.edge import EDGE_FLIPS, EDGE_INDEX, EDGE_PIECES, EdgeValidate
+
+
+class TestEdgeValidation:
+    @pytest.fixture
+    def validator(self):
+        return EdgeValidate()
+
+    @pytest.fixture
+    def cube(self):
+        return RubiksCube()
+
+    def test_solved(self, validator, cube):
+        state = cube.get_state_string()
+        edges = validator.get(state)
+        assert edges["UR"] == "UR" and edges["FL"] == "FL" and edges["DB"] == "DB"
+        assert validator.permutation(edges, state) == {edge: edge for edge in EdgeValidate.EDGES}
+        assert validator.get_total_orientation(edges, state) == 0
+
+    @pytest.mark.parametrize("moves, parity, flips", [
+        ("R", 1, {}),
+        ("F", 1, {"UF": 1, "FR": 1, "DF": 1, "FL": 1}),
+        ("x y R", 1, {}),
+        ("R U R' U'", 0, {}),
+        ("M' U M U2 M' U M", 0, {"UR": 1, "UB": 1}),
+    ])
+    def test_moves(self, validator, cube, moves, parity, flips):
+        cube.apply_moves(moves)
+        state = cube.get_state_string()
+        edges = validator.get(state)
+        orientations = validator.orientation(edges, state)
+        assert validator.parity(validator.permutation(edges, state)) == parity
+        assert {location: flip for location, flip in orientations.items() if flip} == flips
+        assert validator.get_total_orientation(edges, state) == 0
+
+    def test_flipped_edge(self, validator, cube):
+        state = list(cube.get_state_string())
+        state[5], state[10] = state[10], state[5]
+        state = "".join(state)
+        edges = validator.get(state)
+        assert validator.orientation(edges, state)["UR"] == 1
+        assert validator.permutation(edges, state)["UR"] == "UR"
+        assert validator.get_total_orientation(edges, state) == 1
+
+    def test_broken_edge(self, validator, cube):
+        state = list(cube.get_state_string())
+        state[5], state[19] = state[19], state[5]
+        state = "".join(state)
+        edges = validator.get(state)
+        assert "UF" not in validator.permutation(edges, state)
+        assert validator.get_total_orientation(edges, state) is None
+
+    def test_lookup_tables(self):
+        for piece, edge in enumerate(EdgeValidate.EDGES):
+            first, second = (index // 9 for index in EDGE_INDEX[edge])
+            assert (EDGE_PIECES[first * 6 + second], EDGE_FLIPS[first * 6 + second]) == (piece, 0)
+            assert (EDGE_PIECES[second * 6 + first], EDGE_FLIPS[second * 6 + first]) == (piece, 1)
+        assert sum(piece >= 0 for piece in EDGE_PIECES) == 24
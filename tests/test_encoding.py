@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from rubik.cube import RubiksCube
+from rubik.batch import BatchCube
+from rubik.encoding import (PACKED_BYTES, as_sortable, cubie_coordinates, cubie_index, from_cubie_coordinates,
+                            from_cubie_index, pack, pack_states, state_hash, unpack, unpack_states)
+
+
+class TestEncoding:
+    @pytest.fixture
+    def batch(self):
+        algs = ["", "R", "R U R' U'", "D B2 D2 L2 B2 L2 B2 U' B2 F2 U2 R D' L2 B D L R' F D2 R", "R' F R2 U' R' U' R U R' F'"]
+        batch = BatchCube.solved(len(algs))
+        for row, alg in enumerate(algs):
+            batch.states[row] = BatchCube.solved(1).apply_moves(alg).states[0]
+        return batch
+
+    def test_pack_round_trip(self, batch):
+        packed = pack_states(batch)
+        assert packed.shape == (len(batch), PACKED_BYTES)
+        assert (unpack_states(packed) == batch.states).all()
+
+    def test_single_state_keys(self):
+        cube = RubiksCube()
+        cube.apply_moves("R U")
+        key = pack(cube)
+        assert len(key) == PACKED_BYTES
+        assert key == pack(cube.get_state_string()) == pack(cube.state)
+        assert unpack(key) == cube.get_state_string()
+        assert {key: 1}[pack(cube.get_state_string())] == 1
+
+    def test_hash_is_stable(self, batch):
+        hashes = state_hash(batch)
+        assert hashes.dtype == np.uint64
+        assert len(set(hashes.tolist())) == len(batch)
+        assert (state_hash(pack_states(batch)) == hashes).all()
+        assert int(state_hash(RubiksCube.SOLVED_STATE)[0]) == int(hashes[0])
+
+    def test_sortable(self, batch):
+        packed = pack_states(batch)
+        doubled = np.concatenate([packed, packed])
+        assert len(np.unique(as_sortable(doubled))) == len(batch)
+
+    def test_cubie_coordinates_round_trip(self, batch):
+        coordinates = cubie_coordinates(batch)
+        assert (from_cubie_coordinates(coordinates) == batch.states).all()
+        index = cubie_index(batch[3])
+        assert index < 2 ** 66
+        assert from_cubie_index(index) == batch[3]
+        assert cubie_index(RubiksCube.SOLVED_STATE) == 0
+
+    def test_cubie_coordinates_reject_rotated(self):
+        with pytest.raises(ValueError):
+            cubie_coordinates(BatchCube.solved(1).apply_moves("x"))
@@ -0,0 +1,128 @@
+import random
+import pytest
+from rubik.cube import RubiksCube
+from rubik.moves import MoveSeq
+from rubik.utils.center import CenterValidate
+from rubik.utils.corner import CORNER_INDEX, CornerValidate
+from rubik.utils.edge import EdgeValidate
+from rubik.utils.incremental import IncrementalValidator
+from rubik.utils.validation import validate_batch
+
+
+def full_pass(state):
+    corners, edges = CornerValidate.get(state), EdgeValidate.get(state)
+    corner_permutation = CornerValidate.permutation(corners, state)
+    edge_permutation = EdgeValidate.permutation(edges, state)
+    return (CornerValidate.orientation(corners, state), corner_permutation,
+            CornerValidate().get_total_orientation(corners, state), CornerValidate.parity(corner_permutation),
+            EdgeValidate.orientation(edges, state), edge_permutation,
+            EdgeValidate().get_total_orientation(edges, state), EdgeValidate.parity(edge_permutation),
+            CenterValidate().validate_centers(state))
+
+
+def incremental_pass(validator):
+    return (validator.corner_orientation(), validator.corner_permutation(),
+            validator.corner_total_orientation(), validator.corner_parity(),
+            validator.edge_orientation(), validator.edge_permutation(),
+            validator.edge_total_orientation(), validator.edge_parity(),
+            validator.centers_valid())
+
+
+class TestIncrementalValidator:
+    def test_solved(self):
+        validator = IncrementalValidator(RubiksCube.SOLVED_STATE)
+        assert validator.is_valid()
+        assert validator.sticker_counts() == {face: 9 for face in "URFDLB"}
+        assert incremental_pass(validator) == full_pass(RubiksCube.SOLVED_STATE)
+
+    def test_random_edits_match_full_pass(self):
+        rng = random.Random(11)
+        moves = RubiksCube().valid_moves
+        validator = IncrementalValidator(RubiksCube.SOLVED_STATE)
+        for step in range(600):
+            roll = rng.random()
+            if roll < 0.8:
+                validator.apply_move(rng.choice(moves))
+            elif roll < 0.9:
+                validator.set_sticker(rng.randrange(54), rng.choice("URFDLB"))
+            else:
+                # Swapping two stickers of a corner mirrors it, which no single sticker edit does
+                first, second = rng.sample(rng.choice(list(CORNER_INDEX.values())), 2)
+                colors = validator.state
+                validator.set_sticker(first, colors[second])
+                validator.set_sticker(second, colors[first])
+            if step % 100 == 99:
+                validator = IncrementalValidator(RubiksCube.SOLVED_STATE)
+            state = validator.state
+            assert incremental_pass(validator) == full_pass(state), state
+            assert validator.is_valid() == validate_batch(state)["valid"][0], state
+            assert validator.sticker_counts() == {face: state.count(face) for face in set(state)}
+
+    def test_moves_match_cube(self):
+        cube = RubiksCube()
+        validator = IncrementalValidator(cube.get_state_string())
+        sequence = "R U2 F' x M E' S2 Rw' d b2 L D' B"
+        cube.apply_moves(sequence)
+        validator.apply_moves(MoveSeq(sequence))
+        assert validator.state == cube.get_state_string()
+        assert validator.is_valid()
+
+    def test_sticker_edits(self):
+        validator = IncrementalValidator(RubiksCube.SOLVED_STATE)
+        validator.apply_moves("R U R' U'")
+        corner_parity = validator.corner_parity()
+        original = validator.state[8]
+        validator.set_sticker(8, "F" if original != "F" else "U")
+        assert not validator.is_valid()
+        assert incremental_pass(validator) == full_pass(validator.state)
+        assert sum(validator.sticker_counts().values()) == 54
+        validator.set_sticker(8, original)
+        validator.set_sticker(4, "R")
+        assert not validator.centers_valid()
+        validator.set_sticker(4, "U")
+        assert validator.is_valid()
+        assert validator.corner_parity() == corner_parity
+
+    def test_color_scheme(self):
+        cube = RubiksCube()
+        cube.apply_moves("R U F' L")
+        recolored = cube.get_state_string().translate(str.maketrans("URFDLB", "WRGYOB"))
+        validator = IncrementalValidator(recolored)
+        validator.apply_moves("L' F U' R'")
+        assert validator.corner_permutation() == {corner: corner for corner in CornerValidate.CORNERS}
+        assert validator.edge_total_orientation() == 0
+        assert validator.centers_valid()
+        assert validator.is_valid()
+        validator.set_sticker(8, "R")
+        assert not validator.is_valid()
+
+    def test_mirrored_corner(self, swap):
+        # URF showing U, F, R clockwise: the right colors in the wrong order
+        state = RubiksCube.SOLVED_STATE
+        mirrored = swap(state, 9, 20)
+        assert not validate_batch(mirrored)["valid"][0]
+        assert not IncrementalValidator(mirrored).is_valid()
+        validator = IncrementalValidator(state)
+        validator.set_sticker(9, "F")
+        validator.set_sticker(20, "R")
+        assert validator.corner_permutation() == {corner: corner for corner in CornerValidate.CORNERS}
+        assert not validator.is_valid()
+        validator.apply_moves("R U")
+        assert not validator.is_valid()
+        validator.apply_moves("U' R'")
+        validator.set_sticker(9, "R")
+        validator.set_sticker(20, "F")
+        assert validator.is_valid()
+
+    def test_duplicate_pieces_parity(self):
+        # Chains into a piece already counted stop there: URF -> UFL -> ULB is one 3-cycle
+        assert CornerValidate.parity({"URF": "UFL", "UFL": "ULB", "ULB": "UFL"}) == 0
+        assert EdgeValidate.parity({"UR": "UF", "UF": "UL", "UL": "UF"}) == 0
+        # URF <-> UFL is a 2-cycle, ULB -> URF adds nothing
+        assert CornerValidate.parity({"URF": "UFL", "UFL": "URF", "ULB": "URF"}) == 1
+
+    def test_errors(self):
+        with pytest.raises(ValueError):
+            IncrementalValidator("U" * 53)
+        with pytest.raises(ValueError):
+            IncrementalValidator(RubiksCube.SOLVED_STATE).apply_move("Q")
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("yaml")
+
+from modeling.backbone import BackboneRegistry
+from modeling.losses import LOSS_TERMS, CubeConstraintLoss
+from rubik.batch import BatchCube
+from rubik.cube import RubiksCube
+
+
+def one_hot(states):
+    codes = torch.as_tensor(BatchCube(states).states.astype(np.int64))
+    return torch.nn.functional.one_hot(codes, 6).float()
+
+
+class TestCubeConstraintLoss:
+    def test_valid_states_have_no_loss(self, scrambled):
+        terms = CubeConstraintLoss().terms(one_hot(scrambled))
+        assert set(terms) == set(LOSS_TERMS)
+        for term, values in terms.items():
+            assert values.shape == (len(scrambled),)
+            assert values.abs().max() < 1e-5, term
+
+    def test_color_scheme_does_not_matter(self, scrambled):
+        recolored = one_hot(scrambled)[:, :, [2, 0, 1, 5, 3, 4]]
+        assert CubeConstraintLoss()(recolored) < 1e-5
+
+    def test_violations(self, swap):
+        solved = RubiksCube.SOLVED_STATE
+        terms = CubeConstraintLoss().terms(one_hot([swap(solved, 5, 10), swap(solved, 8, 18), "U" * 54]))
+        assert terms["edge_orientation"].tolist()[0] == pytest.approx(1.0)
+        assert terms["edge_cubie"].tolist()[0] == pytest.approx(0.0)
+        assert terms["corner_cubie"].tolist()[1] == pytest.approx(2.0)
+        assert terms["corner_orientation"].tolist()[1] == pytest.approx(0.0)
+        assert terms["stickers"].tolist() == pytest.approx([0.0, 0.0, 45.0])
+        assert terms["centers"].tolist() == pytest.approx([0.0, 0.0, 1.0])
+
+    def test_gradients(self):
+        logits = torch.randn(8, 54, 6, requires_grad=True)
+        loss = CubeConstraintLoss(from_logits=True)(logits)
+        loss.backward()
+        assert torch.isfinite(logits.grad).all()
+        assert logits.grad.abs().sum() > 0
+
+    def test_options(self, scrambled):
+        probs = one_hot(scrambled[:2])
+        probs[:, 10] = 1 / 6
+        per_sample = CubeConstraintLoss(reduction="none", weights={"stickers": 0.0})(probs)
+        assert per_sample.shape == (2,)
+        assert CubeConstraintLoss(reduction="sum")(probs) > CubeConstraintLoss(weights={"stickers": 0.0})(probs)
+        with pytest.raises(ValueError):
+            CubeConstraintLoss(weights={"parity": 1.0})
+        with pytest.raises(ValueError):
+            CubeConstraintLoss()(probs[:, :53])
+
+    def test_registered(self):
+        loss = BackboneRegistry.create_from_config({"type": "cube_constraint_loss", "from_logits": True})
+        assert isinstance(loss, CubeConstraintLoss)
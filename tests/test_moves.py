@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from rubik.batch import BatchCube, compile_sequence
+from rubik.cube import RubiksCube
+from rubik.cubie import CubieCube
+from rubik.moves import MoveSeq
+from rubik.simplify import simplify
+from rubik.string_tools import StringManipulate
+
+SEQUENCE = "R U R' U' M2 x y' F2 E S'"
+
+
+def test_notation_round_trip():
+    seq = MoveSeq(SEQUENCE)
+    assert seq.ids.dtype == np.uint8
+    assert str(seq) == SEQUENCE
+    assert MoveSeq(seq.ids) == seq
+    assert MoveSeq.from_bytes(seq.tobytes()) == seq
+    assert list(seq)[:2] == ["R", "U"]
+    assert len(MoveSeq()) == 0
+
+
+def test_inverse_concatenation_and_slicing():
+    seq = MoveSeq("R U2 F'")
+    assert seq.inverse() == "F U2 R'"
+    assert seq.inverse().inverse() == seq
+    assert seq[:2] + MoveSeq("B") == "R U2 B"
+    assert seq + "D" == "R U2 F' D"
+    assert "D" + seq == "D R U2 F'"
+    assert seq[-1] == "F'"
+    assert hash(seq) == hash(MoveSeq("R U2 F'"))
+    assert StringManipulate.inverse(seq) == seq.inverse()
+
+
+def test_invalid_moves():
+    with pytest.raises(ValueError):
+        MoveSeq("R Q")
+    with pytest.raises(ValueError):
+        MoveSeq([200])
+    with pytest.raises(ValueError, match="range"):
+        MoveSeq([-1])
+    with pytest.raises(ValueError, match="integers"):
+        MoveSeq(np.array([1.7]))
+    assert len(MoveSeq()) == len(MoveSeq([])) == 0
+    assert MoveSeq("R") != "garbage"
+    assert not MoveSeq("R") == "R Q"
+
+
+def test_equal_to_string_hashes_equally():
+    seq = MoveSeq("R U2 Fw'")
+    assert seq == str(seq) == "R U2 f'"
+    assert hash(seq) == hash(str(seq))
+    assert len({seq, str(seq), MoveSeq(str(seq))}) == 1
+    assert seq != "R U2 Fw'"
+    assert seq != "R  U2 f'"
+
+
+def test_engine_accepts_move_sequences():
+    seq = MoveSeq(SEQUENCE)
+    assert (compile_sequence(seq) == compile_sequence(SEQUENCE)).all()
+    assert BatchCube().apply_moves(seq).to_strings() == BatchCube().apply_moves(SEQUENCE).to_strings()
+    assert CubieCube.solved().apply_moves(seq).to_strings() == CubieCube.solved().apply_moves(SEQUENCE).to_strings()
+    a, b = RubiksCube(), RubiksCube()
+    a.apply_moves(seq)
+    b.apply_moves(SEQUENCE)
+    assert a.state == b.state
+    a.apply_moves(seq.inverse())
+    assert a.state == list(RubiksCube.SOLVED_STATE)
+    assert simplify(MoveSeq("U U R R'")) == MoveSeq("U2")
+
+
+def test_wide_move_aliases():
+    assert MoveSeq("Rw U Rw'") == MoveSeq("r U r'")
+    assert str(MoveSeq("Bw2")) == "b2"
+    cube = RubiksCube()
+    cube.apply_moves(MoveSeq("r U r'"))
+    other = RubiksCube()
+    other.apply_moves("Rw U Rw'")
+    assert cube.state == other.state
@@ -0,0 +1,53 @@
+from rubik.moves import MoveSeq
+from rubik.reconstructions import parse_reconstructions, read_blocks, split_comment
+
+DUMP = """Scramble: R U2 F' L D B2 R' U F2 D' // first solve
+y // inspection
+R U R' F \\ cross
+[R, U] U2 // F2L 1
+Rw U Rw'
+
+U R2 F
+// just a comment
+R' F2
+
+[R, U
+"""
+
+
+def test_split_comment():
+    assert split_comment("R U R' // sexy") == ("R U R' ", "sexy")
+    assert split_comment("R \\ a // b") == ("R ", "a // b")
+    assert split_comment("R U") == ("R U", "")
+
+
+def test_blocks_keep_line_numbers():
+    blocks = list(read_blocks(DUMP.splitlines()))
+    assert [(index, line) for index, line, _ in blocks] == [(0, 1), (1, 7), (2, 11)]
+
+
+def test_records_keep_per_step_structure():
+    first, second, third = parse_reconstructions(DUMP.splitlines(keepends=True))
+    assert first.error is None
+    assert first.scramble == (MoveSeq("R U2 F' L D B2 R' U F2 D'"), "first solve")
+    assert [step.comment for step in first.steps] == ["inspection", "cross", "F2L 1", ""]
+    assert first.steps[2].moves == "R U R' U' U2"
+    assert first.steps[3].moves == "r U r'"
+    assert first.solution == "y R U R' F R U R' U' U2 r U r'"
+    assert second.steps[0] == (MoveSeq(), "just a comment")
+    assert third.error is not None and third.line == 11
+
+
+def test_process_pool_gives_same_records(tmp_path):
+    moves = ["R", "U'", "F2", "D", "L'", "B"]
+    dump = []
+    for i in range(40):
+        scramble = " ".join(moves[(i + j) % len(moves)] for j in range(i % 7 + 1))
+        dump.append(f"{scramble}\nR U // step {i}\n")
+    path = tmp_path / "dump.txt"
+    path.write_text("\n".join(dump))
+    inline = list(parse_reconstructions(str(path), chunksize=7))
+    pooled = list(parse_reconstructions(str(path), workers=2, chunksize=7))
+    assert len(inline) == 40
+    assert inline == pooled
+    assert [record.index for record in pooled] == list(range(40))
@@ -0,0 +1,51 @@
+import numpy as np
+from rubik.batch import BatchCube
+from rubik.cubie import CubieCube
+from rubik.cube import RubiksCube
+from rubik.utils.scrambles import (random_state_strings, random_states, scramble_batch, scramble_moves, scramble_strings,
+                                   spawn_generators)
+
+
+class TestScrambles:
+    def test_canonical_sequences(self):
+        moves = scramble_moves(2000, length=30, rng=1)
+        faces = moves // 3
+        previous, current = faces[:, :-1], faces[:, 1:]
+        assert moves.max() < 18
+        assert not (previous == current).any()
+        # Opposite faces only appear in the order U D, R L, F B
+        same_axis = (previous % 3) == (current % 3)
+        assert (current[same_axis] > previous[same_axis]).all()
+
+    def test_states_match_strings(self):
+        moves, states = scramble_batch(20, rng=7)
+        for sequence, state in zip(scramble_strings(moves), states):
+            assert (BatchCube.solved(1).apply_moves(sequence).states[0] == state).all()
+        assert CubieCube.from_facelets(states).is_valid().all()
+
+    def test_reproducible_worker_seeds(self):
+        first = [scramble_moves(10, rng=rng) for rng in spawn_generators(42, 3)]
+        second = [scramble_moves(10, rng=rng) for rng in spawn_generators(42, 3)]
+        for a, b in zip(first, second):
+            assert (a == b).all()
+        assert not (first[0] == first[1]).all()
+
+
+class TestRandomStates:
+    def test_states_are_valid(self):
+        states = random_states(500, rng=3)
+        cubies = CubieCube.from_facelets(states)
+        assert cubies.is_valid().all()
+        assert (cubies.centers == np.arange(6)).all()
+        # Both parities show up
+        assert set(cubies.corner_parity().tolist()) == {0, 1}
+
+    def test_random_orientation(self):
+        states = random_states(500, rng=4, random_orientation=True)
+        cubies = CubieCube.from_facelets(states)
+        assert cubies.is_valid().all()
+        assert len({tuple(row) for row in cubies.centers.tolist()}) == 24
+
+    def test_strings_are_reproducible(self):
+        assert random_state_strings(5, rng=9) == random_state_strings(5, rng=9)
+        assert all(RubiksCube.validate_cubestring(state) for state in random_state_strings(5, rng=9))
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+from rubik.cube import RubiksCube
+from rubik.moves import MOVES, ids_from_notation, notation_from_ids
+from rubik.simplify import eliminate_rotations, eliminate_rotations_ids, relabel_moves, simplify
+from rubik.symmetries import Symmetries
+
+
+def state_after(sequence):
+    cube = RubiksCube()
+    return cube.apply_moves(sequence, list(cube.SOLVED_STATE))
+
+
+@pytest.mark.parametrize("sequence, expected", [
+    ("U U", "U2"),
+    ("R R'", ""),
+    ("R L R'", "L"),
+    ("D U", "U D"),
+    ("R U U' R'", ""),
+    ("R2 R2 F", "F"),
+    ("M M x", "M2 x"),
+    ("", ""),
+])
+def test_merges_same_axis_moves(sequence, expected):
+    assert simplify(sequence) == expected
+
+
+def test_pushes_rotations_to_the_end():
+    assert simplify("x U R", push_rotations=True) == "F R x"
+    assert simplify("y y'", push_rotations=True) == ""
+
+
+def test_integer_input_gives_integer_output():
+    result = simplify(ids_from_notation("U U R R'"))
+    assert result.dtype == np.uint8
+    assert result.tolist() == ids_from_notation("U2").tolist()
+
+
+def test_invalid_move():
+    with pytest.raises(ValueError):
+        simplify("U Q")
+
+
+@pytest.mark.parametrize("push_rotations", [False, True])
+def test_random_sequences_keep_their_effect(push_rotations):
+    rng = np.random.default_rng(10)
+    for _ in range(300):
+        sequence = " ".join(MOVES[i] for i in rng.integers(0, len(MOVES), size=rng.integers(0, 20)))
+        simplified = simplify(sequence, push_rotations)
+        assert len(simplified.split()) <= len(sequence.split()) + 2
+        assert state_after(simplified) == state_after(sequence)
+        if push_rotations:
+            tokens = simplified.split()
+            turns = [move for move in tokens if move[0] not in "xyz"]
+            assert tokens[:len(turns)] == turns
+
+
+@pytest.mark.parametrize("sequence, expected", [
+    ("x U R", "F R x"),
+    ("M' U M", "R' L F R L'"),
+    ("r U r'", "L F L'"),
+    ("y y'", ""),
+    ("M2 E2 S2", "R2 L2 U2 D2 F2 B2"),
+])
+def test_eliminate_rotations(sequence, expected):
+    assert eliminate_rotations(sequence) == expected
+
+
+def test_eliminated_sequences_keep_their_effect():
+    rng = np.random.default_rng(12)
+    for _ in range(300):
+        sequence = " ".join(MOVES[i] for i in rng.integers(0, len(MOVES), size=rng.integers(0, 20)))
+        result = eliminate_rotations(sequence)
+        tokens = result.split()
+        turns = [move for move in tokens if move[0] in "URFDLB"]
+        assert tokens[:len(turns)] == turns
+        assert len(tokens) - len(turns) <= 2
+        assert state_after(result) == state_after(sequence)
+
+
+def test_eliminate_rotations_ids():
+    moves, orientation = eliminate_rotations_ids(ids_from_notation("x U"))
+    assert notation_from_ids(moves) == "F"
+    assert Symmetries().rotation_names[orientation] == "x"
+
+
+@pytest.mark.parametrize("rotation", ["y", "z", "x y'", "x2 z"])
+def test_relabel_moves(rotation):
+    sequence = "R M2 u' x S E' y2 b"
+    relabeled = relabel_moves(sequence, rotation)
+    assert state_after(f"{rotation} {sequence}") == state_after(f"{relabeled} {rotation}")
+    assert relabel_moves(relabeled, rotation, inverse=True) == sequence
@@ -0,0 +1,79 @@
+import pytest
+from rubik.cube import RubiksCube
+from rubik.solution_cache import SolutionCache
+
+pytest.importorskip("kociemba")
+
+SCRAMBLE = "R U2 F' L D B2 R' U F2 D'"
+
+
+def scrambled(rotation=""):
+    cube = RubiksCube()
+    cube.apply_moves(f"{SCRAMBLE} {rotation}".strip())
+    return cube
+
+
+def test_solution_solves_state():
+    cache = SolutionCache()
+    cube = scrambled()
+    solution = cube.solve(cache=cache)
+    cube.apply_moves(solution)
+    assert cube.is_solved()
+    assert (cache.hits, cache.misses) == (0, 1)
+
+
+@pytest.mark.parametrize("rotation", ["y", "x", "z2", "x y'", "y2 x'"])
+def test_rotated_state_hits_and_is_relabeled(rotation):
+    cache = SolutionCache()
+    cache.solve(scrambled().get_state_string())
+    cube = scrambled(rotation)
+    solution = cache.solve(cube.get_state_string())
+    assert (cache.hits, cache.misses) == (1, 1)
+    cube.apply_moves(solution)
+    assert cube.is_solved()
+
+
+def test_put_then_get_in_other_orientation():
+    cache = SolutionCache()
+    inverse = " ".join(m[0] + {"": "'", "'": "", "2": "2"}[m[1:]] for m in reversed(SCRAMBLE.split()))
+    cache.put(scrambled().get_state_string(), inverse)
+    cube = scrambled("z")
+    solution = cache.get(cube.get_state_string())
+    cube.apply_moves(solution)
+    assert cube.is_solved()
+    assert cache.get(scrambled("R").get_state_string()) is None
+
+
+@pytest.mark.parametrize("rotation", ["y", "z", "x y'"])
+def test_slice_and_rotation_moves_round_trip(rotation):
+    cache = SolutionCache()
+    state = scrambled().get_state_string()
+    cube = RubiksCube(state)
+    cube.apply_moves("M2 x")
+    cache.put(state, "M2 x " + SolutionCache().solve(cube.get_state_string()))
+    cube = scrambled(rotation)
+    cube.apply_moves(cache.get(cube.get_state_string()))
+    assert cube.is_solved()
+
+
+def test_disk_tier_survives_reopening(tmp_path):
+    path = str(tmp_path / "solutions.sqlite")
+    cache = SolutionCache(path, maxsize=1)
+    cache.solve(scrambled().get_state_string())
+    cache.close()
+    reopened = SolutionCache(path)
+    assert len(reopened) == 1
+    cube = scrambled("y")
+    solution = reopened.solve(cube.get_state_string())
+    assert reopened.hits == 1
+    cube.apply_moves(solution)
+    assert cube.is_solved()
+    reopened.close()
+
+
+def test_lru_evicts_oldest():
+    cache = SolutionCache(maxsize=1)
+    cache.put(scrambled().get_state_string(), "R")
+    cache.put(scrambled("R").get_state_string(), "R")
+    assert len(cache) == 1
+    assert cache.get(scrambled().get_state_string()) is None
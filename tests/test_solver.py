@@ -0,0 +1,49 @@
+import pytest
+from rubik.batch import BatchCube
+from rubik.cube import RubiksCube
+from rubik.solver import solve_many
+from rubik.utils.scrambles import random_state_strings
+
+pytest.importorskip("kociemba")
+
+
+class TestSolveMany:
+    @pytest.fixture
+    def states(self):
+        states = random_state_strings(12, rng=5)
+        states[4] = "U" * 54 # Not solvable, must be reported without aborting
+        return states
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_results_in_order(self, states, workers):
+        stream = solve_many(states, workers=workers, chunksize=3)
+        results = list(stream)
+        assert [result.index for result in results] == list(range(len(states)))
+        for result in results:
+            if result.index == 4:
+                assert result.solution is None and result.error
+                continue
+            assert result.error is None
+            cube = RubiksCube(result.state)
+            cube.apply_moves(result.solution)
+            assert cube.get_state_string() == RubiksCube.SOLVED_STATE
+        assert stream.stats.solved == len(states) - 1
+        assert stream.stats.failed == 1
+        assert stream.stats.states_per_second > 0
+
+    def test_accepts_cubes_and_lazy_input(self):
+        cube = RubiksCube()
+        cube.apply_moves("R U R' U'")
+        stream = solve_many((state for state in [cube, BatchCube.solved(1)[0]]), workers=1)
+        solutions = [result.solution for result in stream]
+        assert len(solutions) == 2
+        assert solutions[1] is not None
+
+    def test_timeouts_are_reported_per_state(self, states):
+        # Every chunk that is not ready at once times out and replaces the pool
+        stream = solve_many(states, workers=2, chunksize=3, timeout=1e-6)
+        results = list(stream)
+        assert [result.index for result in results] == list(range(len(states)))
+        assert all(result.error is None or result.index == 4 or result.error.startswith("TimeoutError")
+                   for result in results)
+        assert stream.stats.completed == len(states)
@@ -1,6 +1,7 @@
 import pytest
 import re
-from src.rubik.string_tools import StringManipulate
+from rubik.moves import notation_from_ids
+from rubik.string_tools import StringManipulate
 
 class TestStringManipulate:
     @pytest.fixture
@@ -144,9 +145,11 @@ class TestStringManipulate:
         assert string_manipulator("  \t  \n  ") == ""
         
         # Unbalanced brackets
-        # WE SHOULD NOT NEED THIS BUT ALAS
-        assert StringManipulate.parse_comm("[R, U") == " R U R' U'"
-        assert StringManipulate.parse_comm("R, U]") == "R U] R' U"
+        for notation in ("[R, U", "R, U]"):
+            with pytest.raises(ValueError):
+                StringManipulate.parse_comm(notation)
+            with pytest.raises(ValueError):
+                string_manipulator(notation)
         
         # Comments
         assert StringManipulate.split_moves("R U // This is a comment") == ["R", "U"]
@@ -157,4 +160,34 @@ class TestStringManipulate:
         expected = "r U R' U' R r'"
         
         result = string_manipulator(input_str)
-        assert result == expected, f"Expected {expected}, got {result}"
\ No newline at end of file
+        assert result == expected, f"Expected {expected}, got {result}"
+
+    def test_inverse_of_wide_moves(self):
+        assert StringManipulate.inverse("Rw' U r2 Rw") == "Rw' r2 U' Rw"
+
+    def test_tokenize(self):
+        assert StringManipulate.tokenize("[Rw: U2] X l'") == ["[", "r", ":", "U2", "]", "x", "l'"]
+
+    def test_parse_ids_matches_legacy_parser(self, commutator_examples):
+        for case in commutator_examples.values():
+            ids = StringManipulate.parse_ids(case["input"])
+            assert notation_from_ids(ids) == case["expected"]
+            assert not ids.flags.writeable
+
+    def test_parse_tree_shares_repeated_subexpressions(self):
+        nodes, root = StringManipulate.parse_tree(StringManipulate.tokenize("[[R, U], [R, U]]"))
+        assert sum(kind == "comm" for kind, _, _ in nodes) == 2
+        assert len(StringManipulate.expand_tree(nodes, root)) == 16
+
+    def test_deep_nesting(self):
+        notation = "R"
+        for _ in range(500):
+            notation = f"[U: {notation}]"
+        assert StringManipulate.parse_comm(notation) == " ".join(["U"] * 500 + ["R"] + ["U'"] * 500)
+
+    @pytest.mark.parametrize("notation", ["[R, U", "R, U]", "[R, U, F]"])
+    def test_parse_tree_rejects_malformed_input(self, notation):
+        with pytest.raises(ValueError):
+            StringManipulate.parse_tree(StringManipulate.tokenize(notation))
+        with pytest.raises(ValueError):
+            StringManipulate.parse_tree(["[", "Rq", ",", "U", "]"])
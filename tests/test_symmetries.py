@@ -1,5 +1,6 @@
 import pytest
-from src.rubik.symmetries import Symmetries  # Adjust the import path as needed
+from rubik.cube import RubiksCube
+from rubik.symmetries import Symmetries  # Adjust the import path as needed
 
 
 class TestSymmetries:
@@ -7,6 +8,46 @@ class TestSymmetries:
         """Set up a fresh cube instance for each test"""
         self.sym = Symmetries()
 
+    def apply(self, sequence):
+        cube = RubiksCube()
+        return cube.apply_moves(f"R U F2 {sequence}", list(cube.SOLVED_STATE))
 
-    
-    
+    def test_cayley_table_is_a_group(self):
+        cayley = self.sym.cayley
+        identity = self.sym.rotation_ids["I"]
+        assert len(cayley) == 24
+        assert all(sorted(row) == list(range(24)) for row in cayley)
+        for a in range(24):
+            assert cayley[a][self.sym.rotation_inverse[a]] == identity
+            for b in range(24):
+                for c in (0, 7, 19):
+                    assert cayley[cayley[a][b]][c] == cayley[a][cayley[b][c]]
+
+    @pytest.mark.parametrize("sequence", ["x y x'", "y2 z2", "x x x x", "z y' x2 y", "", "I"])
+    def test_reduce_and_invert(self, sequence):
+        reduced = self.sym.reduce_rotation(sequence)
+        assert len(reduced.split()) <= 2
+        assert self.apply(reduced) == self.apply(sequence)
+        inverse = self.sym.invert_rotation(sequence)
+        assert self.apply(f"{sequence} {inverse}") == self.apply("")
+
+    def test_compose(self):
+        assert self.apply(self.sym.compose_rotations("x y", "z'", "y2")) == self.apply("x y z' y2")
+
+    def test_invalid_rotation(self):
+        with pytest.raises(ValueError):
+            self.sym.rotation_id("x R")
+        # Orientation names are not rotations
+        for bad in ("x UR", "DB", "FR y"):
+            with pytest.raises(ValueError):
+                self.sym.rotation_id(bad)
+        with pytest.raises(ValueError):
+            self.sym.reduce_rotation("DB")
+        with pytest.raises(ValueError):
+            self.sym.notation_to_orientation("FR y")
+
+    def test_equivalent_rotations_lookup(self):
+        equivalent = self.sym.get_equivalent_rotations("x y")
+        assert "x y" in equivalent
+        assert all(self.apply(rotation) == self.apply("x y") for rotation in equivalent)
+        assert self.sym.notation_to_orientation("x y x'") == self.sym.notation_to_orientation("z")
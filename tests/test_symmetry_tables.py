@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+from rubik.batch import decode_states, encode_states
+from rubik.cube import RubiksCube
+from rubik.symmetry_tables import (ORIENTATION_NAMES, ROTATION_GATHERS, SYMMETRY_COUNT, all_symmetries,
+                                   canonical_key, canonical_recolor, equivalent, orientation_indices,
+                                   rotation_canonical)
+from rubik.utils.scrambles import random_state_strings
+
+
+def test_tables_match_rotation_strings():
+    cube = RubiksCube()
+    state = random_state_strings(1, rng=3)[0]
+    for row, name in enumerate(ORIENTATION_NAMES):
+        rotated = cube.apply_moves(cube.ORIENTATIONS[name], list(state))
+        assert decode_states(encode_states(state)[:, ROTATION_GATHERS[row]])[0] == "".join(rotated)
+
+
+def test_canonical_recolor_matches_string_version():
+    cube = RubiksCube()
+    states = random_state_strings(50, rng=4, random_orientation=True)
+    expected = [cube.get_canon_rotated_state(state) for state in states]
+    assert decode_states(canonical_recolor(states)) == expected
+
+
+def test_orientation_indices_reject_bad_centers():
+    state = list(RubiksCube.SOLVED_STATE)
+    state[22] = "U"
+    with pytest.raises(ValueError):
+        orientation_indices("".join(state))
+
+
+def test_equivalent_rotated_and_recolored_states():
+    cube = RubiksCube()
+    states = random_state_strings(30, rng=5)
+    rng = np.random.default_rng(5)
+    rotated = []
+    for state in states:
+        rotation = cube.ORIENTATIONS[ORIENTATION_NAMES[rng.integers(24)]]
+        rotated.append(cube.get_canon_rotated_state("".join(cube.apply_moves(rotation, list(state)))))
+    assert equivalent(states, rotated).all()
+    assert not equivalent(states, states[1:] + states[:1]).any()
+    assert cube.is_equivalent(rotated[0], list(states[0]))
+
+
+def test_rotation_canonical_is_shared_by_the_class():
+    cube = RubiksCube()
+    state = random_state_strings(1, rng=6)[0]
+    rotations = [cube.apply_moves(rotation, list(state)) for rotation in cube.ORIENTATIONS.values()]
+    representatives, _ = rotation_canonical(["".join(rotated) for rotated in rotations])
+    assert (representatives == representatives[0]).all()
+
+
+def mirrored(sequence):
+    """The mirror image of a move sequence through the R-L plane."""
+    swap = {"R": "L", "L": "R"}
+    moves = []
+    for move in sequence.split():
+        layer, power = swap.get(move[0], move[0]), move[1:]
+        if layer not in "Mx" and power != "2":
+            power = "" if power == "'" else "'"
+        moves.append(layer + power)
+    return " ".join(moves)
+
+
+def test_mirror_gather_matches_mirrored_moves():
+    cube = RubiksCube()
+    sequence = "R U2 F' L D B2 M x E' S2 z y'"
+    state = encode_states("".join(cube.apply_moves(sequence, list(cube.SOLVED_STATE))))
+    expected = encode_states("".join(cube.apply_moves(mirrored(sequence), list(cube.SOLVED_STATE))))
+    identity = len(ROTATION_GATHERS) + ORIENTATION_NAMES.index("UF")
+    assert (all_symmetries(state)[0, identity] == expected[0]).all()
+
+
+def test_canonical_key_merges_all_symmetric_states():
+    cube = RubiksCube()
+    sequence = "R U2 F' L D B2 R' U F2 D'"
+    base = "".join(cube.apply_moves(sequence, list(cube.SOLVED_STATE)))
+    variants = [base, "".join(cube.apply_moves(mirrored(sequence), list(cube.SOLVED_STATE)))]
+    for name in ORIENTATION_NAMES:
+        variants.append("".join(cube.apply_moves(cube.ORIENTATIONS[name], list(variants[1]))))
+    variants.append(cube.get_canon_rotated_state(variants[-1]))
+    keys, symmetries = canonical_key(variants, return_symmetry=True)
+    assert (keys == keys[0]).all()
+    assert symmetries.max() < SYMMETRY_COUNT
+
+
+def test_canonical_key_separates_classes():
+    states = random_state_strings(200, rng=7)
+    keys = canonical_key(states)
+    assert len(np.unique(keys, axis=0)) == 200
+    assert (canonical_key(keys) == keys).all()
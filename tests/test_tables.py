@@ -0,0 +1,37 @@
+import pytest
+from rubik.cube import RubiksCube
+from rubik.symmetries import Symmetries
+from rubik.tables import save_tables, load_tables
+
+
+class TestSharedTables:
+    def test_instances_share_tables(self):
+        a, b = RubiksCube(), RubiksCube()
+        assert a._permutations is b._permutations
+        assert a._reorient is b._reorient
+        with pytest.raises(TypeError):
+            a._permutations["Q"] = {}
+
+    def test_custom_move_does_not_leak(self, capsys):
+        a, b = RubiksCube(), RubiksCube()
+        a._add_sequence_as_move("Sexy", "R U R' U'")
+        assert "Sexy" in a._permutations
+        assert "Sexy" not in b._permutations
+        assert "Sexy" not in RubiksCube.shared_permutations()
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        path = tmp_path / "tables.json"
+        permutations = RubiksCube.shared_permutations()
+        symmetries = Symmetries.shared_tables()
+        save_tables(path)
+        try:
+            load_tables(path)
+            assert dict(RubiksCube.shared_permutations()["R'"]) == dict(permutations["R'"])
+            assert Symmetries.shared_tables()["equivalence_map"]["x y"] == symmetries["equivalence_map"]["x y"]
+            cube = RubiksCube()
+            cube.apply_moves("R U R' U'")
+            cube.apply_moves("U R U' R'")
+            assert cube.is_solved()
+        finally:
+            RubiksCube._shared_permutations = permutations
+            Symmetries._shared_tables = symmetries
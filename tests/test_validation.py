@@ -0,0 +1,128 @@
+import random
+import numpy as np
+from rubik.batch import BatchCube
+from rubik.cube import RubiksCube
+from rubik.utils.corner import CornerValidate
+from rubik.utils.corner import CornerPairLoss
+from rubik.utils.sticker import StickerValidate
+from rubik.utils.validation import (ANALYSIS_DTYPE, ANALYSIS_FIELDS, StateAnalysis, ValidateState, analyze_batch,
+                                    recolor_by_centers, validate_batch)
+
+
+class TestValidateBatch:
+    def test_reachable_states_are_valid(self, scrambled):
+        result = validate_batch(scrambled + [RubiksCube.SOLVED_STATE])
+        assert result.shape == (101,)
+        assert result["valid"].all()
+        assert (result["sticker_counts"] == 9).all()
+        assert (result["corner_parity"] == result["edge_parity"]).all()
+
+    def test_matches_corner_validate(self, scrambled):
+        result = validate_batch(scrambled)
+        for state, record in zip(scrambled, result):
+            corners = CornerValidate.get(state)
+            assert record["corner_twist"] == CornerValidate().get_total_orientation(corners, state)
+            assert record["corner_parity"] == CornerValidate.parity(CornerValidate.permutation(corners, state))
+
+    def test_color_scheme_does_not_matter(self, scrambled):
+        recolored = [state.translate(str.maketrans("URFDLB", "FRDBLU")) for state in scrambled]
+        assert validate_batch(recolored)["valid"].all()
+        assert (recolor_by_centers(recolored) == recolor_by_centers(scrambled)).all()
+
+    def test_twisted_corner(self, scrambled, swap):
+        record = validate_batch(swap(scrambled[0], 8, 9, 20))[0]
+        assert record["corner_twist"] in (1, 2)
+        assert record["parity_match"]
+        assert not record["valid"]
+
+    def test_flipped_edge(self, scrambled, swap):
+        record = validate_batch(swap(scrambled[0], 5, 10))[0]
+        assert record["edge_flip"] == 1
+        assert not record["valid"]
+
+    def test_swapped_pieces(self, swap):
+        # Swapping the UF and UR edges in place leaves an odd edge permutation
+        state = RubiksCube.SOLVED_STATE
+        record = validate_batch(swap(swap(state, 5, 7), 10, 19))[0]
+        assert record["edge_flip"] == 0
+        assert (record["corner_parity"], record["edge_parity"]) == (0, 1)
+        assert not record["parity_match"]
+        assert not record["valid"]
+
+    def test_broken_pieces(self, swap):
+        record = validate_batch(swap(RubiksCube.SOLVED_STATE, 8, 18))[0]
+        assert record["corner_twist"] == -1
+        assert record["corner_parity"] == -1
+        assert not record["parity_match"]
+        assert record["centers_valid"]
+
+    def test_centers_and_stickers(self, swap):
+        state = swap(RubiksCube.SOLVED_STATE, 4, 0)
+        state = state[:4] + "R" + state[5:]
+        record = validate_batch(state)[0]
+        assert not record["centers_valid"]
+        assert record["sticker_counts"].tolist() == [8, 10, 9, 9, 9, 9]
+        assert not record["valid"]
+
+    def test_accepts_codes(self, scrambled):
+        codes = BatchCube(scrambled).states
+        assert (validate_batch(codes) == validate_batch(scrambled)).all()
+        assert validate_batch(np.empty((0, 54), dtype=np.uint8)).shape == (0,)
+
+
+class TestValidateState:
+    def test_valid_states(self, scrambled):
+        result = analyze_batch(scrambled)
+        assert result.dtype == ANALYSIS_DTYPE
+        for field in ANALYSIS_FIELDS:
+            assert (result[field] == 0).all(), field
+        assert ValidateState.analyze(scrambled[0]) == StateAnalysis(*[0] * len(ANALYSIS_FIELDS))
+
+    def test_batch_matches_single(self, scrambled, swap):
+        rng = random.Random(5)
+        states = [swap(state, *rng.sample(range(54), 3)) for state in scrambled]
+        result = ValidateState.analyze_batch(states)
+        for state, row in zip(states, result):
+            assert ValidateState.analyze(state) == StateAnalysis(*row.tolist())
+        assert (result["total"] == ~validate_batch(states)["valid"]).all()
+
+    def test_twisted_corner(self, scrambled, swap):
+        analysis = ValidateState.analyze(swap(scrambled[0], 8, 9, 20))
+        assert analysis.corner_orientation in (1, 2)
+        assert (analysis.corner_permutation, analysis.corner_cubie, analysis.stickers) == (0, 0, 0)
+        assert not analysis.valid
+
+    def test_flipped_edge(self, scrambled, swap):
+        analysis = ValidateState.analyze(swap(scrambled[0], 5, 10))
+        assert analysis.edge_orientation == 1
+        assert analysis.total == 1
+
+    def test_parity(self, swap):
+        analysis = ValidateState.analyze(swap(swap(RubiksCube.SOLVED_STATE, 5, 7), 10, 19))
+        assert analysis.parity == 1
+        assert analysis._replace(parity=0, total=0).valid
+
+    def test_broken_pieces(self, swap):
+        analysis = ValidateState.analyze(swap(RubiksCube.SOLVED_STATE, 8, 18))
+        assert analysis.corner_cubie == 1
+        assert analysis.corner_permutation == 1
+        assert analysis.parity == 0
+        assert (analysis.edge_cubie, analysis.stickers, analysis.centers) == (0, 0, 0)
+
+    def test_centers_and_stickers(self):
+        state = RubiksCube.SOLVED_STATE
+        analysis = ValidateState.analyze(state[:4] + "R" + state[5:])
+        assert analysis.centers == 1
+        assert analysis.stickers == 1
+        assert analysis.total == 1
+        assert ValidateState.analyze("U" * 54).stickers == 45
+        assert StickerValidate.loss("U" * 54) == 45
+        assert StickerValidate.corner("U" * 54) == 2
+        assert StickerValidate.edge("U" * 54) == 1
+
+    def test_corner_losses(self, scrambled, swap):
+        cube = RubiksCube()
+        cube.apply_moves("R")
+        assert CornerPairLoss().corner_loss(RubiksCube.SOLVED_STATE, cube.get_state_string()) == 4
+        assert CornerPairLoss().corner_orientation_single_loss(scrambled[0]) == 0
+        assert CornerPairLoss().corner_permutation(swap(RubiksCube.SOLVED_STATE, 8, 18)) == 1